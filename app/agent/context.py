@@ -0,0 +1,147 @@
+import bisect
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from app.rag.chunking import estimate_tokens
+from app.rag.lexical import tokenize
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+MMR_LAMBDA = float(os.getenv("CONTEXT_MMR_LAMBDA", "0.7"))
+
+# Chunks at least this similar to one already packed add nothing new
+# (overlapping windows of the same file, regenerated knowledge)
+REDUNDANCY_THRESHOLD = 0.85
+
+# Candidates scoring below this fraction of the best one are not worth
+# their tokens even when the budget has room
+MIN_RELEVANCE_RATIO = 0.5
+
+# Where an oversized candidate may be cut: after a line or a sentence,
+# failing that after a word
+_SENTENCE_END_RE = re.compile(r"\n\s*|(?<=[.!?])\s+")
+_WORD_END_RE = re.compile(r"\S+\s*")
+
+
+def _vector(text: str) -> Counter:
+    return Counter(tokenize(text))
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    small, large = (a, b) if len(a) < len(b) else (b, a)
+    dot = sum(count * large.get(term, 0) for term, count in small.items())
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def _truncate(text: str, token_budget: int) -> str:
+    """Longest prefix of `text` within `token_budget`, cut at a line/sentence boundary if one fits."""
+    for pattern in (_SENTENCE_END_RE, _WORD_END_RE):
+        ends = [m.end() for m in pattern.finditer(text)]
+        # Token counts grow with the prefix, so the longest fitting cut can be bisected
+        fits = bisect.bisect_right(ends, token_budget, key=lambda end: estimate_tokens(text[:end]))
+        if fits:
+            return text[:ends[fits - 1]].rstrip()
+    return ""
+
+
+@dataclass
+class ContextPack:
+    text: str
+    tokens: int
+    budget: int
+    selected: List[Dict[str, Any]] = field(default_factory=list)
+    dropped: List[Dict[str, Any]] = field(default_factory=list)
+
+    def report(self) -> Dict[str, Any]:
+        """What went into the prompt and what was left out, and why."""
+        return {
+            "tokens": self.tokens,
+            "budget": self.budget,
+            "selected": [
+                {"id": c["id"], "tokens": c["tokens"],
+                 **({"truncated_from": c["truncated_from"]} if "truncated_from" in c else {})}
+                for c in self.selected
+            ],
+            "dropped": self.dropped,
+        }
+
+
+def build_context(
+    query: str,
+    results: List[Dict[str, Any]],
+    token_budget: int = CONTEXT_TOKEN_BUDGET,
+    mmr_lambda: float = MMR_LAMBDA,
+    min_relevance_ratio: float = MIN_RELEVANCE_RATIO,
+    separator: str = "\n",
+) -> ContextPack:
+    """
+    Pack retrieved/generated texts into `token_budget` estimated tokens.
+
+    Candidates are taken greedily by Maximal Marginal Relevance:
+    mmr = lambda * relevance - (1 - lambda) * max similarity to what is
+    already packed. Relevance blends lexical similarity to the query with
+    the retrieval rank (results arrive best-first). Near-duplicates, weak
+    matches and chunks that no longer fit are recorded in `dropped`. If
+    the first pick alone exceeds the budget (e.g. a whole unchunked
+    document) it is cut to fit rather than leaving the prompt ungrounded.
+    """
+    query_vec = _vector(query)
+    ranked = [r for r in results if (r.get("text") or "").strip()]
+    n = len(ranked)
+
+    candidates = []
+    for rank, result in enumerate(ranked):
+        vec = _vector(result["text"])
+        rank_score = 1.0 - rank / n
+        candidates.append({
+            "id": str(result.get("_id", f"#{rank}")),
+            "text": result["text"],
+            "vec": vec,
+            "tokens": estimate_tokens(result["text"]),
+            "relevance": 0.5 * _cosine(query_vec, vec) + 0.5 * rank_score,
+        })
+
+    pack = ContextPack(text="", tokens=0, budget=token_budget)
+    separator_tokens = estimate_tokens(separator)
+    floor = min_relevance_ratio * max((c["relevance"] for c in candidates), default=0.0)
+    used = 0
+
+    while candidates:
+        best, best_score, best_overlap = None, -math.inf, 0.0
+        for candidate in candidates:
+            overlap = max((_cosine(candidate["vec"], s["vec"]) for s in pack.selected), default=0.0)
+            score = mmr_lambda * candidate["relevance"] - (1 - mmr_lambda) * overlap
+            if score > best_score:
+                best, best_score, best_overlap = candidate, score, overlap
+        candidates.remove(best)
+
+        cost = best["tokens"] + (separator_tokens if pack.selected else 0)
+        if best_overlap >= REDUNDANCY_THRESHOLD:
+            pack.dropped.append({"id": best["id"], "tokens": best["tokens"], "reason": "redundant",
+                                 "similarity": round(best_overlap, 3)})
+        elif best["relevance"] < floor:
+            pack.dropped.append({"id": best["id"], "tokens": best["tokens"], "reason": "low_relevance",
+                                 "relevance": round(best["relevance"], 3)})
+        elif not pack.selected and best["tokens"] > token_budget:
+            text = _truncate(best["text"], token_budget)
+            if text:
+                pack.selected.append({**best, "text": text, "tokens": estimate_tokens(text),
+                                      "truncated_from": best["tokens"]})
+                used += pack.selected[-1]["tokens"]
+            else:
+                pack.dropped.append({"id": best["id"], "tokens": best["tokens"], "reason": "over_budget"})
+        elif used + cost > token_budget:
+            pack.dropped.append({"id": best["id"], "tokens": best["tokens"], "reason": "over_budget"})
+        else:
+            pack.selected.append(best)
+            used += cost
+
+    pack.text = separator.join(c["text"] for c in pack.selected)
+    pack.tokens = used
+    return pack
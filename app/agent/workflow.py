@@ -4,12 +4,17 @@ import json
 
 from app.gemini import GeminiClient, extract_text_from_video, embed
 from app.gemini.json_utils import safe_json_parse
-from app.rag import search, upsert
+from app.agent.context import build_context
+from app.rag import retrieve, upsert
 from app.utils.logger import setup_logger
 from app.utils.time_tracker import TimeTracker # Using your existing TimeTracker class
 
 logger = setup_logger()
 
+# Retrieved candidates handed to context packing, which trims them to the
+# token budget; retrieving a few extra gives MMR something to choose from.
+CONTEXT_CANDIDATES = 8
+
 # --- Graph State ---
 
 class AgentState(TypedDict):
@@ -19,10 +24,14 @@ class AgentState(TypedDict):
     resume_text: str
     jd_text: str
     video_file_path: str
+    video_hash: str
+    user_id: str
     analysis_cache_key: str
     final_result: dict
     vector_search_results: List[dict]
+    search_filters: dict
     generated_knowledge: str
+    context_report: dict
     tracker: TimeTracker # Add the tracker instance to the state
 
 # --- Graph Nodes ---
@@ -101,7 +110,10 @@ class CareerPilotAgent:
 
     async def process_video(self, state: AgentState):
         logger.info("Agent: Processing video to extract text.")
-        extracted_text = await extract_text_from_video(self.gemini_client, state["video_file_path"])
+        extracted_text = await extract_text_from_video(
+            self.gemini_client, state["video_file_path"], video_hash=state.get("video_hash"),
+            user_id=state.get("user_id", ""),
+        )
         state["tracker"].mark("video_processed")
         if not extracted_text.get("resume_text") or not extracted_text.get("jd_text"):
             raise ValueError("Could not extract resume or JD from video.")
@@ -112,7 +124,8 @@ class CareerPilotAgent:
 
     async def check_cache(self, state: AgentState):
         logger.info("Agent: Checking Redis cache for analysis.")
-        key = f"analysis:{hash(state['resume_text'] + state['jd_text'])}"
+        filters = json.dumps(state["search_filters"], sort_keys=True) if state.get("search_filters") else ""
+        key = f"analysis:{hash(state['resume_text'] + state['jd_text'] + filters)}"
         cached_result = await self.redis_client.get(key)
         state["tracker"].mark("cache_checked")
         if cached_result:
@@ -128,9 +141,10 @@ class CareerPilotAgent:
 
     async def search_vectors(self, state: AgentState):
         logger.info("Agent: Searching MongoDB for vector context.")
-        query_embedding = await embed(self.gemini_client, state["jd_text"])
-        state["tracker"].mark("jd_embedded_for_search")
-        results = await search(query_embedding, top_k=3)
+        results = await retrieve(
+            self.gemini_client, state["jd_text"], top_k=CONTEXT_CANDIDATES,
+            filters=state.get("search_filters"),
+        )
         state["tracker"].mark("vector_search_complete")
         return {"vector_search_results": results}
 
@@ -175,11 +189,17 @@ class CareerPilotAgent:
             logger.error("Missing vector_search_results in state")
             return {"final_result": {"error": "No vector context"}}
 
-        # Build context safely
-        context = "\n".join([res["text"] for res in state["vector_search_results"]])
+        # Pack the least redundant, most relevant context into the token budget
+        pack = build_context(state["jd_text"], state["vector_search_results"])
+        state["tracker"].mark("context_packed")
+        logger.info(
+            f"Agent: Packed context tokens={pack.tokens}/{pack.budget} "
+            f"selected={len(pack.selected)} dropped={len(pack.dropped)}",
+            extra={"context_report": pack.report()},
+        )
         prompt = await self.gemini_client.prompts.get("final_analysis")
         formatted_prompt = prompt.format(
-            context=context, resume_text=state["resume_text"], jd_text=state["jd_text"],
+            context=pack.text, resume_text=state["resume_text"], jd_text=state["jd_text"],
         )
         response = await self.gemini_client.call(
             "final_analysis", self.gemini_client.client.models.generate_content,
@@ -190,7 +210,7 @@ class CareerPilotAgent:
         if cache_key := state.get("analysis_cache_key"):
             await self.redis_client.set(cache_key, json.dumps(final_result), ex=3600)
             state["tracker"].mark("final_result_cached")
-        return {"final_result": final_result}
+        return {"final_result": final_result, "context_report": pack.report()}
 
     def finalize_output(self, state: AgentState):
         """Attaches the performance metrics report to the final result."""
@@ -198,5 +218,7 @@ class CareerPilotAgent:
         final_result = state.get("final_result", {})
         tracker = state["tracker"]
         final_result["performance_metrics"] = tracker.report()
+        if state.get("context_report"):
+            final_result["context_report"] = state["context_report"]
         return {"final_result": final_result}
 
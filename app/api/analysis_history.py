@@ -1,12 +1,24 @@
 from app.utils.logger import setup_logger
 logger = setup_logger() 
-from fastapi import APIRouter, Depends, Request
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from app.db.mongo import analysis_collection
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, fetch_page, parse_object_id
 from app.api.schemas import AnalysisResult
 from app.api.auth import get_current_user
 
 router = APIRouter(prefix="/analysis_history", tags=["Analysis History"])
 
+# List view: what the history sidebar shows, not the full texts and rewrites
+HISTORY_PROJECTION = {
+    "timestamp": 1,
+    "source": 1,
+    "summary": 1,
+    "fitgraph": 1,
+    "jd_preview": {"$substrCP": ["$jd_text", 0, 120]},
+}
+
 
 @router.post("/analysis/save")
 async def save_analysis(request: Request, current_user: dict = Depends(get_current_user)):
@@ -37,7 +49,7 @@ async def save_analysis(request: Request, current_user: dict = Depends(get_curre
         doc.pop("_id", None)
 
     try:
-        inserted = analysis_collection.insert_one(doc)
+        inserted = await analysis_collection.insert_one(doc)
         logger.info(f"[ANALYSIS_SAVE] ✅ Inserted analysis: {inserted}")
     except Exception as e:
         logger.error(f"[ANALYSIS_SAVE] ❌ MongoDB insert failed: {e}")
@@ -47,12 +59,24 @@ async def save_analysis(request: Request, current_user: dict = Depends(get_curre
 
 
 @router.get("/analysis/history")
-async def get_analysis_history(current_user: dict = Depends(get_current_user)):
+async def get_analysis_history(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    """Newest-first page of the user's analyses (summaries); pass `next_cursor` back for the next page."""
     user_id = current_user["email"]
-    docs = list(analysis_collection.find({"user_id": user_id}).sort("timestamp", -1))
+    page = await fetch_page(analysis_collection, {"user_id": user_id}, HISTORY_PROJECTION, limit, cursor)
+    logger.info(f"[ANALYSIS_HISTORY] Fetched {len(page['items'])} records for user {user_id}")
+    return page
 
-    for d in docs:
-        d["_id"] = str(d["_id"])
 
-    logger.info(f"[ANALYSIS_HISTORY] Fetched {docs} ; records for user {user_id}")
-    return docs
+@router.get("/analysis/{analysis_id}")
+async def get_analysis(analysis_id: str, current_user: dict = Depends(get_current_user)):
+    doc = await analysis_collection.find_one(
+        {"_id": parse_object_id(analysis_id), "user_id": current_user["email"]}
+    )
+    if doc is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis not found")
+    doc["_id"] = str(doc["_id"])
+    return doc
@@ -3,9 +3,10 @@ from typing import List, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 import os
 from app.api.schemas import TokenData
+from app.api.password_hasher import pwd_context
+from app.api.principal_cache import principal_cache
 from app.utils.mongo_handler import mongo_handler
 
 # --- Configuration ---
@@ -20,8 +21,7 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 # --- Password Hashing ---
-pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
-
+# Blocking; request handlers use app.api.password_hasher instead
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -59,13 +59,20 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
 
-    # Fetch user from DB
-    user = await mongo_handler.get_user(username=username)
+    # Resolved user from the principal cache; Mongo only on a miss
+    user = await principal_cache.get_or_load(username, payload, lambda: load_principal(username))
 
     if user is None or not user.get("is_active"):
         raise credentials_exception
 
-    # Return normalized user object
+    return user
+
+
+async def load_principal(username: str) -> Optional[dict]:
+    """The normalized user object for `username`, from Mongo."""
+    user = await mongo_handler.get_user(username=username)
+    if user is None:
+        return None
     return {
         "username": user["username"],
         "email": user["email"],
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, Request
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from app.db.mongo import mock_interview_collection
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, fetch_page, parse_object_id
 from app.db.models.mock_interview import MockInterviewEvaluation
 from app.api.auth import get_current_user
 
@@ -8,6 +11,9 @@ logger = setup_logger()
 
 router = APIRouter(prefix="/mock", tags=["Mock Interview"])
 
+# List view: enough for per-question analytics; answers and feedback via the detail endpoint
+HISTORY_PROJECTION = {"question": 1, "score": 1, "timestamp": 1}
+
 
 @router.post("/save")
 async def save_evaluation(request: Request, current_user: dict = Depends(get_current_user)):
@@ -28,7 +34,7 @@ async def save_evaluation(request: Request, current_user: dict = Depends(get_cur
         doc.pop("_id")
 
     try:
-        result = mock_interview_collection.insert_one(doc)
+        result = await mock_interview_collection.insert_one(doc)
         logger.info(f"[MOCK_SAVE] ✅ Inserted evaluation with id: {result.inserted_id}")
     except Exception as e:
         logger.error(f"[MOCK_SAVE] ❌ MongoDB insert failed: {e}")
@@ -38,22 +44,40 @@ async def save_evaluation(request: Request, current_user: dict = Depends(get_cur
 
 
 @router.get("/history")
-async def get_history(current_user: dict = Depends(get_current_user)):
+async def get_history(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    question: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
     """
-    Fetch all evaluations for the logged-in user.
-    Includes logging for debugging.
+    Newest-first page of the logged-in user's evaluations (question, score,
+    timestamp), optionally for one question. Pass `next_cursor` back for
+    the next page.
     """
     user_id = current_user["email"]
-    logger.info(f"[MOCK_HISTORY] Fetching history for user: {user_id}")
+    query = {"user_id": user_id}
+    if question is not None:
+        query["question"] = question
 
     try:
-        docs = list(mock_interview_collection.find({"user_id": user_id}).sort("timestamp", -1))
-        logger.info(f"[MOCK_HISTORY] Found {len(docs)} records")
+        page = await fetch_page(mock_interview_collection, query, HISTORY_PROJECTION, limit, cursor)
+        logger.info(f"[MOCK_HISTORY] Found {len(page['items'])} records for user: {user_id}")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[MOCK_HISTORY] ❌ MongoDB query failed: {e}")
         raise
 
-    for d in docs:
-        d["_id"] = str(d["_id"])
+    return page
+
 
-    return docs
+@router.get("/history/{evaluation_id}")
+async def get_evaluation(evaluation_id: str, current_user: dict = Depends(get_current_user)):
+    doc = await mock_interview_collection.find_one(
+        {"_id": parse_object_id(evaluation_id), "user_id": current_user["email"]}
+    )
+    if doc is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evaluation not found")
+    doc["_id"] = str(doc["_id"])
+    return doc
@@ -0,0 +1,71 @@
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "20"))
+MAX_PAGE_SIZE = 100
+
+# Newest first; _id breaks ties between equal timestamps so every
+# document has exactly one place in the order
+SORT = [("timestamp", -1), ("_id", -1)]
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past `doc` in SORT order."""
+    raw = json.dumps({"t": doc["timestamp"].isoformat(), "id": str(doc["_id"])})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def parse_object_id(value: str) -> ObjectId:
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+
+async def fetch_page(
+    collection,
+    query: Dict[str, Any],
+    projection: Optional[Dict[str, Any]] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    One page of `query` in SORT order, by keyset: the cursor carries the
+    (timestamp, _id) of the last document returned, and the next page
+    starts strictly after it. With an index on (user_id, timestamp, _id)
+    every page is a bounded index range scan, however deep it is, unlike
+    skip/offset which walks all earlier documents.
+
+    Returns {"items": [...], "next_cursor": str or None}.
+    """
+    if cursor:
+        ts, oid = decode_cursor(cursor)
+        query = {
+            **query,
+            "$or": [{"timestamp": {"$lt": ts}}, {"timestamp": ts, "_id": {"$lt": oid}}],
+        }
+
+    # One extra document tells whether there is a next page
+    docs = await collection.find(query, projection).sort(SORT).limit(limit + 1).to_list(limit + 1)
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = encode_cursor(docs[-1]) if has_more else None
+    for d in docs:
+        d["_id"] = str(d["_id"])
+    return {"items": docs, "next_cursor": next_cursor}
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from passlib.context import CryptContext
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# argon2id cost. Defaults are the OWASP baseline (19 MiB, 2 passes, 1 lane):
+# lanes are left at 1 because concurrency comes from the worker pool.
+# Hashes made with other parameters (or with bcrypt) are upgraded on login.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_KIB = int(os.getenv("ARGON2_MEMORY_KIB", "19456"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "1"))
+
+# Hashes computed at once; each holds ARGON2_MEMORY_KIB and a core
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_KIB,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
+
+
+class PasswordHasher:
+    """
+    argon2/bcrypt off the event loop. Hashing takes tens to hundreds of
+    milliseconds of CPU, so it runs on a small dedicated thread pool
+    (argon2-cffi and bcrypt release the GIL) and at most `workers` calls
+    run at once; further callers wait on a semaphore without holding a
+    thread. Latency per operation is kept for the last `window` calls.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, context: CryptContext = pwd_context, window: int = 1000):
+        self.workers = max(1, workers)
+        self.context = context
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._latencies: Dict[str, deque] = {op: deque(maxlen=window) for op in ("hash", "verify")}
+        self._waits: deque = deque(maxlen=window)
+        self.rehashed = 0
+
+    def _prepare(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+    async def _run(self, op: str, fn, *args):
+        self._prepare()
+        queued = time.perf_counter()
+        async with self._semaphore:
+            start = time.perf_counter()
+            self._waits.append(start - queued)
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            finally:
+                self._latencies[op].append(time.perf_counter() - start)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        (matches, new_hash): new_hash is set when the password matched a
+        hash that is deprecated (bcrypt) or made with other argon2
+        parameters, and should replace it.
+        """
+        ok, new_hash = await self._run("verify", self.context.verify_and_update, password, hashed)
+        if new_hash is not None:
+            self.rehashed += 1
+        return ok, new_hash
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        def summary(samples):
+            ms = np.asarray(samples, dtype=np.float64) * 1000
+            if not len(ms):
+                return {"count": 0}
+            return {
+                "count": len(ms),
+                "p50_ms": round(float(np.percentile(ms, 50)), 1),
+                "p95_ms": round(float(np.percentile(ms, 95)), 1),
+                "max_ms": round(float(ms.max()), 1),
+            }
+
+        return {
+            "workers": self.workers,
+            "hash": summary(self._latencies["hash"]),
+            "verify": summary(self._latencies["verify"]),
+            "queue_wait": summary(self._waits),
+            "rehashed": self.rehashed,
+        }
+
+
+password_hasher = PasswordHasher()
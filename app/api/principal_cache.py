@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+from redis.exceptions import WatchError
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Seconds a resolved user is trusted in-process / in Redis. Invalidation
+# normally removes it sooner; the TTLs bound staleness if a message is lost.
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "30"))
+PRINCIPAL_REDIS_TTL = int(os.getenv("PRINCIPAL_REDIS_TTL", "300"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+KEY_PREFIX = "auth:principal:"
+# Bumped by every invalidation; a load only writes back if it is unchanged
+VERSION_PREFIX = "auth:principal-version:"
+VERSION_TTL = 86400
+INVALIDATION_CHANNEL = "auth:principal:invalidate"
+
+redis_client = redis.Redis(
+    host=os.getenv("REDIS_HOST", "redis"),
+    port=int(os.getenv("REDIS_PORT", "6379")),
+    decode_responses=True,
+)
+
+Principal = Dict[str, Any]
+
+
+def claims_digest(claims: Dict[str, Any]) -> str:
+    """Digest of the token claims that describe the principal (not exp/iat)."""
+    relevant = {"email": claims.get("email"), "roles": sorted(claims.get("roles") or [])}
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class PrincipalCache:
+    """
+    Resolved users for get_current_user, so an authenticated request does
+    not cost a Mongo lookup:
+
+      1. in-process LRU keyed by (username, token claims), `ttl` seconds
+      2. Redis, `auth:principal:<username>`, shared by every API process
+      3. the loader (Mongo); active users are written back to 1 and 2
+
+    `invalidate(username)` (a user deactivated or their roles changed)
+    deletes the Redis entry and publishes the username; every process
+    subscribed via `start()` drops its local entries for that user. Only
+    active users are cached, so a rejected token always re-checks Mongo.
+    Redis errors degrade to the loader.
+
+    A load that overlaps an invalidation must not put the old principal
+    back: the Redis write is a check-and-set on a per-user version key
+    that `invalidate` increments, read together with the cached entry.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        ttl: float = PRINCIPAL_CACHE_TTL,
+        redis_ttl: int = PRINCIPAL_REDIS_TTL,
+        max_entries: int = PRINCIPAL_CACHE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.redis = client if client is not None else redis_client
+        self.ttl = ttl
+        self.redis_ttl = redis_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Principal]]" = OrderedDict()
+        # Bumped on invalidation: a load that started before it is not stored
+        self._generations: Dict[str, int] = {}
+        self._listener: Optional[asyncio.Task] = None
+        # Lookups in flight per key: concurrent misses for one user share a load
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    # --- lookup ------------------------------------------------------
+    async def get_or_load(
+        self,
+        username: str,
+        claims: Dict[str, Any],
+        load: Callable[[], Awaitable[Optional[Principal]]],
+    ) -> Optional[Principal]:
+        key = (username, claims_digest(claims))
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, principal = entry
+            if expires_at > self.clock():
+                self._entries.move_to_end(key)
+                self.local_hits += 1
+                return dict(principal)
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            principal = await asyncio.shield(inflight)
+            return dict(principal) if principal is not None else None
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            principal = await self._resolve(key, username, load)
+            future.set_result(principal)
+            return dict(principal) if principal is not None else None
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the error; nobody may be waiting, so mark it retrieved
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _resolve(self, key, username: str, load) -> Optional[Principal]:
+        generation = self._generations.get(username, 0)
+        try:
+            cached, version = await self.redis.mget(KEY_PREFIX + username, VERSION_PREFIX + username)
+        except Exception as e:
+            logger.warning(f"Principal cache read failed for {username}: {e}")
+            cached = version = None
+        if cached is not None:
+            self.redis_hits += 1
+            principal = json.loads(cached)
+            self._store_local(key, principal, generation)
+            return principal
+
+        self.misses += 1
+        principal = await load()
+        if principal is not None and principal.get("is_active"):
+            self._store_local(key, principal, generation)
+            if self._generations.get(username, 0) == generation:
+                await self._store_redis(username, principal, version)
+        return principal
+
+    async def _store_redis(self, username: str, principal: Principal, version: Optional[str]):
+        """Write `principal` back unless `username` was invalidated since `version` was read."""
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                await pipe.watch(VERSION_PREFIX + username)
+                if await pipe.get(VERSION_PREFIX + username) != version:
+                    return
+                pipe.multi()
+                pipe.set(KEY_PREFIX + username, json.dumps(principal, default=str), ex=self.redis_ttl)
+                await pipe.execute()
+        except WatchError:
+            # Invalidated between the check and the write
+            pass
+        except Exception as e:
+            logger.warning(f"Principal cache write failed for {username}: {e}")
+
+    def _store_local(self, key, principal: Principal, generation: int):
+        if self.ttl <= 0 or self._generations.get(key[0], 0) != generation:
+            return
+        self._entries[key] = (self.clock() + self.ttl, dict(principal))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # --- invalidation ------------------------------------------------
+    def forget(self, username: str):
+        """Drop this process's entries for `username`."""
+        self._generations[username] = self._generations.get(username, 0) + 1
+        for key in [k for k in self._entries if k[0] == username]:
+            del self._entries[key]
+
+    async def invalidate(self, username: str):
+        """Forget `username` here, in Redis, and (via pub/sub) in every other process."""
+        self.invalidations += 1
+        self.forget(username)
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.incr(VERSION_PREFIX + username)
+                pipe.expire(VERSION_PREFIX + username, VERSION_TTL)
+                pipe.delete(KEY_PREFIX + username)
+                await pipe.execute()
+            await self.redis.publish(INVALIDATION_CHANNEL, username)
+        except Exception as e:
+            logger.error(f"Principal invalidation for {username} not published: {e}")
+
+    def start(self):
+        """Subscribe to invalidations on the running loop."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self, retry_delay: float = 1.0):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.forget(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Messages missed meanwhile are covered by the local TTL
+                logger.warning(f"Principal invalidation listener lost Redis ({e}); resubscribing")
+                self._entries.clear()
+                await asyncio.sleep(retry_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.local_hits + self.redis_hits + self.coalesced
+        total = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+principal_cache = PrincipalCache()
@@ -4,9 +4,18 @@ from pydantic import BaseModel, EmailStr, Field
 from typing import List
 
 
+class SearchFilters(BaseModel):
+    source: Optional[List[str]] = None
+    source_dir: Optional[List[str]] = None
+    generated_from_jd: Optional[bool] = None
+    skills: Optional[List[str]] = None
+    roles: Optional[List[str]] = None
+
+
 class AnalysisRequest(BaseModel):
     resume_text: str
     jd_text: str
+    search_filters: Optional[SearchFilters] = None
 
 
 class FitGraph(BaseModel):
@@ -80,6 +89,8 @@ class EvaluateAnswerResponse(BaseModel):
 class IngestRequest(BaseModel):
     text: str
     source: Optional[str] = "manual"
+    skills: List[str] = []
+    roles: List[str] = []
 
 # --- Auth Schemas ---
 
@@ -102,6 +113,10 @@ class UserCreate(BaseModel):
     password: str 
     roles: List[str] = ["user"]
 
+class UserUpdate(BaseModel):
+    is_active: Optional[bool] = None
+    roles: Optional[List[str]] = None
+
 class UserInDB(UserBase):
     hashed_password: str
     roles: List[str]
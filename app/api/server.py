@@ -1,5 +1,5 @@
 from datetime import datetime
-from fastapi import FastAPI, HTTPException, Request, Depends, status, UploadFile, File
+from fastapi import FastAPI, HTTPException, Request, Depends, status, UploadFile, File, Body
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import JSONResponse, StreamingResponse
@@ -7,22 +7,29 @@ from app.utils.time_tracker import TimeTracker
 import json
 import time
 import uuid
-import tempfile
 import os
+from typing import Optional
 
 from redis import asyncio as aioredis
 from requests import request
 
 from app.utils.logger import setup_logger
 from app.utils.mongo_handler import mongo_handler
+from app.utils.telemetry import telemetry
+from app.api.principal_cache import principal_cache
 from app.api.auth import (
-    get_password_hash, verify_password, create_access_token,
-    get_current_user, require_role
+    create_access_token, get_current_user, require_role
 )
-from app.rag.mongo_vector import search, upsert
+from app.api.password_hasher import password_hasher
+from app.rag.mongo_vector import upsert
+from app.rag.hybrid import retrieve, start_lexical_refresh, stop_lexical_refresh
+from app.rag.retrieval_cache import retrieval_cache
+from app.api.uploads import reject_oversized, save_upload
+from app.gemini import frame_pool
+from app.gemini.ocr_service import OCR_WARMUP, get_ocr_service
 from .schemas import (
     AnalysisRequest, AnalysisResponse, EvaluateAnswerRequest,
-    EvaluateAnswerResponse, IngestRequest, UserCreate, Token, User
+    EvaluateAnswerResponse, IngestRequest, SearchFilters, UserCreate, UserUpdate, Token, User
 )
 from app.api.mock_interview import router as mock_router
 from app.api.analysis_history import router as analysis_history_router
@@ -71,23 +78,43 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Startup / Shutdown
 # ---------------------------------------------------------
 @app.on_event("startup")
-def startup_event():
-    mongo_handler.connect()
+async def startup_event():
+    await mongo_handler.connect()
+    telemetry.start()
+    principal_cache.start()
+    start_lexical_refresh()
+    if OCR_WARMUP:
+        # Load the OCR models now, in the background, instead of on the first fallback
+        get_ocr_service().warm_up()
 
 @app.on_event("shutdown")
-def shutdown_event():
-    mongo_handler.close()
+async def shutdown_event():
+    await telemetry.stop()
+    await principal_cache.stop()
+    await stop_lexical_refresh()
+    password_hasher.shutdown()
+    await mongo_handler.close()
+    frame_pool.shutdown()
 
 
 # ---------------------------------------------------------
 # Middleware
 # ---------------------------------------------------------
+@app.middleware("http")
+async def upload_limit_middleware(request: Request, call_next):
+    rejected = reject_oversized(request)
+    if rejected is not None:
+        return rejected
+    return await call_next(request)
+
+
 @app.middleware("http")
 async def db_handler_middleware(request: Request, call_next):
     start_time = time.time()
     session_id = str(uuid.uuid4())
 
-    await mongo_handler.insert_session({
+    # Queued for the telemetry sink's batched writes; no Mongo round trip here
+    telemetry.emit("sessions", {
         "session_id": session_id,
         "start_time": start_time,
         "request_path": request.url.path,
@@ -96,7 +123,7 @@ async def db_handler_middleware(request: Request, call_next):
 
     response = await call_next(request)
 
-    await mongo_handler.insert_log({
+    telemetry.emit("logs", {
         "session_id": session_id,
         "request_path": request.url.path,
         "request_method": request.method,
@@ -131,7 +158,7 @@ async def register_user(user: UserCreate):
             detail="Username already registered",
         )
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await password_hasher.hash(user.password)
     await mongo_handler.create_user({
         "email": user.email, 
         "username": user.username, 
@@ -149,13 +176,21 @@ async def register_user(user: UserCreate):
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
     user = await mongo_handler.get_user(form_data.username)
 
-    if not user or not verify_password(form_data.password, user["password_hash"]):
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await password_hasher.verify_and_update(form_data.password, user["password_hash"])
+
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if new_hash:
+        # bcrypt or outdated argon2 parameters: store the tuned argon2 hash
+        await mongo_handler.update_user(user["username"], {"password_hash": new_hash})
+
     if not user["is_active"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -170,6 +205,31 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     return {"access_token": token, "token_type": "bearer"}
 
 
+@app.patch("/auth/users/{username}")
+async def update_user(username: str, update: UserUpdate, current_user: dict = Depends(require_role("admin"))):
+    fields = update.model_dump(exclude_none=True)
+    if not fields:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nothing to update")
+
+    user = await mongo_handler.update_user(username, {**fields, "updated_at": datetime.now()})
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    # Deactivation or new roles take effect on the next request in every API process
+    await principal_cache.invalidate(username)
+    return {"username": user["username"], "roles": user["roles"], "is_active": user["is_active"]}
+
+
+@app.get("/auth/hash/stats")
+async def password_hash_stats(current_user: dict = Depends(require_role("admin"))):
+    return password_hasher.stats()
+
+
+@app.get("/auth/cache/stats")
+async def principal_cache_stats(current_user: dict = Depends(require_role("admin"))):
+    return principal_cache.stats()
+
+
 @app.get("/users/me", response_model=User)
 async def read_users_me(current_user: dict = Depends(get_current_user)):
     return current_user
@@ -194,6 +254,8 @@ async def analyze(request: AnalysisRequest, current_user: dict = Depends(get_cur
         "resume_text": request.resume_text,
         "jd_text": request.jd_text,
     }
+    if request.search_filters:
+        inputs["search_filters"] = request.search_filters.model_dump(exclude_none=True)
     tracker.mark("text_inputs_prepared")
     try:
 
@@ -222,16 +284,15 @@ async def analyze_video(
     if not video_file.content_type.startswith("video/"):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload a video.")
 
-    # Create temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmp:
-        tmp.write(await video_file.read())
-        video_path = tmp.name
+    # Stream to a temp file, hashing on the way (no full read into memory)
+    saved = await save_upload(video_file)
+    video_path = saved.path
     tracker.mark("video_file_saved_to_temp")
-    logger.info(f"Video saved to temporary file: {video_path}")
+    logger.info(f"Video saved to temporary file: {video_path} ({saved.size} bytes)")
 
     try:
         # Prepare workflow input
-        inputs = {"video_file_path": video_path}
+        inputs = {"video_file_path": video_path, "video_hash": saved.sha256, "user_id": current_user["email"]}
 
         # Run the workflow (langgraph 0.2.3)
         final_state = await agent.workflow.ainvoke(inputs)
@@ -274,12 +335,36 @@ async def evaluate_answer_api(
 # RAG Search
 # ---------------------------------------------------------
 @app.post("/rag/search")
-async def rag_search(query: str, current_user: dict = Depends(get_current_user)):
-    embedding_vector = await embed(gemini_client, query)
-    results = search(embedding_vector, top_k=5)
+async def rag_search(
+    query: str,
+    top_k: int = 5,
+    filters: Optional[SearchFilters] = Body(default=None, embed=True),
+    current_user: dict = Depends(get_current_user),
+):
+    results = await retrieve(
+        gemini_client,
+        query,
+        top_k=top_k,
+        filters=filters.model_dump(exclude_none=True) if filters else None,
+    )
     return {"results": results}
 
 
+@app.get("/rag/cache/stats")
+async def rag_cache_stats(current_user: dict = Depends(require_role("admin"))):
+    return await retrieval_cache.stats()
+
+
+@app.get("/telemetry/stats")
+async def telemetry_stats(current_user: dict = Depends(require_role("admin"))):
+    return telemetry.stats()
+
+
+@app.get("/video/ocr_cache/stats")
+async def ocr_cache_stats(current_user: dict = Depends(require_role("admin"))):
+    return get_ocr_service().cache.stats()
+
+
 # ---------------------------------------------------------
 # RAG Ingest
 # ---------------------------------------------------------
@@ -291,7 +376,11 @@ async def rag_ingest(payload: IngestRequest, current_user: dict = Depends(requir
         document = {
             "text": payload.text,
             "embedding": embedding_vector,
-            "source": payload.source
+            "source": payload.source,
+            "metadata": {
+                "skills": payload.skills,
+                "roles": payload.roles,
+            },
         }
 
         result = await upsert(document)
@@ -0,0 +1,88 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+MAX_VIDEO_UPLOAD_MB = int(os.getenv("MAX_VIDEO_UPLOAD_MB", "200"))
+MAX_VIDEO_UPLOAD_BYTES = MAX_VIDEO_UPLOAD_MB * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Extensions kept on the temp file: the frame sampler picks its seek
+# strategy from the container
+VIDEO_EXTENSIONS = {".mp4", ".m4v", ".mov", ".avi", ".mkv", ".webm"}
+
+# Routes whose request body is capped before it is parsed
+SIZE_LIMITED_PATHS = {"/analyze_video": MAX_VIDEO_UPLOAD_BYTES}
+
+# Multipart boundaries and headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+@dataclass
+class SavedUpload:
+    path: str
+    sha256: str
+    size: int
+
+
+def _too_large(limit: int) -> str:
+    return f"Upload exceeds the {limit // (1024 * 1024)} MB limit."
+
+
+def reject_oversized(request: Request):
+    """
+    Early 413 from the declared Content-Length, before FastAPI parses (and
+    spools) the multipart body. Returns a response to short-circuit with,
+    or None to carry on.
+    """
+    limit = SIZE_LIMITED_PATHS.get(request.url.path)
+    declared = request.headers.get("content-length")
+    if limit is None or not declared or not declared.isdigit():
+        return None
+    if int(declared) > limit + MULTIPART_OVERHEAD_BYTES:
+        logger.warning(f"Rejected {request.url.path} upload of {declared} bytes")
+        return JSONResponse(status_code=413, content={"detail": _too_large(limit)})
+    return None
+
+
+def _append(tmp, digest, chunk: bytes):
+    digest.update(chunk)
+    tmp.write(chunk)
+
+
+async def save_upload(upload: UploadFile, max_bytes: int = MAX_VIDEO_UPLOAD_BYTES,
+                      chunk_size: int = UPLOAD_CHUNK_BYTES) -> SavedUpload:
+    """
+    Copy an upload to a temp file chunk by chunk, hashing as it goes, so the
+    content hash is known without a second read and the file is never held
+    in memory. Aborts with 413 (and removes the partial file) past `max_bytes`.
+    Hashing and disk writes run in the threadpool, off the event loop.
+    """
+    suffix = os.path.splitext(upload.filename or "")[1].lower()
+    if suffix not in VIDEO_EXTENSIONS:
+        suffix = ".mp4"
+
+    digest = hashlib.sha256()
+    size = 0
+    tmp = await run_in_threadpool(tempfile.NamedTemporaryFile, delete=False, suffix=suffix)
+    with tmp:
+        try:
+            while chunk := await upload.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=_too_large(max_bytes))
+                await run_in_threadpool(_append, tmp, digest, chunk)
+        except BaseException:
+            tmp.close()
+            os.remove(tmp.name)
+            raise
+
+    return SavedUpload(path=tmp.name, sha256=digest.hexdigest(), size=size)
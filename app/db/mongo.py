@@ -1,13 +1,71 @@
-from pymongo import MongoClient
+"""
+The one MongoDB client for the API, the RAG modules and the ingestion
+worker: PyMongo's native async driver over a single connection pool.
+Handlers `await` collection calls directly; nothing blocks the event
+loop and no thread hop is needed.
+"""
 import os
 
-MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-client = MongoClient(MONGO_URI)
+from pymongo import ASCENDING, DESCENDING, AsyncMongoClient
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://mongo:27017/careerpilot")
+DB_NAME = os.getenv("MONGO_DB", "careerpilot")
+# Request sessions/logs expire this long after their created_at
+REQUEST_LOG_TTL_DAYS = int(os.getenv("REQUEST_LOG_TTL_DAYS", "30"))
+
+# --- Pool tuning ---------------------------------------------------
+# maxPoolSize bounds concurrent operations per process; requests beyond
+# it wait up to waitQueueTimeoutMS for a connection instead of opening
+# more. minPoolSize keeps warm connections for bursty traffic.
+POOL_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_MS", "60000")),
+    "waitQueueTimeoutMS": int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+    "retryWrites": True,
+}
+
+client = AsyncMongoClient(MONGO_URI, **POOL_OPTIONS)
+db = client[DB_NAME]
 
-db = client["careerpilot"]
 mock_interview_collection = db["mock_interview_evaluations"]
 user_collection = db["users"]
-user_collection.create_index("email", unique=True)
 resume_collection = db["resumes"]
 jd_collection = db["job_descriptions"]
-analysis_collection = db["analysis_results"]
\ No newline at end of file
+analysis_collection = db["analysis_results"]
+session_collection = db["sessions"]
+log_collection = db["logs"]
+
+
+def get_collection(name: str):
+    return db[name]
+
+
+async def ping():
+    await client.admin.command("ping")
+
+
+async def ensure_indexes():
+    await user_collection.create_index("email", unique=True)
+    await user_collection.create_index("username")
+    # Per-user history pages, newest first: keyset pagination on (timestamp, _id)
+    history_key = [("user_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]
+    await analysis_collection.create_index(history_key)
+    await mock_interview_collection.create_index(history_key)
+    await mock_interview_collection.create_index(
+        [("user_id", ASCENDING), ("question", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]
+    )
+    # TTL: Mongo's monitor deletes request telemetry past its age
+    for collection in (session_collection, log_collection):
+        await collection.create_index("created_at", expireAfterSeconds=REQUEST_LOG_TTL_DAYS * 86400)
+    logger.info("MongoDB indexes ensured")
+
+
+async def close():
+    await client.close()
+    logger.info("MongoDB connection closed.")
@@ -1,4 +1,4 @@
 from .client import GeminiClient
-from .embeddings import embed
+from .embeddings import embed, embed_batch
 from .text_analysis import analyze_resume_and_jd, evaluate_answer, stream_resume_analysis, stream_evaluation
 from .video_analysis import extract_text_from_video
\ No newline at end of file
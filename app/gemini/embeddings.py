@@ -1,5 +1,6 @@
 import json
 import hashlib
+from typing import List
 from .logger import logger
 from .json_utils import safe_json_parse
 
@@ -57,6 +58,61 @@ async def embed(client, text: str):
     return embedding
 
 
+async def embed_batch(client, texts: List[str]) -> List[List[float]]:
+    """
+    Embed several texts with a single Gemini call. Cached texts are served
+    from Redis; only the misses are sent. Returns one embedding per input,
+    `[]` for empty inputs or when the call fails.
+    """
+    results: List[List[float]] = [[] for _ in texts]
+    keys = [_cache_key(client.embedding_model, t) for t in texts]
+    pending = [i for i, t in enumerate(texts) if t and t.strip()]
+
+    if client.redis and pending:
+        try:
+            cached = await client.redis.mget([keys[i] for i in pending])
+            for i, value in zip(list(pending), cached):
+                embedding = safe_json_parse(value) if value else None
+                if embedding:
+                    results[i] = embedding
+                    pending.remove(i)
+        except Exception as e:
+            logger.exception(f"Redis batch read failed: {e}")
+
+    if not pending:
+        return results
+
+    logger.info(
+        "Calling Gemini for batch embedding",
+        extra={"batch_size": len(texts), "cache_misses": len(pending)},
+    )
+
+    try:
+        resp = await client.call(
+            "embed_batch",
+            client.client.models.embed_content,
+            model=client.embedding_model,
+            contents=[
+                {"role": "user", "parts": [{"text": texts[i]}]}
+                for i in pending
+            ],
+        )
+        for i, item in zip(pending, resp.embeddings):
+            results[i] = item.values
+
+    except Exception as e:
+        logger.exception(f"Gemini batch embedding call failed: {e}")
+        return results
+
+    if client.redis:
+        try:
+            await client.redis.mset({keys[i]: json.dumps(results[i]) for i in pending})
+        except Exception as e:
+            logger.exception(f"Redis batch write failed: {e}")
+
+    return results
+
+
 def _cache_key(model: str, text: str) -> str:
     h = hashlib.sha256(text.encode("utf-8")).hexdigest()
     return f"emb:{model}:{h}"
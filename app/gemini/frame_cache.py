@@ -0,0 +1,95 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .hash_index import MultiIndexHashTable
+
+# Memory the per-frame OCR text cache may hold (text plus bookkeeping)
+OCR_FRAME_CACHE_MB = float(os.getenv("OCR_FRAME_CACHE_MB", "32"))
+# Perceptual-hash bits two frames may differ by and still share cached text
+OCR_FRAME_CACHE_DISTANCE = int(os.getenv("OCR_FRAME_CACHE_DISTANCE", "4"))
+
+# Rough per-entry cost beyond the text: OrderedDict node, int key and one
+# set slot per index chunk
+ENTRY_OVERHEAD_BYTES = 256
+
+
+class FrameTextCache:
+    """
+    OCR text per frame, keyed by the frame's 64-bit perceptual hash. A
+    re-recording of the same page hashes within a few bits of the original
+    even though the file bytes differ, so lookups match the nearest cached
+    hash within `radius`. Least recently used entries are evicted once the
+    estimated size passes `max_bytes`. Thread-safe; one per process.
+
+    Entries belong to a `scope` (the user whose video was read) and only
+    match within it: a near-identical frame from someone else's video
+    never returns their text.
+    """
+
+    def __init__(self, max_bytes: int = int(OCR_FRAME_CACHE_MB * 1024 * 1024), radius: int = OCR_FRAME_CACHE_DISTANCE):
+        self.max_bytes = max_bytes
+        self.radius = radius
+        self._entries: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        self._indexes: Dict[str, MultiIndexHashTable] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _size(text: str) -> int:
+        return len(text.encode("utf-8")) + ENTRY_OVERHEAD_BYTES
+
+    def get(self, h: int, scope: str = "") -> Optional[str]:
+        with self._lock:
+            index = self._indexes.get(scope)
+            match = index.find(int(h)) if index is not None else None
+            if match is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end((scope, match))
+            return self._entries[(scope, match)]
+
+    def put(self, h: int, text: str, scope: str = ""):
+        key, size = (scope, int(h)), self._size(text)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._size(self._entries.pop(key))
+            while self._entries and self.bytes + size > self.max_bytes:
+                old, old_text = self._entries.popitem(last=False)
+                self._remove_from_index(old)
+                self.bytes -= self._size(old_text)
+                self.evictions += 1
+            self._entries[key] = text
+            self._indexes.setdefault(scope, MultiIndexHashTable(self.radius)).add(key[1])
+            self.bytes += size
+
+    def _remove_from_index(self, key: Tuple[str, int]):
+        scope, h = key
+        index = self._indexes[scope]
+        index.remove(h)
+        if not len(index):
+            del self._indexes[scope]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "scopes": len(self._indexes),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+            }
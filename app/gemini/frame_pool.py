@@ -0,0 +1,55 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import cv2
+
+from .frame_sampler import seek_min_gap
+from .logger import logger
+
+VIDEO_WORKERS = int(os.getenv("VIDEO_WORKERS", str(os.cpu_count() or 1)))
+
+# Shorter segments are not worth a worker: each one opens the file and
+# seeks, and a frame on either side of every cut is deduplicated twice
+MIN_SEGMENT_SECONDS = 20
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Process-wide pool for video work; workers start on first use."""
+    global _executor
+    if _executor is None:
+        # spawn, not fork: the API process runs threads (to_thread, Mongo, Redis)
+        _executor = ProcessPoolExecutor(max_workers=VIDEO_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        logger.info(f"Started video process pool with {VIDEO_WORKERS} workers")
+    return _executor
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def plan_segments(path: str, workers: int = VIDEO_WORKERS) -> List[Tuple[float, Optional[float]]]:
+    """
+    Split a video into (start_ms, end_ms) spans to decode in parallel; a
+    single open-ended span when the file is short, has no usable index
+    (every worker would have to decode from the start), or workers <= 1.
+    """
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened() or workers <= 1 or seek_min_gap(cap, path) is None:
+            return [(0.0, None)]
+        duration_ms = cap.get(cv2.CAP_PROP_FRAME_COUNT) * 1000.0 / cap.get(cv2.CAP_PROP_FPS)
+    finally:
+        cap.release()
+
+    count = min(workers, int(duration_ms // (MIN_SEGMENT_SECONDS * 1000)))
+    if count <= 1:
+        return [(0.0, None)]
+    span = duration_ms / count
+    return [(i * span, None if i == count - 1 else (i + 1) * span) for i in range(count)]
@@ -0,0 +1,150 @@
+import os
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .logger import logger
+
+TEXT_CROP = os.getenv("VIDEO_TEXT_CROP", "true").lower() == "true"
+TARGET_TEXT_HEIGHT_PX = int(os.getenv("VIDEO_TEXT_HEIGHT_PX", "32"))
+JPEG_QUALITY = int(os.getenv("VIDEO_JPEG_QUALITY", "85"))
+MIN_JPEG_QUALITY = 35
+PAYLOAD_BUDGET_BYTES = int(os.getenv("VIDEO_PAYLOAD_BUDGET_KB", "4096")) * 1024
+
+# Text detection runs on a grayscale copy this wide
+DETECT_WIDTH = 640
+
+# Gradient magnitude below this is background noise / compression ringing,
+# even when Otsu would pick a lower threshold on a nearly blank frame
+MIN_GRADIENT = 40
+
+# Padding around the detected text block, as a fraction of the frame size
+CROP_MARGIN = 0.02
+
+# Past the lowest JPEG quality, shrink by this factor until the payload
+# fits, but never below MIN_BUDGET_SCALE of the prepared size
+BUDGET_SCALE_STEP = 0.8
+MIN_BUDGET_SCALE = 0.5
+
+
+# -------------------------------------------------------------------
+# Text region
+# -------------------------------------------------------------------
+def detect_text(frame: np.ndarray) -> Tuple[Optional[Tuple[int, int, int, int]], float]:
+    """
+    Bounding box (x0, y0, x1, y1) of the text-bearing area and the median
+    text line height, both in frame pixels; (None, 0.0) without text.
+
+    Morphological gradient on a downscaled grayscale copy, thresholded,
+    then closed horizontally so characters merge into line blobs.
+    """
+    height, width = frame.shape[:2]
+    scale = min(1.0, DETECT_WIDTH / width)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+
+    gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    otsu, _ = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    _, mask = cv2.threshold(gradient, max(otsu, MIN_GRADIENT), 255, cv2.THRESH_BINARY)
+    lines = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+
+    count, _, stats, _ = cv2.connectedComponentsWithStats(lines, connectivity=8)
+    small_h = small.shape[0]
+    boxes = [
+        stats[i] for i in range(1, count)
+        if stats[i, cv2.CC_STAT_WIDTH] >= 6 and 2 <= stats[i, cv2.CC_STAT_HEIGHT] <= small_h / 4
+    ]
+    if not boxes:
+        return None, 0.0
+
+    boxes = np.array(boxes)
+    x0 = boxes[:, cv2.CC_STAT_LEFT].min()
+    y0 = boxes[:, cv2.CC_STAT_TOP].min()
+    x1 = (boxes[:, cv2.CC_STAT_LEFT] + boxes[:, cv2.CC_STAT_WIDTH]).max()
+    y1 = (boxes[:, cv2.CC_STAT_TOP] + boxes[:, cv2.CC_STAT_HEIGHT]).max()
+    line_height = float(np.median(boxes[:, cv2.CC_STAT_HEIGHT])) / scale
+
+    pad_x, pad_y = round(width * CROP_MARGIN), round(height * CROP_MARGIN)
+    bbox = (
+        max(0, round(x0 / scale) - pad_x),
+        max(0, round(y0 / scale) - pad_y),
+        min(width, round(x1 / scale) + pad_x),
+        min(height, round(y1 / scale) + pad_y),
+    )
+    return bbox, line_height
+
+
+def crop_to_text(frame: np.ndarray, target_text_height: int = TARGET_TEXT_HEIGHT_PX) -> np.ndarray:
+    """Crop to the text block and downscale so lines are ~target_text_height px."""
+    bbox, line_height = detect_text(frame)
+    if bbox is None:
+        return frame
+    x0, y0, x1, y1 = bbox
+    cropped = frame[y0:y1, x0:x1]
+    if line_height > target_text_height:
+        factor = target_text_height / line_height
+        size = (max(1, round(cropped.shape[1] * factor)), max(1, round(cropped.shape[0] * factor)))
+        cropped = cv2.resize(cropped, size, interpolation=cv2.INTER_AREA)
+    return cropped
+
+
+# -------------------------------------------------------------------
+# JPEG payload budget
+# -------------------------------------------------------------------
+def encode_jpeg(frame: np.ndarray, quality: int = JPEG_QUALITY) -> bytes:
+    _, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+    return buf.tobytes()
+
+
+def _reencode(prepared: List[dict], quality: int, scale: float = 1.0) -> List[dict]:
+    out = []
+    for part in prepared:
+        img = cv2.imdecode(np.frombuffer(part["data"], np.uint8), cv2.IMREAD_COLOR)
+        if scale < 1.0:
+            size = (max(1, round(img.shape[1] * scale)), max(1, round(img.shape[0] * scale)))
+            img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+        out.append({"mime_type": "image/jpeg", "data": encode_jpeg(img, quality)})
+    return out
+
+
+def _size(prepared: List[dict]) -> int:
+    return sum(len(p["data"]) for p in prepared)
+
+
+def fit_to_budget(prepared: List[dict], budget: int = PAYLOAD_BUDGET_BYTES,
+                  quality: int = JPEG_QUALITY, stats: Optional[dict] = None) -> List[dict]:
+    """
+    Re-encode JPEG parts so their total stays within `budget` bytes: the
+    highest quality in [MIN_JPEG_QUALITY, quality) that fits (binary
+    search; size grows with quality), then downscaling if even that is
+    too large. Works from the encoded parts one frame at a time.
+    """
+    original = _size(prepared)
+    chosen, scale, result = quality, 1.0, prepared
+
+    if original > budget:
+        low, high, best = MIN_JPEG_QUALITY, quality - 1, None
+        while low <= high:
+            mid = (low + high) // 2
+            candidate = _reencode(prepared, mid)
+            if _size(candidate) <= budget:
+                best, chosen, low = candidate, mid, mid + 1
+            else:
+                high = mid - 1
+
+        if best is not None:
+            result = best
+        else:
+            chosen = MIN_JPEG_QUALITY
+            while True:
+                scale *= BUDGET_SCALE_STEP
+                result = _reencode(prepared, chosen, scale)
+                if _size(result) <= budget or scale * BUDGET_SCALE_STEP < MIN_BUDGET_SCALE:
+                    break
+            if _size(result) > budget:
+                logger.warning(f"Video frames still exceed the payload budget: {_size(result)} > {budget} bytes")
+
+    if stats is not None:
+        stats.update(bytes_before_budget=original, bytes=_size(result), quality=chosen, budget_scale=round(scale, 3))
+    return result
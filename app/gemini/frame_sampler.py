@@ -0,0 +1,207 @@
+import os
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .logger import logger
+
+SAMPLE_INTERVAL_MS = int(os.getenv("VIDEO_SAMPLE_INTERVAL_MS", "300"))
+MIN_INTERVAL_MS = int(os.getenv("VIDEO_MIN_INTERVAL_MS", "150"))
+MAX_INTERVAL_MS = int(os.getenv("VIDEO_MAX_INTERVAL_MS", "1200"))
+ADAPTIVE_SAMPLING = os.getenv("VIDEO_ADAPTIVE_SAMPLING", "true").lower() == "true"
+
+# Every frame is a keyframe: a seek never has to decode a GOP first
+INTRA_CODECS = {"MJPG", "MJPA", "JPEG", "PNG ", "RAW ", "I420", "YUY2", "Y800"}
+
+# Containers with a frame index OpenCV/FFmpeg can seek through. WebM and
+# MPEG-TS recordings often report no frame count and seek inexactly.
+SEEKABLE_CONTAINERS = {".mp4", ".m4v", ".mov", ".mkv", ".avi"}
+
+# Minimum gap (in frames) for which a seek beats grabbing forward. OpenCV's
+# FFmpeg backend lands a few frames early and decodes up to ~16 frames to
+# reach the target even for intra-only codecs; inter-frame codecs (H.264,
+# VP9, MPEG-4) also decode from the preceding keyframe, so the gap has to
+# span a typical screen-recorder GOP (1-2 s).
+SEEK_MIN_GAP_INTRA = 32
+SEEK_MIN_GAP_FRAMES = 60
+
+# Mean absolute difference (0-255) between consecutive sampled thumbnails
+MOTION_THRESHOLD = 2.0
+STATIC_THRESHOLD = 0.5
+THUMB_WIDTH = 64
+
+
+@dataclass
+class SamplingStats:
+    strategy: str = ""
+    fps: float = 0.0
+    frame_count: int = 0
+    grabbed: int = 0
+    seeks: int = 0
+    decoded: int = 0
+    sampled: int = 0
+    intervals_ms: list = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "fps": round(self.fps, 2),
+            "frame_count": self.frame_count,
+            "grabbed": self.grabbed,
+            "seeks": self.seeks,
+            "decoded": self.decoded,
+            "sampled": self.sampled,
+            "min_interval_ms": min(self.intervals_ms, default=0),
+            "max_interval_ms": max(self.intervals_ms, default=0),
+        }
+
+
+def codec_of(cap) -> str:
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    return fourcc.to_bytes(4, "little").decode("ascii", errors="replace").upper()
+
+
+def seek_min_gap(cap, path: str) -> Optional[int]:
+    """Smallest frame gap worth seeking over, or None if seeking is unreliable."""
+    if cap.get(cv2.CAP_PROP_FPS) <= 0 or cap.get(cv2.CAP_PROP_FRAME_COUNT) <= 0:
+        return None
+    if os.path.splitext(path)[1].lower() not in SEEKABLE_CONTAINERS:
+        return None
+    return SEEK_MIN_GAP_INTRA if codec_of(cap) in INTRA_CODECS else SEEK_MIN_GAP_FRAMES
+
+
+class IntervalSchedule:
+    """
+    When the next frame is due. With `adaptive`, the interval halves while
+    consecutive samples differ (scrolling) and doubles while they do not
+    (a static page), within [min_ms, max_ms].
+    """
+
+    def __init__(self, interval_ms: float, adaptive: bool = False,
+                 min_ms: float = MIN_INTERVAL_MS, max_ms: float = MAX_INTERVAL_MS, start_ms: float = 0.0):
+        self.base_ms = interval_ms
+        self.interval_ms = interval_ms
+        self.adaptive = adaptive
+        self.min_ms = min(min_ms, interval_ms)
+        self.max_ms = max(max_ms, interval_ms)
+        self.next_ms = start_ms
+        self._last_thumb: Optional[np.ndarray] = None
+
+    def observe(self, t_ms: float, frame: np.ndarray) -> float:
+        if self.adaptive:
+            thumb = _thumbnail(frame)
+            if self._last_thumb is not None:
+                motion = float(np.mean(cv2.absdiff(thumb, self._last_thumb)))
+                if motion > MOTION_THRESHOLD:
+                    self.interval_ms = max(self.min_ms, self.interval_ms / 2)
+                elif motion < STATIC_THRESHOLD:
+                    self.interval_ms = min(self.max_ms, self.interval_ms * 2)
+                else:
+                    self.interval_ms = self.base_ms
+            self._last_thumb = thumb
+        self.next_ms = t_ms + self.interval_ms
+        return self.interval_ms
+
+
+def _thumbnail(frame: np.ndarray) -> np.ndarray:
+    height, width = frame.shape[:2]
+    size = (THUMB_WIDTH, max(1, round(height * THUMB_WIDTH / width)))
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+
+def _grab_frames(cap, schedule: IntervalSchedule, stats: SamplingStats):
+    """Walk every packet, but only decode (retrieve) the frames that are due."""
+    while cap.grab():
+        stats.grabbed += 1
+        t = cap.get(cv2.CAP_PROP_POS_MSEC)
+        if t < schedule.next_ms:
+            continue
+        ok, img = cap.retrieve()
+        if not ok:
+            continue
+        stats.decoded += 1
+        yield t, img
+
+
+def _indexed_frames(cap, schedule: IntervalSchedule, stats: SamplingStats, min_gap: int):
+    """
+    Step by frame index: seek over gaps of at least `min_gap` frames,
+    grab() through shorter ones, decode only the due frame.
+    """
+    fps, frame_count = stats.fps, stats.frame_count
+    position = 0  # index of the frame the next grab()/read() returns
+    index = -1
+    while True:
+        index = max(index + 1, int(round(schedule.next_ms * fps / 1000.0)))
+        if index >= frame_count:
+            return
+        if index - position >= min_gap:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+            stats.seeks += 1
+        else:
+            while position < index:
+                if not cap.grab():
+                    return
+                stats.grabbed += 1
+                position += 1
+        ok, img = cap.read()
+        if not ok:
+            return
+        position = index + 1
+        stats.decoded += 1
+        yield index * 1000.0 / fps, img
+
+
+def sample_frames(
+    path: str,
+    interval_ms: float = SAMPLE_INTERVAL_MS,
+    strategy: str = "auto",
+    adaptive: bool = ADAPTIVE_SAMPLING,
+    stats: Optional[SamplingStats] = None,
+    start_ms: float = 0.0,
+    end_ms: Optional[float] = None,
+) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Yield (timestamp_ms, frame) roughly every `interval_ms` without
+    converting or copying the frames in between.
+
+    `strategy`: 'grab' walks the stream with grab() and decodes only due
+    frames; 'seek' jumps to every due frame by index; 'auto' seeks over
+    gaps long enough to pay off for this container and codec and grabs
+    through the rest (falling back to 'grab' when the file has no usable
+    index). `start_ms`/`end_ms` restrict sampling to one segment of the
+    video. Pass `stats` to collect counters.
+    """
+    stats = stats if stats is not None else SamplingStats()
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        logger.error("Cannot open video")
+        return
+
+    try:
+        stats.fps = cap.get(cv2.CAP_PROP_FPS)
+        stats.frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        schedule = IntervalSchedule(interval_ms, adaptive=adaptive, start_ms=start_ms)
+        min_gap = seek_min_gap(cap, path)
+        if min_gap is None or strategy == "grab":
+            stats.strategy = "grab"
+            frames = _grab_frames(cap, schedule, stats)
+        else:
+            stats.strategy = strategy
+            frames = _indexed_frames(cap, schedule, stats, 1 if strategy == "seek" else min_gap)
+
+        for t, img in frames:
+            if end_ms is not None and t >= end_ms:
+                break
+            stats.sampled += 1
+            stats.intervals_ms.append(schedule.observe(t, img))
+            yield t, img
+    finally:
+        cap.release()
+        logger.info(
+            f"Sampled {stats.sampled} frames ({stats.strategy}: {stats.seeks} seeks, {stats.grabbed} grabbed)",
+            extra=stats.as_dict(),
+        )
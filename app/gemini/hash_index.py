@@ -0,0 +1,125 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over 64-bit hashes under Hamming distance. A
+    query within `radius` only descends into children whose edge distance
+    d satisfies |d - distance(query, node)| <= radius (triangle inequality),
+    so lookups touch a small part of the tree instead of every hash.
+    """
+
+    def __init__(self):
+        self._root: Optional[Tuple[int, Dict[int, tuple]]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, h: int):
+        h = int(h)
+        if self._root is None:
+            self._root = (h, {})
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            value, children = node
+            d = hamming(h, value)
+            if d == 0:
+                return
+            child = children.get(d)
+            if child is None:
+                children[d] = (h, {})
+                self._size += 1
+                return
+            node = child
+
+    def search(self, h: int, radius: int) -> List[Tuple[int, int]]:
+        """All (distance, hash) within `radius` of `h`."""
+        return list(self._walk(int(h), radius, first_only=False))
+
+    def find(self, h: int, radius: int) -> Optional[int]:
+        """Any stored hash within `radius` of `h`, or None."""
+        for _, value in self._walk(int(h), radius, first_only=True):
+            return value
+        return None
+
+    def _walk(self, h: int, radius: int, first_only: bool):
+        if self._root is None:
+            return
+        stack = [self._root]
+        while stack:
+            value, children = stack.pop()
+            d = hamming(h, value)
+            if d <= radius:
+                yield d, value
+                if first_only:
+                    return
+            for edge, child in children.items():
+                if d - radius <= edge <= d + radius:
+                    stack.append(child)
+
+
+class MultiIndexHashTable:
+    """
+    Hamming-radius lookup that, unlike the BK-tree, supports removal (for
+    caches that evict). Hashes are split into radius + 1 disjoint bit
+    chunks, each with its own exact-match table: by pigeonhole any hash
+    within `radius` of a query agrees with it on at least one chunk, so the
+    candidates come from radius + 1 dict lookups and only those are checked
+    at full length.
+    """
+
+    def __init__(self, radius: int, bits: int = 64):
+        self.radius = radius
+        count = radius + 1
+        edges = [bits * i // count for i in range(count + 1)]
+        self._chunks = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(edges, edges[1:])]
+        self._tables: List[Dict[int, Set[int]]] = [{} for _ in self._chunks]
+        self._hashes: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, h: int) -> bool:
+        return int(h) in self._hashes
+
+    def _keys(self, h: int):
+        return ((h >> shift) & mask for shift, mask in self._chunks)
+
+    def add(self, h: int):
+        h = int(h)
+        if h in self._hashes:
+            return
+        self._hashes.add(h)
+        for table, key in zip(self._tables, self._keys(h)):
+            table.setdefault(key, set()).add(h)
+
+    def remove(self, h: int):
+        h = int(h)
+        if h not in self._hashes:
+            return
+        self._hashes.discard(h)
+        for table, key in zip(self._tables, self._keys(h)):
+            bucket = table[key]
+            bucket.discard(h)
+            if not bucket:
+                del table[key]
+
+    def find(self, h: int) -> Optional[int]:
+        """The closest stored hash within the radius, or None."""
+        h = int(h)
+        if h in self._hashes:
+            return h
+        best, best_d = None, self.radius + 1
+        for table, key in zip(self._tables, self._keys(h)):
+            for candidate in table.get(key, ()):
+                d = hamming(h, candidate)
+                if d < best_d:
+                    best, best_d = candidate, d
+        return best
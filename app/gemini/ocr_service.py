@@ -0,0 +1,160 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from .frame_cache import FrameTextCache
+from .logger import logger
+from .phash import phash_frames
+
+OCR_LANGUAGES = [lang.strip() for lang in os.getenv("OCR_LANGUAGES", "en").split(",") if lang.strip()]
+# Frames per readtext_batched call (also the recognizer's batch size)
+OCR_BATCH_SIZE = int(os.getenv("OCR_BATCH_SIZE", "8"))
+# OCR requests run at once; each one pins a CPU (or the GPU) for seconds
+OCR_MAX_CONCURRENCY = int(os.getenv("OCR_MAX_CONCURRENCY", "1"))
+OCR_GPU = os.getenv("OCR_GPU", "false").lower() == "true"
+# Load the models at API startup rather than on the first fallback
+OCR_WARMUP = os.getenv("OCR_WARMUP", "true").lower() == "true"
+
+
+def _easyocr_reader(languages: Sequence[str], gpu: bool):
+    import easyocr
+
+    return easyocr.Reader(list(languages), gpu=gpu, verbose=False)
+
+
+def pad_batch(images: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Stack differently sized frames on one white canvas size so the detector
+    runs them as a single batch. Padding rather than resizing keeps the text
+    at the scale prepare_frames chose for it.
+    """
+    height = max(img.shape[0] for img in images)
+    width = max(img.shape[1] for img in images)
+    batch = np.full((len(images), height, width, 3), 255, np.uint8)
+    for i, img in enumerate(images):
+        batch[i, : img.shape[0], : img.shape[1]] = img
+    return batch
+
+
+class OCRService:
+    """
+    One EasyOCR reader per process. Loading the detection and recognition
+    models takes seconds, so it happens once (in the background from
+    `warm_up()` at startup, or on first use) and every request reuses it.
+    Requests beyond `max_concurrency` wait their turn instead of fighting
+    over the same cores.
+    """
+
+    def __init__(
+        self,
+        languages: Sequence[str] = OCR_LANGUAGES,
+        batch_size: int = OCR_BATCH_SIZE,
+        max_concurrency: int = OCR_MAX_CONCURRENCY,
+        gpu: bool = OCR_GPU,
+        reader_factory: Optional[Callable] = None,
+        cache: Optional[FrameTextCache] = None,
+    ):
+        self.languages = list(languages)
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.gpu = gpu
+        self.reader_factory = reader_factory or _easyocr_reader
+        self.cache = cache
+
+        self.load_seconds: Optional[float] = None
+        self._reader = None
+        self._load_lock = threading.Lock()
+        self._loader: Optional[threading.Thread] = None
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._reader is not None
+
+    def warm_up(self) -> threading.Thread:
+        """Load the models on a background thread; returns at once."""
+        if self._loader is None:
+            self._loader = threading.Thread(target=self._load_reader, name="ocr-warmup", daemon=True)
+            self._loader.start()
+        return self._loader
+
+    def _load_reader(self):
+        if self._reader is not None:
+            return self._reader
+        with self._load_lock:
+            if self._reader is None:
+                start = time.perf_counter()
+                try:
+                    reader = self.reader_factory(self.languages, self.gpu)
+                except Exception:
+                    logger.exception("Failed to load the OCR models")
+                    raise
+                self.load_seconds = time.perf_counter() - start
+                self._reader = reader
+                logger.info(f"OCR models loaded in {self.load_seconds:.1f}s (languages={self.languages})")
+        return self._reader
+
+    def read_images(self, images: Sequence[np.ndarray]) -> List[str]:
+        """Text of every image, in order; blocks until a slot and the models are free."""
+        images = [img for img in images if img is not None]
+        if not images:
+            return []
+        reader = self._load_reader()
+        texts: List[str] = []
+        with self._slots:
+            for i in range(0, len(images), self.batch_size):
+                batch = pad_batch(images[i : i + self.batch_size])
+                results = reader.readtext_batched(batch, detail=0, batch_size=self.batch_size)
+                texts.extend(" ".join(lines) for lines in results)
+        return texts
+
+    def read_frames(self, prepared_frames: Sequence[dict], scope: str = "") -> List[str]:
+        """
+        Text of every prepared (JPEG) frame. With a cache, frames whose
+        perceptual hash is near one read before in the same `scope` (user)
+        reuse that text and only the rest reach the OCR models.
+        """
+        images = [cv2.imdecode(np.frombuffer(part["data"], np.uint8), cv2.IMREAD_COLOR) for part in prepared_frames]
+        images = [img for img in images if img is not None]
+        start = time.perf_counter()
+
+        texts: List[Optional[str]] = [None] * len(images)
+        hashes = phash_frames(images) if self.cache is not None else []
+        for i, h in enumerate(hashes):
+            texts[i] = self.cache.get(h, scope)
+        missing = [i for i, text in enumerate(texts) if text is None]
+
+        for i, text in zip(missing, self.read_images([images[i] for i in missing])):
+            texts[i] = text
+            if self.cache is not None:
+                self.cache.put(hashes[i], text, scope)
+
+        logger.info(
+            f"OCR read {len(missing)} of {len(texts)} frames ({len(texts) - len(missing)} cached, "
+            f"{sum(len(p['data']) for p in prepared_frames)} bytes) in {time.perf_counter() - start:.2f}s"
+        )
+        return texts
+
+    async def aread_frames(self, prepared_frames: Sequence[dict], scope: str = "") -> List[str]:
+        """read_frames off the event loop; waiting requests queue here, not on worker threads."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await asyncio.to_thread(self.read_frames, prepared_frames, scope)
+
+
+_service: Optional[OCRService] = None
+
+
+def get_ocr_service() -> OCRService:
+    """The process-wide OCR service."""
+    global _service
+    if _service is None:
+        _service = OCRService(cache=FrameTextCache())
+    return _service
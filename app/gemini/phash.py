@@ -0,0 +1,50 @@
+from typing import Sequence
+
+import cv2
+import numpy as np
+
+HASH_SIZE = 8
+HIGHFREQ_FACTOR = 4
+IMG_SIZE = HASH_SIZE * HIGHFREQ_FACTOR
+
+
+def _dct_rows(n: int, rows: int) -> np.ndarray:
+    """First `rows` rows of the (unnormalized) DCT-II matrix, as scipy.fftpack.dct."""
+    k = np.arange(rows)[:, None]
+    i = np.arange(n)[None, :]
+    return (2.0 * np.cos(np.pi * k * (2 * i + 1) / (2 * n))).astype(np.float32)
+
+
+_DCT = _dct_rows(IMG_SIZE, HASH_SIZE)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def thumbnail(frame: np.ndarray) -> np.ndarray:
+    """32x32 grayscale input of the hash (same luma weights as PIL's 'L')."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return cv2.resize(gray, (IMG_SIZE, IMG_SIZE), interpolation=cv2.INTER_AREA)
+
+
+def phash_thumbnails(thumbs: np.ndarray) -> np.ndarray:
+    """
+    64-bit perceptual hashes of a (N, 32, 32) stack: the low-frequency 8x8
+    corner of the 2-D DCT of every thumbnail in one pair of matmuls, each
+    bit set where the coefficient exceeds that thumbnail's median.
+    """
+    stack = np.asarray(thumbs, dtype=np.float32)
+    low = (_DCT @ stack @ _DCT.T).reshape(len(stack), HASH_SIZE * HASH_SIZE)
+    bits = low > np.median(low, axis=1, keepdims=True)
+    return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def phash_frames(frames: Sequence[np.ndarray]) -> np.ndarray:
+    """Hashes of a batch of BGR frames."""
+    if not len(frames):
+        return np.zeros(0, dtype=np.uint64)
+    return phash_thumbnails(np.stack([thumbnail(f) for f in frames]))
+
+
+def hamming(a, b) -> np.ndarray:
+    """Bit distance between uint64 hashes (broadcasts)."""
+    xor = np.bitwise_xor(np.asarray(a, dtype=np.uint64), np.asarray(b, dtype=np.uint64))
+    return _POPCOUNT[xor[..., None].view(np.uint8)].sum(axis=-1).astype(np.int64)
@@ -1,9 +1,14 @@
+import asyncio
 import json
 from .video_extraction import (
+    VISION_MAX_CONCURRENCY,
+    VISION_WINDOWED,
+    VISION_WINDOW_FRAMES,
+    VISION_WINDOW_OVERLAP,
     compute_video_hash,
-    extract_raw_frames,
-    dedupe_frames,
-    prepare_frames,
+    plan_windows,
+    stitch_extractions,
+    stream_prepared_frames,
     ocr_fallback,
     validate_extraction,
 )
@@ -14,13 +19,71 @@ from app.utils.time_tracker import TimeTracker
 
 tracker = TimeTracker()
 
-async def extract_text_from_video(client, video_path: str) -> dict:
+async def vision_extract(client, prompt, frames) -> dict:
+    """One Gemini Vision request over `frames`; raises when the result is unusable."""
+    content = [prompt] + list(frames)
+    logger.debug(f"Gemini Vision content: prompt + {len(frames)} frames")
+    tracker.mark("gemini_vision_call_start")
+    resp = await client.call(
+        "video_text_extraction",
+        client.client.models.generate_content,
+        model=client.vision_model,
+        contents=content,
+        generation_config={"response_mime_type": "application/json"},
+        safety_settings=client.safety(),
+    )
+    tracker.mark("gemini_vision_call_end")
+    logger.debug(f"Gemini Vision raw response: {resp.text}")
+    parsed_response = safe_json_parse(resp.text)
+    logger.debug(f"Gemini Vision parsed response: {parsed_response}")
+    extracted_text = validate_extraction(parsed_response)
+    logger.info(f"Gemini Vision validation successful.")
+    tracker.mark("gemini_vision_validation_complete")
+    return extracted_text
+
+
+async def extract_windowed(
+    client,
+    prompt,
+    frames,
+    window_frames: int = VISION_WINDOW_FRAMES,
+    overlap: int = VISION_WINDOW_OVERLAP,
+    concurrency: int = VISION_MAX_CONCURRENCY,
+    user_id: str = "",
+) -> dict:
+    """
+    Extract overlapping windows of frames concurrently and stitch the
+    partial texts in frame order. A window that Gemini Vision fails on or
+    blocks is OCR'd on its own; the other windows keep their vision result.
+    """
+    windows = plan_windows(len(frames), window_frames, overlap)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(index, start, end):
+        async with semaphore:
+            try:
+                return await vision_extract(client, prompt, frames[start:end])
+            except (Exception, GeminiSafetyError) as e:
+                logger.warning(f"Gemini Vision failed on window {index} (frames {start}-{end}): {e}. OCR for this window.")
+                return await ocr_fallback(frames[start:end], scope=user_id)
+
+    logger.info(f"Extracting {len(frames)} frames in {len(windows)} windows of {window_frames} (overlap {overlap})")
+    results = await asyncio.gather(*(run(i, start, end) for i, (start, end) in enumerate(windows)))
+    tracker.mark("windowed_extraction_complete")
+    return stitch_extractions(results)
+
+
+async def extract_text_from_video(client, video_path: str, video_hash: str = None, user_id: str = "") -> dict:
     """
     Extracts resume and job description text from a video file.
     It uses Gemini Vision with an OCR fallback and caches the result in Redis.
+    Pass `video_hash` when the SHA-256 is already known (hashed during upload)
+    so the cache is checked without reading the file again. `user_id` keeps
+    OCR'd frame text cached for this user's videos only.
     """
     tracker.mark("video_analysis_started")
-    video_hash = compute_video_hash(video_path)
+    if video_hash is None:
+        video_hash = await asyncio.to_thread(compute_video_hash, video_path)
     if client.redis:
         cached_text = await client.redis.get(f"video_extract:{video_hash}")
         if cached_text:
@@ -30,40 +93,22 @@ async def extract_text_from_video(client, video_path: str) -> dict:
     
     logger.info(f"Video text cache MISS for hash {video_hash}. Processing video.")
     tracker.mark("video_analysis_cache_miss")
-    raw_frames = extract_raw_frames(video_path)
-    tracker.mark("raw_frames_extracted")
-    unique_frames = dedupe_frames(raw_frames)
-    tracker.mark("frames_deduplicated")
-    prepared_frames = prepare_frames(unique_frames)
+    # Decode, dedupe and encode stream frame by frame off the event loop
+    prepared_frames = await asyncio.to_thread(stream_prepared_frames, video_path)
     tracker.mark("frames_prepared_for_api")
     prompt = await client.prompts.get("analyze_video")
-    content = [prompt] + prepared_frames
-    logger.debug(f"Gemini Vision content: {content}")
-
-    try:
-        tracker.mark("gemini_vision_call_start")
-        resp = await client.call(
-            "video_text_extraction",
-            client.client.models.generate_content,
-            model=client.vision_model,
-            contents=content,
-            generation_config={"response_mime_type": "application/json"},
-            safety_settings=client.safety(),
-        )
-        tracker.mark("gemini_vision_call_end")
-        logger.debug(f"Gemini Vision raw response: {resp.text}")
-        parsed_response = safe_json_parse(resp.text)
-        logger.debug(f"Gemini Vision parsed response: {parsed_response}")
-        extracted_text = validate_extraction(parsed_response)
-        logger.info(f"Gemini Vision validation successful.")
-        tracker.mark("gemini_vision_validation_complete")
 
-    except (Exception, GeminiSafetyError) as e:
-        logger.warning(f"Gemini Vision failed or was blocked: {e}. Falling back to OCR.")
-        tracker.mark("gemini_vision_failed_starting_ocr")
-        extracted_text = ocr_fallback(prepared_frames)
-        tracker.mark("ocr_fallback_complete")
-        logger.debug(f"OCR fallback result: {extracted_text}")
+    if VISION_WINDOWED and len(prepared_frames) > VISION_WINDOW_FRAMES:
+        extracted_text = await extract_windowed(client, prompt, prepared_frames, user_id=user_id)
+    else:
+        try:
+            extracted_text = await vision_extract(client, prompt, prepared_frames)
+        except (Exception, GeminiSafetyError) as e:
+            logger.warning(f"Gemini Vision failed or was blocked: {e}. Falling back to OCR.")
+            tracker.mark("gemini_vision_failed_starting_ocr")
+            extracted_text = await ocr_fallback(prepared_frames, scope=user_id)
+            tracker.mark("ocr_fallback_complete")
+            logger.debug(f"OCR fallback result: {extracted_text}")
 
     if client.redis:
         # Use a different key for extracted text to not conflict with final analysis
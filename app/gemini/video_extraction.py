@@ -1,75 +1,221 @@
 import hashlib
+import os
+import re
 import cv2
 import numpy as np
-import imagehash
-from PIL import Image
-import easyocr
 
 from app.gemini.exceptions import GeminiSafetyError
 
+from . import frame_pool
+from .frame_prep import JPEG_QUALITY, PAYLOAD_BUDGET_BYTES, TEXT_CROP, crop_to_text, encode_jpeg, fit_to_budget
+from .frame_sampler import SAMPLE_INTERVAL_MS, sample_frames
 from .logger import logger
+from .ocr_service import get_ocr_service
+from .hash_index import BKTree
+from .phash import phash_frames
 
+# Upper bound on frames sent to Gemini Vision (and OCR) per video
+MAX_VIDEO_FRAMES = int(os.getenv("MAX_VIDEO_FRAMES", "48"))
 
-def compute_video_hash(path):
-    with open(path, "rb") as f:
-        return hashlib.sha256(f.read()).hexdigest()
+# Frames hashed together in one DCT batch (and so held at once)
+HASH_BATCH = 8
+DEDUPE_THRESHOLD = 5
+
+# Mean absolute difference (0-255) on a GATE_WIDTH px subsample below which
+# a frame is treated as unchanged and never hashed
+SCENE_GATE_DIFF = 1.0
+GATE_WIDTH = 64
+
+# Windowed Gemini Vision extraction: frames per request, frames shared by
+# neighbouring windows (so text cut at a window edge is seen whole once),
+# and windows in flight at once
+VISION_WINDOWED = os.getenv("VISION_WINDOWED", "true").lower() == "true"
+VISION_WINDOW_FRAMES = int(os.getenv("VISION_WINDOW_FRAMES", "12"))
+VISION_WINDOW_OVERLAP = int(os.getenv("VISION_WINDOW_OVERLAP", "2"))
+VISION_MAX_CONCURRENCY = int(os.getenv("VISION_MAX_CONCURRENCY", "4"))
 
 
-def extract_raw_frames(path, interval_ms=300):
-    frames = []
-    cap = cv2.VideoCapture(path)
+def compute_video_hash(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
-    if not cap.isOpened():
-        logger.error("Cannot open video")
-        return []
+# -------------------------------------------------------------------
+# Frame pipeline: sample -> dedupe -> encode, one frame in flight
+# -------------------------------------------------------------------
+def extract_raw_frames(path, interval_ms=SAMPLE_INTERVAL_MS, strategy="auto", adaptive=None,
+                       start_ms=0.0, end_ms=None):
+    """Yield frames sampled every `interval_ms`; only sampled frames are decoded."""
+    kwargs = {} if adaptive is None else {"adaptive": adaptive}
+    for _, img in sample_frames(path, interval_ms, strategy=strategy, start_ms=start_ms, end_ms=end_ms, **kwargs):
+        yield img
 
-    last = -interval_ms
-    ok, img = cap.read()
 
-    while ok:
-        t = cap.get(cv2.CAP_PROP_POS_MSEC)
-        if t - last >= interval_ms:
-            frames.append(img.copy())
-            last = t
-        ok, img = cap.read()
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
-    cap.release()
-    return frames
 
+def _gate_thumbnail(frame):
+    height, width = frame.shape[:2]
+    small = cv2.resize(frame, (GATE_WIDTH, max(1, height * GATE_WIDTH // width)), interpolation=cv2.INTER_NEAREST)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
 
-def dedupe_frames(frames, threshold=5):
-    unique = []
-    last_hash = None
 
+def scene_gate(frames, min_diff=SCENE_GATE_DIFF):
+    """
+    Drop frames that barely differ from the last frame let through, judged
+    on a nearest-neighbour 64 px grayscale subsample, before paying for the
+    area-resampled hash thumbnail. Comparing against the last passed frame
+    (not the previous one) means a slow drift still gets through once it
+    adds up.
+    """
+    previous = None
     for f in frames:
-        pil = Image.fromarray(cv2.cvtColor(f, cv2.COLOR_BGR2RGB))
-        h = imagehash.phash(pil)
+        small = _gate_thumbnail(f)
+        if previous is not None and float(np.mean(cv2.absdiff(small, previous))) < min_diff:
+            continue
+        previous = small
+        yield f
+
+
+def dedupe_with_hashes(frames, threshold=DEDUPE_THRESHOLD, batch_size=HASH_BATCH, index=None):
+    """
+    Yield (frame, phash) for frames more than `threshold` bits away from
+    every frame kept so far (a BK-tree over the kept hashes), so scrolling
+    back or returning to a page does not re-admit it. Hashes are computed
+    HASH_BATCH frames at a time (one stacked DCT, see app.gemini.phash).
+    """
+    index = BKTree() if index is None else index
+    for batch in _batches(frames, batch_size):
+        for f, h in zip(batch, phash_frames(batch)):
+            h = int(h)
+            if index.find(h, threshold) is None:
+                index.add(h)
+                yield f, h
+
+
+def dedupe_frames(frames, threshold=DEDUPE_THRESHOLD):
+    """Yield frames that are neither a scene-gate repeat nor a near-duplicate of a kept frame."""
+    for f, _ in dedupe_with_hashes(scene_gate(frames), threshold):
+        yield f
 
-        if last_hash is None or abs(h - last_hash) > threshold:
-            unique.append(f)
-            last_hash = h
 
-    return unique
+def prepare_frame(frame, crop=TEXT_CROP, quality=JPEG_QUALITY):
+    """
+    One frame as a JPEG part for Gemini Vision, cropped to its text block
+    and downscaled to a readable text height when `crop` is set.
+    """
+    if crop:
+        frame = crop_to_text(frame)
+    return {"mime_type": "image/jpeg", "data": encode_jpeg(frame, quality)}
 
 
-def prepare_frames(frames):
-    prepared = []
+def prepare_frames(frames, crop=TEXT_CROP, quality=JPEG_QUALITY):
+    """Yield each frame through `prepare_frame`."""
     for f in frames:
-        _, buf = cv2.imencode(".jpg", f)
-        prepared.append({"mime_type": "image/jpeg", "data": buf.tobytes()})
-    return prepared
+        yield prepare_frame(f, crop, quality)
 
 
-def ocr_fallback(prepared_frames):
-    logger.info(f"Starting OCR fallback processing with EasyOCR and for frames {prepared_frames}.")
-    reader = easyocr.Reader(["en"])
-    resume, jd = [], []
+def cap_frames(items, max_frames=MAX_VIDEO_FRAMES, transform=None):
+    """
+    Keep at most `max_frames` items spread evenly over the whole stream
+    without knowing its length: whenever the kept list overflows, every
+    other item is dropped and the stride doubles.
+
+    `transform` (e.g. JPEG encoding) is applied only to items that pass
+    the stride, so skipped frames are never encoded, and the kept list
+    holds transformed items rather than raw frames.
+    """
+    kept, stride = [], 1
+    for i, item in enumerate(items):
+        if i % stride:
+            continue
+        kept.append(transform(item) if transform is not None else item)
+        if len(kept) > max_frames:
+            kept = kept[::2]
+            stride *= 2
+    return kept
+
+
+def process_segment(path, start_ms=0.0, end_ms=None, max_frames=MAX_VIDEO_FRAMES, threshold=DEDUPE_THRESHOLD):
+    """
+    Sample, dedupe, crop and encode one span of the video. Runs in a
+    frame_pool worker (or inline for a single span): frames never leave
+    the process that decoded them, only hashes and JPEG bytes come back.
+    """
+    counts = {"sampled": 0, "hashed": 0, "unique": 0}
+
+    def counted(items, key):
+        for item in items:
+            counts[key] += 1
+            yield item
+
+    sampled = counted(extract_raw_frames(path, start_ms=start_ms, end_ms=end_ms), "sampled")
+    hashed = counted(scene_gate(sampled), "hashed")
+    unique = counted(dedupe_with_hashes(hashed, threshold), "unique")
+    kept = cap_frames(unique, max_frames, transform=lambda item: (int(item[1]), prepare_frame(item[0])))
+    return {"frames": kept, **counts}
+
+
+def stream_prepared_frames(path, max_frames=MAX_VIDEO_FRAMES, byte_budget=PAYLOAD_BUDGET_BYTES, stats=None,
+                           workers=None):
+    """
+    The whole extract -> dedupe -> encode chain. Long seekable videos are
+    split into spans processed in parallel by the frame_pool; each span
+    holds at most a hash batch of full-resolution frames, whatever the
+    video length. Spans are stitched in order (a frame near-duplicating one
+    kept from an earlier span is dropped), capped to `max_frames`, and
+    re-encoded if needed to fit `byte_budget` for the whole request.
+    """
+    workers = frame_pool.VIDEO_WORKERS if workers is None else workers
+    segments = frame_pool.plan_segments(path, workers)
+    if len(segments) == 1:
+        results = [process_segment(path, max_frames=max_frames)]
+    else:
+        executor = frame_pool.get_executor()
+        results = executor.map(
+            process_segment,
+            *zip(*[(path, start, end, max_frames) for start, end in segments]),
+        )
 
-    for frame in prepared_frames:
-        arr = np.frombuffer(frame["data"], np.uint8)
-        img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-        text = " ".join(reader.readtext(img, detail=0))
+    counts = {"sampled": 0, "hashed": 0, "unique": 0, "segments": len(segments)}
+    stitched, index = [], BKTree()
+    for result in results:
+        for key in ("sampled", "hashed", "unique"):
+            counts[key] += result[key]
+        for h, part in result["frames"]:
+            if len(segments) > 1 and index.find(h, DEDUPE_THRESHOLD) is not None:
+                continue
+            index.add(h)
+            stitched.append(part)
 
+    prepared = cap_frames(stitched, max_frames)
+    budget = {}
+    prepared = fit_to_budget(prepared, byte_budget, stats=budget)
+
+    if stats is not None:
+        stats.update(counts, sent=len(prepared), **budget)
+    logger.info(
+        f"Prepared {len(prepared)} of {counts['unique']} unique frames ({counts['sampled']} sampled, "
+        f"{counts['segments']} segments), {budget['bytes']} bytes at quality {budget['quality']}",
+        extra={**counts, **budget},
+    )
+    return prepared
+
+
+def split_ocr_text(texts):
+    resume, jd = [], []
+    for text in texts:
         if "experience" in text.lower() or "education" in text.lower():
             resume.append(text)
         else:
@@ -81,6 +227,60 @@ def ocr_fallback(prepared_frames):
     }
 
 
+async def ocr_fallback(prepared_frames, service=None, scope: str = ""):
+    """Read the frames with the shared (already loaded) OCR engine; `scope` partitions its frame cache."""
+    service = service or get_ocr_service()
+    logger.info(f"Starting OCR fallback for {len(prepared_frames)} frames (models loaded: {service.ready}).")
+    return split_ocr_text(await service.aread_frames(prepared_frames, scope))
+
+
+# -------------------------------------------------------------------
+# Windowed extraction: split frames, stitch the partial texts
+# -------------------------------------------------------------------
+def plan_windows(count, size=VISION_WINDOW_FRAMES, overlap=VISION_WINDOW_OVERLAP):
+    """(start, end) frame ranges of `size` frames, neighbours sharing `overlap`; the last one may be shorter."""
+    size = max(1, size)
+    step = max(1, size - max(0, overlap))
+    windows = []
+    start = 0
+    while True:
+        end = min(count, start + size)
+        windows.append((start, end))
+        if end >= count:
+            return windows
+        start += step
+
+
+def _norm_line(line):
+    return " ".join(re.sub(r"[^\w\s]", " ", line.lower()).split())
+
+
+def stitch_texts(parts):
+    """
+    Join the texts of consecutive windows in order. A window starts with
+    the text of the frames it shares with the previous one, so its leading
+    lines that already appear near the end of the stitched text (compared
+    case- and punctuation-insensitively) are dropped, up to the first line
+    that is new.
+    """
+    lines = []
+    for part in parts:
+        incoming = [line for line in (part or "").splitlines() if line.strip()]
+        tail = {_norm_line(line) for line in lines[-max(len(incoming), 1) * 2:]}
+        skip = 0
+        while skip < len(incoming) and _norm_line(incoming[skip]) in tail:
+            skip += 1
+        lines.extend(incoming[skip:])
+    return "\n".join(lines)
+
+
+def stitch_extractions(results):
+    return {
+        "resume_text": stitch_texts([r.get("resume_text", "") for r in results]),
+        "jd_text": stitch_texts([r.get("jd_text", "") for r in results]),
+    }
+
+
 def validate_extraction(data):
     if not data:
         raise GeminiSafetyError("Empty or blocked extraction")
@@ -3,7 +3,8 @@ This package contains the components of the Retrieval-Augmented Generation (RAG)
 """
 
 from .mongo_vector import search, upsert
+from .hybrid import hybrid_search, retrieve
 from .ingest import ingest_file, ingest_text
 
-__all__ = ["search", "upsert", "ingest_file", "ingest_text"]
+__all__ = ["search", "hybrid_search", "retrieve", "upsert", "ingest_file", "ingest_text"]
 
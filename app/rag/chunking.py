@@ -0,0 +1,252 @@
+import io
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, TextIO, Union
+
+# -------------------------------------------------------------------
+# Defaults
+# -------------------------------------------------------------------
+DEFAULT_MAX_TOKENS = 256
+DEFAULT_OVERLAP_TOKENS = 32
+READ_BLOCK_CHARS = 64 * 1024
+
+# Longest run of text without a separator kept in memory before it is
+# force-split at whitespace.
+MAX_UNIT_CHARS = 256 * 1024
+
+# Close a chunk early at a paragraph break once it is at least this full.
+PARAGRAPH_BREAK_FILL = 0.6
+
+# Words and individual punctuation marks, a cheap local stand-in for
+# the embedding model's tokenizer.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# A unit ends after sentence punctuation followed by whitespace, or at a
+# line break. Resumes and JDs are mostly bullet lines, so each line is
+# treated as its own sentence.
+_SEPARATOR_RE = re.compile(r"\n\s*|(?<=[.!?])\s+")
+
+_WORD_RE = re.compile(r"\S+\s*")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of `text` without calling the model.
+    """
+    return len(_TOKEN_RE.findall(text))
+
+
+@dataclass
+class Chunk:
+    text: str
+    index: int
+    char_start: int
+    char_end: int
+    token_count: int
+
+    def metadata(self) -> Dict[str, int]:
+        return {
+            "chunk_index": self.index,
+            "char_start": self.char_start,
+            "char_end": self.char_end,
+            "token_count": self.token_count,
+        }
+
+
+@dataclass(slots=True)
+class _Unit:
+    raw: str           # content plus its trailing separator
+    start: int         # absolute char offset of the content
+    tokens: int
+    new_paragraph: bool
+
+
+# -------------------------------------------------------------------
+# Segmentation
+# -------------------------------------------------------------------
+def _read_blocks(source: Union[TextIO, Iterable[str]], block_size: int) -> Iterator[str]:
+    if hasattr(source, "read"):
+        while True:
+            block = source.read(block_size)
+            if not block:
+                return
+            yield block
+    else:
+        yield from source
+
+
+def _iter_units(source: Union[TextIO, Iterable[str]], block_size: int) -> Iterator[_Unit]:
+    """
+    Split a text stream into sentence/line units, holding at most one
+    partial unit (capped at MAX_UNIT_CHARS) plus one read block in memory.
+    """
+    buf = ""
+    buf_offset = 0
+    new_paragraph = True
+    eof = False
+    blocks = _read_blocks(source, block_size)
+    find_tokens = _TOKEN_RE.findall
+
+    while not eof:
+        block = next(blocks, None)
+        if block is None:
+            eof = True
+        else:
+            buf += block
+
+        # Skip leading whitespace so units always start on content
+        stripped = buf.lstrip()
+        if len(stripped) != len(buf):
+            if "\n\n" in buf[: len(buf) - len(stripped)].replace("\r", ""):
+                new_paragraph = True
+            buf_offset += len(buf) - len(stripped)
+            buf = stripped
+
+        pos = 0
+        buf_len = len(buf)
+        for match in _SEPARATOR_RE.finditer(buf):
+            sep_start, sep_end = match.span()
+            # A separator touching the end of the buffer may continue in
+            # the next block; wait for it unless the stream is done.
+            if sep_end == buf_len and not eof:
+                break
+            if sep_start > pos:
+                yield _Unit(
+                    raw=buf[pos:sep_end],
+                    start=buf_offset + pos,
+                    tokens=len(find_tokens(buf, pos, sep_start)),
+                    new_paragraph=new_paragraph,
+                )
+            new_paragraph = match.group().count("\n") >= 2
+            pos = sep_end
+
+        buf = buf[pos:]
+        buf_offset += pos
+
+        # No separator for a long stretch: cut at the last whitespace so
+        # a single huge line cannot grow the buffer without bound.
+        if not eof and len(buf) > MAX_UNIT_CHARS:
+            half = MAX_UNIT_CHARS // 2
+            cut = buf.rfind(" ", 0, half) + 1 or half
+            yield _Unit(
+                raw=buf[:cut],
+                start=buf_offset,
+                tokens=estimate_tokens(buf[:cut]),
+                new_paragraph=new_paragraph,
+            )
+            new_paragraph = False
+            buf = buf[cut:]
+            buf_offset += cut
+
+    if buf.strip():
+        yield _Unit(
+            raw=buf,
+            start=buf_offset,
+            tokens=estimate_tokens(buf),
+            new_paragraph=new_paragraph,
+        )
+
+
+def _split_oversized(unit: _Unit, max_tokens: int) -> Iterator[_Unit]:
+    """Fall back to word windows for a single sentence above the budget."""
+    pieces: List[str] = []
+    piece_start = unit.start
+    tokens = 0
+    offset = unit.start
+    first = True
+
+    for match in _WORD_RE.finditer(unit.raw):
+        word_tokens = estimate_tokens(match.group())
+        if pieces and tokens + word_tokens > max_tokens:
+            yield _Unit("".join(pieces), piece_start, tokens, unit.new_paragraph and first)
+            first = False
+            pieces, tokens, piece_start = [], 0, offset
+        pieces.append(match.group())
+        tokens += word_tokens
+        offset += len(match.group())
+
+    if pieces:
+        yield _Unit("".join(pieces), piece_start, tokens, unit.new_paragraph and first)
+
+
+# -------------------------------------------------------------------
+# Packing
+# -------------------------------------------------------------------
+def _build_chunk(units: List[_Unit], index: int) -> Chunk:
+    text = "".join(u.raw for u in units).rstrip()
+    start = units[0].start
+    return Chunk(
+        text=text,
+        index=index,
+        char_start=start,
+        char_end=start + len(text),
+        token_count=sum(u.tokens for u in units),
+    )
+
+
+def iter_chunks(
+    source: Union[TextIO, Iterable[str]],
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+    block_size: int = READ_BLOCK_CHARS,
+) -> Iterator[Chunk]:
+    """
+    Stream chunks from a file handle (or any iterable of text blocks).
+
+    Chunks are built from whole sentences/lines, never exceed `max_tokens`
+    (unless a single word does), prefer to end at paragraph breaks, and
+    repeat up to `overlap_tokens` worth of trailing sentences from the
+    previous chunk. Offsets are character offsets into the source text.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    if overlap_tokens < 0 or overlap_tokens >= max_tokens:
+        raise ValueError("overlap_tokens must be in [0, max_tokens)")
+
+    current: List[_Unit] = []
+    current_tokens = 0
+    fresh = 0  # units in `current` not already emitted in a previous chunk
+    index = 0
+
+    for unit in _iter_units(source, block_size):
+        pieces = _split_oversized(unit, max_tokens) if unit.tokens > max_tokens else (unit,)
+
+        for piece in pieces:
+            paragraph_break = (
+                piece.new_paragraph
+                and current_tokens >= max_tokens * PARAGRAPH_BREAK_FILL
+            )
+            if fresh and (current_tokens + piece.tokens > max_tokens or paragraph_break):
+                yield _build_chunk(current, index)
+                index += 1
+
+                # Carry trailing units forward as overlap
+                carried: List[_Unit] = []
+                carried_tokens = 0
+                for prev in reversed(current[1:]):
+                    if carried_tokens + prev.tokens > overlap_tokens:
+                        break
+                    carried.insert(0, prev)
+                    carried_tokens += prev.tokens
+                if carried_tokens + piece.tokens > max_tokens:
+                    carried, carried_tokens = [], 0
+                current, current_tokens, fresh = carried, carried_tokens, 0
+
+            current.append(piece)
+            current_tokens += piece.tokens
+            fresh += 1
+
+    if fresh:
+        yield _build_chunk(current, index)
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+) -> Iterator[Chunk]:
+    """
+    Chunk an in-memory string. See `iter_chunks`.
+    """
+    return iter_chunks(io.StringIO(text), max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+
@@ -7,7 +7,11 @@ from typing import Optional
 from app.utils.logger import setup_logger
 
 logger = setup_logger()
-from app.rag.ingest import ingest_file, ingest_directory, ingest_text
+from app.rag.ingest import ingest_file, ingest_directory, ingest_text, plan_directory
+from app.rag.chunking import DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS
+from app.rag.mongo_vector import ensure_search_index, requantize_existing
+
+CHECKPOINT_NAME = ".cli_ingest.checkpoint.jsonl"
 
 
 def parse_args() -> argparse.Namespace:
@@ -21,12 +25,43 @@ def parse_args() -> argparse.Namespace:
         type=str,
         help="Raw text to ingest (for quick tests; not for large content)",
     )
+    group.add_argument(
+        "--ensure-index",
+        action="store_true",
+        help="Create or update the Atlas vector index (vector + filter fields) and exit",
+    )
+    group.add_argument(
+        "--requantize",
+        action="store_true",
+        help="Convert stored float embeddings to the VECTOR_QUANTIZATION layout and exit",
+    )
 
     parser.add_argument(
         "--chunk-size",
         type=int,
-        default=500,
-        help="Approximate number of words per chunk",
+        default=DEFAULT_MAX_TOKENS,
+        help="Maximum estimated tokens per chunk",
+    )
+
+    parser.add_argument(
+        "--overlap",
+        type=int,
+        default=DEFAULT_OVERLAP_TOKENS,
+        help="Estimated tokens of trailing sentences repeated in the next chunk",
+    )
+
+    parser.add_argument(
+        "--skills",
+        type=str,
+        default=None,
+        help="Comma-separated skill tags stored on every chunk (filterable)",
+    )
+
+    parser.add_argument(
+        "--roles",
+        type=str,
+        default=None,
+        help="Comma-separated role tags stored on every chunk (filterable)",
     )
 
     parser.add_argument(
@@ -36,6 +71,45 @@ def parse_args() -> argparse.Namespace:
         help="File extension filter for directory ingestion (e.g. .txt)",
     )
 
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=16,
+        help="Chunks embedded per Gemini call during directory ingestion",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Embedding calls in flight at once during directory ingestion",
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help=f"Checkpoint file for --dir runs (default: <dir>/{CHECKPOINT_NAME})",
+    )
+
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore any existing checkpoint and ingest the whole directory",
+    )
+
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-embed every file in --dir, not only new or changed ones",
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --dir, list the files that would be ingested or removed and exit",
+    )
+
     return parser.parse_args()
 
 
@@ -44,21 +118,63 @@ async def _run(
     dir: Optional[str],
     text: Optional[str],
     chunk_size: int,
+    overlap: int,
     ext: str,
+    batch_size: int = 16,
+    concurrency: int = 4,
+    checkpoint: Optional[str] = None,
+    restart: bool = False,
+    full: bool = False,
+    dry_run: bool = False,
+    tags: Optional[dict] = None,
+    ensure_index: bool = False,
+    requantize: bool = False,
 ):
+    if ensure_index:
+        action = await ensure_search_index()
+        logger.info(f"Vector search index {action}")
+        return
+
+    if requantize:
+        converted = await requantize_existing()
+        logger.info(f"Requantized {converted} vector documents")
+        return
+
     if file:
         logger.info(f"CLI ingestion: file={file}")
-        chunks = await ingest_file(file, chunk_size=chunk_size)
+        chunks = await ingest_file(file, metadata=tags, chunk_size=chunk_size, overlap=overlap)
         logger.info(f"File ingestion complete file={file} chunks={chunks}")
 
+    elif dir and dry_run:
+        plan = await plan_directory(dir, glob_ext=ext)
+        for label, paths in (("new", plan.new), ("changed", plan.changed), ("touched", plan.touched)):
+            for path in paths:
+                print(f"{label:>9}  {path}")
+        for entry in plan.deleted:
+            print(f"{'deleted':>9}  {entry.path}  ({len(entry.chunk_ids)} chunks)")
+        print(f"Plan: {plan.summary()}")
+
     elif dir:
-        logger.info(f"CLI ingestion: dir={dir} ext={ext}")
-        chunks = await ingest_directory(dir, glob_ext=ext, chunk_size=chunk_size)
+        checkpoint = checkpoint or os.path.join(dir, CHECKPOINT_NAME)
+        if restart and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        logger.info(f"CLI ingestion: dir={dir} ext={ext} checkpoint={checkpoint}")
+        chunks = await ingest_directory(
+            dir,
+            glob_ext=ext,
+            chunk_size=chunk_size,
+            overlap=overlap,
+            embed_batch_size=batch_size,
+            embed_concurrency=concurrency,
+            checkpoint_path=checkpoint,
+            incremental=not full,
+            metadata=tags,
+        )
         logger.info(f"Directory ingestion complete dir={dir} total_chunks={chunks}")
 
     elif text:
         logger.info("CLI ingestion: raw text")
-        chunks = await ingest_text(text, chunk_size=chunk_size)
+        chunks = await ingest_text(text, metadata=tags, chunk_size=chunk_size, overlap=overlap)
         logger.info(f"Text ingestion complete chunks={chunks}")
 
 
@@ -71,13 +187,29 @@ def main():
 
     args = parse_args()
 
+    tags = {}
+    if args.skills:
+        tags["skills"] = [s.strip() for s in args.skills.split(",") if s.strip()]
+    if args.roles:
+        tags["roles"] = [r.strip() for r in args.roles.split(",") if r.strip()]
+
     asyncio.run(
         _run(
             file=args.file,
             dir=args.dir,
             text=args.text,
             chunk_size=args.chunk_size,
+            overlap=args.overlap,
             ext=args.ext,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            checkpoint=args.checkpoint,
+            restart=args.restart,
+            full=args.full,
+            dry_run=args.dry_run,
+            tags=tags or None,
+            ensure_index=args.ensure_index,
+            requantize=args.requantize,
         )
     )
 
@@ -0,0 +1,101 @@
+from typing import Any, Dict, List, Optional
+
+# -------------------------------------------------------------------
+# Filterable fields
+# -------------------------------------------------------------------
+# Public filter name -> document path. Every path here is declared as a
+# `filter` field in the Atlas vector index (see `index_filter_paths`).
+FILTER_FIELDS = {
+    "source": "metadata.source",
+    "source_dir": "metadata.source_dir",
+    "skills": "metadata.skills",
+    "roles": "metadata.roles",
+}
+
+GENERATED_SOURCE = "generated_from_jd"
+
+
+def index_filter_paths() -> List[str]:
+    return sorted(set(FILTER_FIELDS.values()))
+
+
+def _condition(value: Any) -> Dict[str, Any]:
+    if isinstance(value, (list, tuple, set)):
+        return {"$in": list(value)}
+    return {"$eq": value}
+
+
+def build_filter(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Translate search filters into a `$vectorSearch` pre-filter.
+
+    Scalars match exactly, lists match any element (and array fields such
+    as `skills` match when they share an element). `generated_from_jd`
+    is a boolean shortcut on `source`. Unknown names raise ValueError.
+    """
+    if not filters:
+        return None
+
+    clauses = []
+    for name, value in filters.items():
+        if value is None:
+            continue
+        if name == GENERATED_SOURCE:
+            op = "$eq" if value else "$ne"
+            clauses.append({FILTER_FIELDS["source"]: {op: GENERATED_SOURCE}})
+        elif name in FILTER_FIELDS:
+            clauses.append({FILTER_FIELDS[name]: _condition(value)})
+        else:
+            raise ValueError(f"Unsupported search filter: {name}")
+
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+# -------------------------------------------------------------------
+# Local evaluation
+# -------------------------------------------------------------------
+def _lookup(doc: Dict[str, Any], path: str) -> Any:
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _match_condition(actual: Any, condition: Dict[str, Any]) -> bool:
+    values = actual if isinstance(actual, list) else [actual]
+    for op, expected in condition.items():
+        if op == "$eq" and expected not in values:
+            return False
+        if op == "$ne" and expected in values:
+            return False
+        if op == "$in" and not any(v in expected for v in values):
+            return False
+    return True
+
+
+def matches(doc: Dict[str, Any], compiled: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate a filter produced by `build_filter` against a document."""
+    if not compiled:
+        return True
+    if "$and" in compiled:
+        return all(matches(doc, clause) for clause in compiled["$and"])
+    return all(
+        _match_condition(_lookup(doc, path), condition)
+        for path, condition in compiled.items()
+    )
+
+
+def normalize_metadata(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Older writers put `source` at the top level; mirror it into
+    `metadata.source` so one filter path covers every document.
+    """
+    metadata = document.setdefault("metadata", {}) or {}
+    document["metadata"] = metadata
+    if "source" in document and "source" not in metadata:
+        metadata["source"] = document["source"]
+    return document
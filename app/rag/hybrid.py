@@ -0,0 +1,198 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from . import mongo_vector
+from .lexical import BM25Index, lexical_index, reciprocal_rank_fusion
+from .retrieval_cache import retrieval_cache
+from app.gemini import embed
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Only serving processes hold the index, rebuilt from Mongo on this
+# interval; writers (API, ingestion worker, watcher, CLI) just write Mongo.
+LEXICAL_REFRESH_SECONDS = float(os.getenv("LEXICAL_REFRESH_SECONDS", "300"))
+
+# Each retriever returns this many candidates per requested result
+CANDIDATE_MULTIPLIER = 4
+
+_refresh_lock: Optional[asyncio.Lock] = None
+_refresh_task: Optional[asyncio.Task] = None
+_periodic_task: Optional[asyncio.Task] = None
+# Corpus generation read just before the last load: the index reflects
+# every write up to it (None until a load succeeds)
+_lexical_generation: Optional[int] = None
+
+
+async def refresh_lexical_index(force: bool = False) -> int:
+    """(Re)build the process-wide BM25 index from the vectors collection."""
+    global _refresh_lock, _lexical_generation
+    if _refresh_lock is None:
+        _refresh_lock = asyncio.Lock()
+
+    async with _refresh_lock:
+        loaded_at = lexical_index.loaded_at
+        if not force and loaded_at and time.time() - loaded_at < LEXICAL_REFRESH_SECONDS:
+            return len(lexical_index)
+
+        start = time.time()
+        try:
+            generation = await retrieval_cache.generation()
+        except Exception as e:
+            logger.warning(f"Could not read corpus generation before lexical load: {e}")
+            generation = None
+        documents = await mongo_vector.load_text_documents()
+        await asyncio.to_thread(lexical_index.replace, documents)
+        _lexical_generation = generation
+        logger.info(
+            "Lexical index loaded",
+            extra={
+                "documents": len(lexical_index),
+                "generation": generation,
+                "duration_ms": round((time.time() - start) * 1000, 2),
+            },
+        )
+        return len(lexical_index)
+
+
+async def _refresh_in_background(force: bool = False):
+    try:
+        await refresh_lexical_index(force=force)
+    except Exception as e:
+        # The previous index keeps serving; the next refresh retries
+        logger.warning(f"Lexical index refresh failed: {e}")
+
+
+def _schedule_refresh(force: bool = False):
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh_in_background(force=force))
+
+
+def lexical_reflects(generation: int) -> bool:
+    """
+    Whether the loaded index includes every write up to `generation`. If
+    not, a reload is started in the background (writes happen in other
+    processes, so the periodic refresh alone could lag by its interval).
+    """
+    if _lexical_generation is not None and _lexical_generation >= generation:
+        return True
+    _schedule_refresh(force=True)
+    return False
+
+
+async def ensure_lexical_index():
+    """
+    Make sure queries have an index without making them wait for a reload.
+    Only the first load is awaited (there is nothing to serve before it);
+    a stale index keeps serving while one background refresh rebuilds it.
+    If the first load fails, queries run vector-only and the next one
+    tries again.
+    """
+    loaded_at = lexical_index.loaded_at
+    if not loaded_at:
+        try:
+            await refresh_lexical_index()
+        except Exception as e:
+            logger.warning(f"Lexical index unavailable, searching vectors only: {e}")
+    elif time.time() - loaded_at >= LEXICAL_REFRESH_SECONDS:
+        _schedule_refresh()
+
+
+async def _refresh_periodically(interval: float):
+    while True:
+        await _refresh_in_background(force=True)
+        await asyncio.sleep(interval)
+
+
+def start_lexical_refresh(interval: float = LEXICAL_REFRESH_SECONDS):
+    """Load the index now and reload it every `interval` seconds, off the request path."""
+    global _periodic_task
+    if _periodic_task is None:
+        _periodic_task = asyncio.create_task(_refresh_periodically(interval))
+
+
+async def stop_lexical_refresh():
+    global _periodic_task, _refresh_task
+    for task in (_periodic_task, _refresh_task):
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    _periodic_task = _refresh_task = None
+
+
+async def hybrid_search(
+    query: str,
+    query_embedding: List[float],
+    top_k: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+    store=None,
+    index: Optional[BM25Index] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Vector search and BM25 over the same chunks, fused with reciprocal
+    rank fusion. Exact tokens such as skill names are caught by BM25 even
+    when the embedding ranks them low.
+
+    `store` is anything with the `mongo_vector.search` signature (e.g. a
+    LocalVectorStore) and `index` its BM25 index; both default to the
+    Mongo collection and the process-wide index.
+    """
+    if store is None:
+        store = mongo_vector
+        index = lexical_index
+        await ensure_lexical_index()
+    if index is None:
+        raise ValueError("A custom store needs its own BM25 index")
+
+    candidates = top_k * CANDIDATE_MULTIPLIER
+    start = time.time()
+    vector_results, lexical_results = await asyncio.gather(
+        store.search(query_embedding, top_k=candidates, filters=filters),
+        asyncio.to_thread(index.search, query, candidates, filters),
+    )
+    results = reciprocal_rank_fusion(
+        {"vector": vector_results, "bm25": lexical_results}, top_k=top_k
+    )
+
+    logger.info(
+        "Hybrid search complete",
+        extra={
+            "top_k": top_k,
+            "vector_hits": len(vector_results),
+            "bm25_hits": len(lexical_results),
+            "returned": len(results),
+            "duration_ms": round((time.time() - start) * 1000, 2),
+        },
+    )
+    return results
+
+
+async def retrieve(
+    gemini_client,
+    query: str,
+    top_k: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Embed the query and run `hybrid_search`, through the generation-
+    versioned retrieval cache. A cache hit makes no Gemini or Mongo call.
+    Results fused over a BM25 index older than the current generation are
+    returned but not cached, and trigger a reload.
+    """
+
+    async def compute():
+        query_embedding = await embed(gemini_client, query)
+        results = await hybrid_search(query, query_embedding, top_k=top_k, filters=filters)
+        for r in results:
+            r["_id"] = str(r["_id"])
+        return results
+
+    return await retrieval_cache.get_or_compute(
+        query, top_k, filters, gemini_client.embedding_model, compute, cacheable=lexical_reflects
+    )
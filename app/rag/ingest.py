@@ -1,131 +1,192 @@
 import os
-from typing import Iterable, Dict, Optional
+from typing import Iterable, Dict, List, Optional
 import uuid
 import asyncio
-from .mongo_vector import upsert
-from app.gemini import GeminiClient
+from .mongo_vector import upsert, upsert_many, delete_many
+from .chunking import Chunk, chunk_text, iter_chunks, DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS
+from .pipeline import Checkpoint, IngestionPipeline
+from .manifest import Manifest, ManifestEntry, RefreshPlan, file_sha256, plan_refresh
+from app.gemini import GeminiClient, embed, embed_batch
 from app.utils.logger import setup_logger
 
 logger = setup_logger()
 
 gemini_client = GeminiClient()
 
-def chunk_text(text: str, chunk_size: int = 500) -> Iterable[str]: 
-    """ 
-    Split text into smaller chunks (~chunk_size words) for better embedding. 
-    """ 
-    words = text.split() 
-    if not words: 
-        return [] 
-    for i in range(0, len(words), chunk_size): 
-        chunk = " ".join(words[i : i + chunk_size]) 
-        
-        logger.info(f"Created chunk length={len(chunk)}") 
-        yield chunk 
-
-async def ingest_text( 
-        text: str, 
-        metadata: Optional[Dict] = None, 
-        chunk_size: int = 500, ) -> int: 
-    """ 
-    Ingest a text block into MongoDB vector store. 
-    Returns number of chunks ingested. 
-    """ 
-    metadata = metadata or {} 
-    count = 0 
-    logger.info( 
-        "Starting text ingestion", 
-        extra={"text_len": len(text), "metadata": metadata}, 
+
+async def _ingest_chunks(chunks: Iterable[Chunk], metadata: Dict) -> int:
+    """
+    Embed and upsert each chunk, attaching its offsets to the metadata.
+    Returns number of chunks ingested.
+    """
+    count = 0
+    for chunk in chunks:
+        doc_id = str(uuid.uuid4())
+
+        logger.debug(
+            f"Generating embedding for chunk doc_id={doc_id} "
+            f"index={chunk.index} tokens={chunk.token_count}"
+        )
+
+        embedding = await embed(gemini_client, chunk.text)
+        if not embedding:
+            logger.warning(f"Empty embedding for doc_id={doc_id}, skipping")
+            continue
+
+        await upsert(
+            {
+                "_id": doc_id,
+                "text": chunk.text,
+                "embedding": embedding,
+                "metadata": {**metadata, "chunk": chunk.metadata()},
+            }
+        )
+        count += 1
+
+    logger.info(f"Completed text ingestion chunks_ingested={count}")
+    return count
+
+
+async def ingest_text(
+        text: str,
+        metadata: Optional[Dict] = None,
+        chunk_size: int = DEFAULT_MAX_TOKENS,
+        overlap: int = DEFAULT_OVERLAP_TOKENS, ) -> int:
+    """
+    Ingest a text block into MongoDB vector store.
+    `chunk_size` and `overlap` are in estimated tokens.
+    Returns number of chunks ingested.
+    """
+    metadata = metadata or {}
+    logger.info(
+        "Starting text ingestion",
+        extra={"text_len": len(text), "metadata": metadata},
+        )
+    return await _ingest_chunks(
+        chunk_text(text, max_tokens=chunk_size, overlap_tokens=overlap), metadata,
+    )
+
+
+async def ingest_file(
+    filepath: str,
+    metadata: Optional[Dict] = None,
+    chunk_size: int = DEFAULT_MAX_TOKENS,
+    overlap: int = DEFAULT_OVERLAP_TOKENS,
+    ) -> int:
+    """
+    Ingest a single text file into the vector store, streaming it from
+    disk chunk by chunk instead of reading it whole.
+    Returns number of chunks ingested.
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"File not found: {filepath}")
+
+    logger.info(f"Reading file for ingestion filepath={filepath}")
+
+    effective_metadata = {"source": filepath}
+    if metadata:
+        effective_metadata.update(metadata)
+
+    with open(filepath, "r", encoding="utf-8") as f:
+        return await _ingest_chunks(
+            iter_chunks(f, max_tokens=chunk_size, overlap_tokens=overlap),
+            effective_metadata,
         )
-    for chunk in chunk_text(text, chunk_size=chunk_size): 
-        doc_id = str(uuid.uuid4()) 
-        
-        logger.info(f"Generating embedding for chunk doc_id={doc_id}") 
-        
-        embedding = gemini_client.embed(chunk) 
-        if not embedding: 
-            logger.warning(f"Empty embedding for doc_id={doc_id}, skipping") 
-            continue 
-        
-        await upsert( 
-            { 
-                "_id": doc_id, 
-                "text": chunk, 
-                "embedding": embedding, 
-                "metadata": metadata, 
-                } 
-                ) 
-        count += 1 
-        logger.info(f"Completed text ingestion chunks_ingested={count}") 
-        return count 
-    
-async def ingest_file( 
-    filepath: str, 
-    metadata: Optional[Dict] = None, 
-    chunk_size: int = 500, 
-    ) -> int: 
-    """ 
-    Ingest a single text file into the vector store. 
-    Returns number of chunks ingested. 
-    """ 
-    if not os.path.exists(filepath): 
-        raise FileNotFoundError(f"File not found: {filepath}") 
-    
-    logger.info(f"Reading file for ingestion filepath={filepath}") 
-    
-    with open(filepath, "r", encoding="utf-8") as f: 
-        content = f.read() 
-    effective_metadata = {"source": filepath} 
-    if metadata: 
-        effective_metadata.update(metadata) 
-
-    return await ingest_text( 
-        content, metadata=effective_metadata, chunk_size=chunk_size, 
-        ) 
-    
-async def ingest_directory( 
-        dirpath: str, 
-        glob_ext: Optional[str] = ".txt", 
-        chunk_size: int = 500, 
-        ) -> int: 
-    """ 
-    Ingest all files in a directory (optionally filtered by extension). 
-    Returns total chunks ingested. 
-    """ 
-    if not os.path.isdir(dirpath): 
-        raise NotADirectoryError(f"Not a directory: {dirpath}") 
-    
-    logger.info(f"Starting directory ingestion dirpath={dirpath} ext={glob_ext}") 
-    
-    total_chunks = 0 
-    for entry in os.scandir(dirpath): 
-        if not entry.is_file(): 
-            continue 
-        if glob_ext and not entry.name.endswith(glob_ext): 
-            continue 
-        
-        try: 
-            chunks = await ingest_file( 
-                entry.path, 
-                metadata={"source_dir": dirpath}, 
-                chunk_size=chunk_size, 
-                ) 
-            total_chunks += chunks 
-        except Exception as e: 
-            logger.exception(f"Failed to ingest file path={entry.path} error={e}")
-
-        logger.info( "Completed directory ingestion", 
-                    extra={"dirpath": dirpath, "total_chunks": total_chunks}, 
-                ) 
-        return total_chunks
-
-PENDING_DIR = "/app/data/pending" 
-
-async def ingest_pending_files(): 
-    for filename in os.listdir(PENDING_DIR): 
-        filepath = os.path.join(PENDING_DIR, filename) 
-        if not os.path.isfile(filepath): 
-            continue 
-        logger.info(f"Ingesting pending file: {filepath}")
-        await ingest_file(filepath) 
-        os.remove(filepath)
\ No newline at end of file
+
+def _list_directory(dirpath: str, glob_ext: Optional[str]) -> List[str]:
+    if not os.path.isdir(dirpath):
+        raise NotADirectoryError(f"Not a directory: {dirpath}")
+    return sorted(
+        entry.path
+        for entry in os.scandir(dirpath)
+        if entry.is_file()
+        and not entry.name.startswith(".")
+        and (not glob_ext or entry.name.endswith(glob_ext))
+    )
+
+
+async def plan_directory(dirpath: str, glob_ext: Optional[str] = ".txt") -> RefreshPlan:
+    """
+    Work an incremental `ingest_directory` run would do, without doing it.
+    """
+    paths = _list_directory(dirpath, glob_ext)
+    entries = await Manifest().load(dirpath, glob_ext)
+    return await asyncio.to_thread(plan_refresh, paths, entries)
+
+
+async def ingest_directory(
+        dirpath: str,
+        glob_ext: Optional[str] = ".txt",
+        chunk_size: int = DEFAULT_MAX_TOKENS,
+        overlap: int = DEFAULT_OVERLAP_TOKENS,
+        embed_batch_size: int = 16,
+        embed_concurrency: int = 4,
+        checkpoint_path: Optional[str] = None,
+        incremental: bool = True,
+        metadata: Optional[Dict] = None,
+        ) -> int:
+    """
+    Ingest all files in a directory (optionally filtered by extension)
+    through the concurrent ingestion pipeline. With `checkpoint_path`,
+    completed files are recorded there and skipped by the next run.
+
+    The ingest manifest records what each file produced. When
+    `incremental`, only new and changed files are re-chunked and
+    re-embedded; in every case the vectors of deleted files and the
+    leftover chunks of files that shrank are removed.
+    Returns total chunks ingested.
+    """
+    logger.info(f"Starting directory ingestion dirpath={dirpath} ext={glob_ext}")
+
+    paths = _list_directory(dirpath, glob_ext)
+    manifest = Manifest()
+    entries = await manifest.load(dirpath, glob_ext)
+    plan = await asyncio.to_thread(plan_refresh, paths, entries)
+    logger.info(f"Ingestion plan dirpath={dirpath} incremental={incremental} {plan.summary()}")
+
+    source_dir = os.path.abspath(dirpath)
+
+    async def record_file(path: str, chunk_ids: List[str]):
+        previous = entries.get(os.path.abspath(path))
+        if previous:
+            await delete_many(sorted(set(previous.chunk_ids) - set(chunk_ids)))
+        st = plan.stats[path]
+        await manifest.save(ManifestEntry(
+            path=os.path.abspath(path),
+            source_dir=source_dir,
+            size=st.st_size,
+            mtime=st.st_mtime,
+            sha256=plan.hashes.get(path) or await asyncio.to_thread(file_sha256, path),
+            chunk_ids=chunk_ids,
+        ))
+
+    if incremental:
+        for path in plan.touched:
+            entry = entries[os.path.abspath(path)]
+            entry.mtime = plan.stats[path].st_mtime
+            await manifest.save(entry)
+
+    for entry in plan.deleted:
+        await delete_many(entry.chunk_ids)
+    await manifest.remove([entry.path for entry in plan.deleted])
+
+    pipeline = IngestionPipeline(
+        embed_fn=lambda texts: embed_batch(gemini_client, texts),
+        write_fn=upsert_many,
+        chunk_size=chunk_size,
+        overlap=overlap,
+        embed_batch_size=embed_batch_size,
+        embed_concurrency=embed_concurrency,
+        checkpoint=Checkpoint(checkpoint_path).load() if checkpoint_path else None,
+        on_file_done=record_file,
+    )
+    stats = await pipeline.run(
+        plan.to_ingest if incremental else paths,
+        metadata={"source_dir": dirpath, **(metadata or {})},
+    )
+
+    logger.info(
+        "Completed directory ingestion",
+        extra={"dirpath": dirpath, **stats.as_dict(), **plan.summary()},
+    )
+    return stats.chunks_written
@@ -0,0 +1,165 @@
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from .filters import build_filter, matches
+
+# Keeps skill spellings intact: "c++", "c#", "node.js", "pyspark"
+_TERM_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t.rstrip(".") for t in _TERM_RE.findall(text.lower())]
+
+
+class BM25Index:
+    """
+    In-memory BM25 inverted index over chunk texts.
+
+    Postings map term -> {doc_id: term frequency}; document lengths and
+    metadata are kept alongside so scoring and filter evaluation never
+    touch Mongo. Writes and searches take a lock, since the index is
+    rebuilt from a worker thread while the event loop keeps querying it.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    # --- Writes ----------------------------------------------------
+
+    def add(self, document: Dict[str, Any]):
+        self.add_many([document])
+
+    def add_many(self, documents: Iterable[Dict[str, Any]]):
+        with self._lock:
+            for document in documents:
+                doc_id = str(document["_id"])
+                self._remove(doc_id)
+                terms = Counter(tokenize(document.get("text") or ""))
+                for term, tf in terms.items():
+                    self._postings.setdefault(term, {})[doc_id] = tf
+                length = sum(terms.values())
+                self._lengths[doc_id] = length
+                self._total_length += length
+                self._docs[doc_id] = {
+                    "_id": document["_id"],
+                    "text": document.get("text", ""),
+                    "metadata": document.get("metadata", {}),
+                }
+
+    def remove_many(self, doc_ids: Iterable[str]):
+        with self._lock:
+            for doc_id in doc_ids:
+                self._remove(str(doc_id))
+
+    def _remove(self, doc_id: str):
+        if doc_id not in self._lengths:
+            return
+        for term in set(tokenize(self._docs[doc_id]["text"] or "")):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        del self._docs[doc_id]
+
+    def replace(self, documents: Iterable[Dict[str, Any]]):
+        """Rebuild from a full scan, then swap it in under the lock."""
+        fresh = BM25Index(self.k1, self.b)
+        fresh.add_many(documents)
+        with self._lock:
+            self._postings = fresh._postings
+            self._lengths = fresh._lengths
+            self._docs = fresh._docs
+            self._total_length = fresh._total_length
+            self.loaded_at = time.time()
+
+    # --- Search ----------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        compiled = build_filter(filters)
+        terms = set(tokenize(query))
+
+        with self._lock:
+            n = len(self._lengths)
+            if not n or not terms:
+                return []
+            avg_length = self._total_length / n
+            scores: Dict[str, float] = {}
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            results = []
+            for doc_id, score in ranked:
+                doc = self._docs[doc_id]
+                if compiled and not matches(doc, compiled):
+                    continue
+                results.append({**doc, "score": score})
+                if len(results) >= top_k:
+                    break
+            return results
+
+
+# -------------------------------------------------------------------
+# Rank fusion
+# -------------------------------------------------------------------
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, List[Dict[str, Any]]],
+    top_k: int = 5,
+    k: int = RRF_K,
+) -> List[Dict[str, Any]]:
+    """
+    Merge ranked lists by summing 1 / (k + rank). Only ranks are used,
+    so BM25 and cosine scores never need to be put on one scale. Each
+    result keeps its per-retriever score as `<name>_score`.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for name, results in rankings.items():
+        for rank, result in enumerate(results, start=1):
+            key = str(result["_id"])
+            entry = fused.get(key)
+            if entry is None:
+                entry = fused[key] = {
+                    "_id": result["_id"],
+                    "text": result.get("text", ""),
+                    "metadata": result.get("metadata", {}),
+                    "score": 0.0,
+                }
+            entry["score"] += 1.0 / (k + rank)
+            entry[f"{name}_score"] = result.get("score")
+
+    return sorted(fused.values(), key=lambda r: r["score"], reverse=True)[:top_k]
+
+
+# Process-wide index over the `vectors` collection
+lexical_index = BM25Index()
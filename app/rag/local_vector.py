@@ -0,0 +1,225 @@
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .filters import build_filter, matches, normalize_metadata
+from .quantization import (
+    QUANTIZATION_MODES,
+    default_rescore_multiplier,
+    quantize_binary,
+    quantize_int8,
+)
+
+# Set bits per byte value, for Hamming distance on packed vectors
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Rows scored per step when widening int8 to float32
+_SCORE_BLOCK = 8192
+
+
+def _normalized(embedding) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    return vector / (np.linalg.norm(vector) or 1.0)
+
+
+class LocalVectorStore:
+    """
+    In-process stand-in for the Atlas `vectors` collection: brute-force
+    cosine search over a NumPy matrix, with the same filter semantics as
+    `$vectorSearch`. Used by benchmarks and tests, and anywhere a Mongo
+    round-trip is not wanted.
+
+    With `quantization` "int8" or "binary" the scan runs over the compact
+    matrix and the best `top_k * rescore_multiplier` rows are rescored
+    with float32, as `mongo_vector.search` does. Only the compact matrix
+    is held in memory then: the float32 rows live in a memory-mapped
+    temporary file (in `rescore_dir`) and are read for the shortlist
+    only, and stored documents keep no embedding.
+    """
+
+    def __init__(
+        self,
+        quantization: str = "none",
+        rescore_multiplier: Optional[int] = None,
+        rescore_dir: Optional[str] = None,
+    ):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"quantization must be one of {QUANTIZATION_MODES}")
+        self.quantization = quantization
+        self.rescore_multiplier = rescore_multiplier or default_rescore_multiplier(quantization)
+        self.rescore_dir = rescore_dir
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        # Quantized mode: normalized vectors written since the last rebuild
+        self._pending: Dict[str, np.ndarray] = {}
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._compact: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # --- Writes ----------------------------------------------------
+
+    async def upsert(self, document: Dict[str, Any]):
+        await self.upsert_many([document])
+
+    async def upsert_many(self, documents: List[Dict[str, Any]]):
+        for document in documents:
+            if document.get("embedding") is None:
+                raise ValueError("Document missing embedding")
+            normalize_metadata(document)
+            if self.quantization == "none":
+                self._docs[document["_id"]] = document
+            else:
+                self._pending[document["_id"]] = _normalized(document["embedding"])
+                self._docs[document["_id"]] = {k: v for k, v in document.items() if k != "embedding"}
+        self._dirty = True
+
+    async def delete_many(self, doc_ids: List[str]) -> int:
+        deleted = 0
+        for doc_id in doc_ids:
+            self._pending.pop(doc_id, None)
+            if self._docs.pop(doc_id, None) is not None:
+                deleted += 1
+        self._dirty = self._dirty or bool(deleted)
+        return deleted
+
+    def _rebuild(self):
+        ids = list(self._docs)
+        if not ids:
+            self._matrix = self._compact = self._scales = None
+        elif self.quantization == "none":
+            matrix = np.asarray([self._docs[i]["embedding"] for i in ids], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            self._matrix = matrix / np.where(norms == 0, 1, norms)
+        else:
+            self._rebuild_quantized(ids)
+        self._ids = ids
+        self._rows = {doc_id: row for row, doc_id in enumerate(ids)}
+        self._pending.clear()
+        self._dirty = False
+
+    def _rebuild_quantized(self, ids: List[str]):
+        dims = len(next(iter(self._pending.values()))) if self._pending else self._matrix.shape[1]
+        # Unlinked on creation: the mapping is the only reference, freed with it
+        matrix = np.memmap(
+            tempfile.TemporaryFile(dir=self.rescore_dir), dtype=np.float32, mode="w+", shape=(len(ids), dims)
+        )
+        if self.quantization == "int8":
+            compact = np.empty((len(ids), dims), dtype=np.int8)
+            scales = np.empty(len(ids), dtype=np.float32)
+        else:
+            compact = np.empty((len(ids), (dims + 7) // 8), dtype=np.uint8)
+
+        for start in range(0, len(ids), _SCORE_BLOCK):
+            block_ids = ids[start:start + _SCORE_BLOCK]
+            block = np.stack([
+                self._pending[i] if i in self._pending else self._matrix[self._rows[i]] for i in block_ids
+            ])
+            end = start + len(block_ids)
+            matrix[start:end] = block
+            if self.quantization == "int8":
+                for offset, row in enumerate(block):
+                    compact[start + offset], scales[start + offset] = quantize_int8(row)
+            else:
+                compact[start:end] = np.packbits(block > 0, axis=1)
+
+        matrix.flush()
+        self._matrix = matrix
+        self._compact = compact
+        self._scales = scales if self.quantization == "int8" else None
+
+    def index_bytes(self) -> int:
+        """Memory the index holds: the float matrix, or the compact one (+ scales) when quantized."""
+        if self._dirty:
+            self._rebuild()
+        if self.quantization == "none":
+            return 0 if self._matrix is None else self._matrix.nbytes
+        scales = 0 if self._scales is None else self._scales.nbytes
+        return 0 if self._compact is None else self._compact.nbytes + scales
+
+    def rescore_bytes(self) -> int:
+        """Size of the memory-mapped float32 rows used for rescoring (0 unquantized)."""
+        if self._dirty:
+            self._rebuild()
+        if self.quantization == "none" or self._matrix is None:
+            return 0
+        return self._matrix.nbytes
+
+    # --- Search ----------------------------------------------------
+
+    def _candidate_rows(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        compiled = build_filter(filters)
+        if not compiled:
+            return None
+        return np.fromiter(
+            (i for i, doc_id in enumerate(self._ids) if matches(self._docs[doc_id], compiled)),
+            dtype=np.int64,
+        )
+
+    async def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        num_candidates: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        if self._dirty:
+            self._rebuild()
+        if self._matrix is None:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        rows = self._candidate_rows(filters)
+        if rows is not None and rows.shape[0] == 0:
+            return []
+
+        if self.quantization != "none":
+            # Shortlist on the compact form, then rescore just those rows
+            approx = self._approx_scores(query, rows)
+            shortlist = self._top(approx, top_k * self.rescore_multiplier)
+            rows = shortlist if rows is None else rows[shortlist]
+
+        matrix = self._matrix if rows is None else self._matrix[rows]
+        positions = self._top(matrix @ query, top_k)
+        selected = positions if rows is None else rows[positions]
+        scores = self._matrix[selected] @ query
+
+        results = []
+        for row, score in zip(selected, scores):
+            doc = self._docs[self._ids[row]]
+            results.append({
+                "_id": doc["_id"],
+                "text": doc.get("text", ""),
+                "metadata": doc.get("metadata", {}),
+                # Atlas reports cosine as (1 + cos) / 2
+                "score": float((1.0 + score) / 2.0),
+            })
+        return results
+
+    @staticmethod
+    def _top(scores: np.ndarray, k: int) -> np.ndarray:
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def _approx_scores(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Higher is closer; computed on the compact matrix only."""
+        compact = self._compact if rows is None else self._compact[rows]
+        if self.quantization == "binary":
+            distance = _POPCOUNT[np.bitwise_xor(compact, quantize_binary(query))].sum(axis=1)
+            return -distance.astype(np.float32)
+
+        # Asymmetric: int8 rows against the float query, times each row's scale
+        scales = self._scales if rows is None else self._scales[rows]
+        scores = np.empty(compact.shape[0], dtype=np.float32)
+        for start in range(0, compact.shape[0], _SCORE_BLOCK):
+            block = compact[start:start + _SCORE_BLOCK]
+            scores[start:start + _SCORE_BLOCK] = block.astype(np.float32) @ query
+        return scores * scales
@@ -0,0 +1,154 @@
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.db.mongo import get_collection
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+MANIFEST_COLLECTION = os.getenv("MONGO_MANIFEST_COLLECTION", "ingest_manifest")
+
+_HASH_BLOCK = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    path: str          # absolute path, also the document _id
+    source_dir: str
+    size: int
+    mtime: float
+    sha256: str
+    chunk_ids: List[str] = field(default_factory=list)
+    ingested_at: float = field(default_factory=time.time)
+
+    def to_doc(self) -> Dict[str, Any]:
+        return {
+            "_id": self.path,
+            "source_dir": self.source_dir,
+            "size": self.size,
+            "mtime": self.mtime,
+            "sha256": self.sha256,
+            "chunk_ids": self.chunk_ids,
+            "ingested_at": self.ingested_at,
+        }
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any]) -> "ManifestEntry":
+        return cls(
+            path=doc["_id"],
+            source_dir=doc["source_dir"],
+            size=doc["size"],
+            mtime=doc["mtime"],
+            sha256=doc["sha256"],
+            chunk_ids=doc.get("chunk_ids", []),
+            ingested_at=doc.get("ingested_at", 0.0),
+        )
+
+
+# -------------------------------------------------------------------
+# Planning
+# -------------------------------------------------------------------
+@dataclass
+class RefreshPlan:
+    new: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    touched: List[str] = field(default_factory=list)     # mtime moved, content identical
+    unchanged: List[str] = field(default_factory=list)
+    deleted: List[ManifestEntry] = field(default_factory=list)
+    stats: Dict[str, os.stat_result] = field(default_factory=dict)
+    hashes: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def to_ingest(self) -> List[str]:
+        return self.new + self.changed
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "new": len(self.new),
+            "changed": len(self.changed),
+            "touched": len(self.touched),
+            "unchanged": len(self.unchanged),
+            "deleted": len(self.deleted),
+            "stale_chunks": sum(len(e.chunk_ids) for e in self.deleted),
+        }
+
+
+def plan_refresh(paths: List[str], entries: Dict[str, ManifestEntry]) -> RefreshPlan:
+    """
+    Compare files on disk with their manifest entries. Files whose size
+    and mtime match are trusted without reading them; only the rest are
+    hashed. Blocking, run it in a thread.
+    """
+    plan = RefreshPlan()
+    seen = set()
+
+    for path in paths:
+        key = os.path.abspath(path)
+        seen.add(key)
+        st = os.stat(path)
+        plan.stats[path] = st
+        entry = entries.get(key)
+
+        if entry and entry.size == st.st_size and entry.mtime == st.st_mtime:
+            plan.unchanged.append(path)
+            continue
+
+        digest = file_sha256(path)
+        plan.hashes[path] = digest
+
+        if entry is None:
+            plan.new.append(path)
+        elif entry.sha256 == digest:
+            plan.touched.append(path)
+        else:
+            plan.changed.append(path)
+
+    plan.deleted = [e for key, e in entries.items() if key not in seen]
+    return plan
+
+
+# -------------------------------------------------------------------
+# Storage
+# -------------------------------------------------------------------
+class Manifest:
+    """
+    Per-file ingestion record in Mongo: path, size, mtime, content hash
+    and the ids of the chunks the file produced.
+    """
+
+    def __init__(self, collection=None):
+        self.collection = collection if collection is not None else get_collection(MANIFEST_COLLECTION)
+
+    async def load(self, source_dir: str, glob_ext: Optional[str] = None) -> Dict[str, ManifestEntry]:
+        source_dir = os.path.abspath(source_dir)
+
+        docs = await self.collection.find({"source_dir": source_dir}).to_list(None)
+        entries = {
+            doc["_id"]: ManifestEntry.from_doc(doc)
+            for doc in docs
+            if not glob_ext or doc["_id"].endswith(glob_ext)
+        }
+        logger.info(f"Loaded ingest manifest source_dir={source_dir} files={len(entries)}")
+        return entries
+
+    async def save(self, entry: ManifestEntry):
+        doc = entry.to_doc()
+
+        await self.collection.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+
+    async def remove(self, paths: List[str]):
+        if not paths:
+            return
+
+        await self.collection.delete_many({"_id": {"$in": list(paths)}})
@@ -1,9 +1,22 @@
-import asyncio
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from bson import ObjectId
-from pymongo import MongoClient
+from pymongo import UpdateOne
+from pymongo.operations import SearchIndexModel
 import os
+from app.db import mongo
+from .filters import build_filter, index_filter_paths, normalize_metadata
+from .retrieval_cache import retrieval_cache
+from .quantization import (
+    FULL_PRECISION_FIELD,
+    QUANTIZED_FIELD,
+    RESCORE_MULTIPLIER,
+    SCALE_FIELD,
+    VECTOR_QUANTIZATION,
+    encode_document,
+    encode_query,
+    rescore,
+)
 from app.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -11,13 +24,31 @@ logger = setup_logger()
 # -------------------------------------------------------------------
 # MongoDB Setup
 # -------------------------------------------------------------------
-MONGO_URI = os.getenv("MONGO_URI", "mongodb://mongo:27017/careerpilot")
-DB_NAME = os.getenv("MONGO_DB", "careerpilot")
 COLLECTION_NAME = os.getenv("MONGO_COLLECTION", "vectors")
+VECTOR_INDEX_NAME = os.getenv("MONGO_VECTOR_INDEX", "vector_index")
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "768"))
 
-_client = MongoClient(MONGO_URI)
-_db = _client[DB_NAME]
-_collection = _db[COLLECTION_NAME]
+# $vectorSearch candidates examined per requested result
+CANDIDATES_PER_RESULT = 10
+
+# Atlas-side quantization of float `embedding` vectors ("none", "scalar",
+# "binary"); only used when documents are stored unquantized.
+ATLAS_INDEX_QUANTIZATION = os.getenv("ATLAS_INDEX_QUANTIZATION", "none").lower()
+
+# Shared async client and pool (app.db.mongo)
+_collection = mongo.get_collection(COLLECTION_NAME)
+
+
+def _write_update(document: Dict[str, Any]) -> Dict[str, Any]:
+    """$set the (encoded) document and drop the other layout's fields."""
+    encode_document(document)
+    if VECTOR_QUANTIZATION == "none":
+        stale = (QUANTIZED_FIELD, SCALE_FIELD, FULL_PRECISION_FIELD)
+    elif VECTOR_QUANTIZATION == "int8":
+        stale = ("embedding",)
+    else:
+        stale = ("embedding", SCALE_FIELD)
+    return {"$set": document, "$unset": {field: "" for field in stale}}
 
 
 # -------------------------------------------------------------------
@@ -39,6 +70,7 @@ async def upsert(document: Dict[str, Any]):
         )
 
     doc_id = document["_id"]
+    normalize_metadata(document)
 
     # Validate embedding
     embedding = document.get("embedding")
@@ -63,15 +95,10 @@ async def upsert(document: Dict[str, Any]):
 
     start = time.time()
 
-    def sync_upsert():
-        return _collection.update_one(
-            {"_id": doc_id},
-            {"$set": document},
-            upsert=True,
-        )
+    update = _write_update(document)
 
     try:
-        result = await asyncio.to_thread(sync_upsert)
+        result = await _collection.update_one({"_id": doc_id}, update, upsert=True)
     except Exception as e:
         logger.exception(
             "MongoDB upsert failed",
@@ -80,6 +107,7 @@ async def upsert(document: Dict[str, Any]):
         raise
 
     duration = round((time.time() - start) * 1000, 2)
+    await retrieval_cache.bump_generation()
 
     # Log result
     if result.upserted_id:
@@ -96,49 +124,191 @@ async def upsert(document: Dict[str, Any]):
     return result
 
 
+# -------------------------------------------------------------------
+# Bulk Upsert
+# -------------------------------------------------------------------
+async def upsert_many(documents: List[Dict[str, Any]]):
+    """
+    Insert or update a batch of documents in one bulk write.
+    Same validation as `upsert`, one round-trip per batch.
+    """
+    if not documents:
+        return None
+
+    for document in documents:
+        if "_id" not in document:
+            document["_id"] = str(ObjectId())
+        normalize_metadata(document)
+        if document.get("embedding") is None:
+            logger.error(
+                "Document missing embedding — cannot upsert",
+                extra={"doc_id": document["_id"]},
+            )
+            raise ValueError("Document missing embedding")
+
+    operations = [
+        UpdateOne({"_id": d["_id"]}, _write_update(d), upsert=True)
+        for d in documents
+    ]
+
+    start = time.time()
+
+    try:
+        result = await _collection.bulk_write(operations, ordered=False)
+    except Exception as e:
+        logger.exception(
+            "MongoDB bulk upsert failed",
+            extra={"batch_size": len(documents), "error": str(e)},
+        )
+        raise
+
+    duration = round((time.time() - start) * 1000, 2)
+    await retrieval_cache.bump_generation()
+
+    logger.info(
+        "Bulk upserted vector documents",
+        extra={
+            "batch_size": len(documents),
+            "inserted": result.upserted_count,
+            "updated": result.modified_count,
+            "duration_ms": duration,
+        },
+    )
+
+    return result
+
+
+# -------------------------------------------------------------------
+# Delete Documents
+# -------------------------------------------------------------------
+async def delete_many(doc_ids: List[str]) -> int:
+    """
+    Remove vector documents by id. Returns the number deleted.
+    """
+    if not doc_ids:
+        return 0
+
+    try:
+        result = await _collection.delete_many({"_id": {"$in": list(doc_ids)}})
+    except Exception as e:
+        logger.exception(
+            "MongoDB delete failed",
+            extra={"count": len(doc_ids), "error": str(e)},
+        )
+        raise
+
+    if result.deleted_count:
+        await retrieval_cache.bump_generation()
+
+    logger.info(
+        "Deleted vector documents",
+        extra={"requested": len(doc_ids), "deleted": result.deleted_count},
+    )
+    return result.deleted_count
+
+
+# -------------------------------------------------------------------
+# Maintenance
+# -------------------------------------------------------------------
+async def requantize_existing(batch_size: int = 500) -> int:
+    """
+    Rewrite documents that still carry a float `embedding` list into the
+    current VECTOR_QUANTIZATION layout. Returns the number converted.
+    """
+    if VECTOR_QUANTIZATION == "none":
+        return 0
+
+    start = time.time()
+    converted = 0
+    operations = []
+    cursor = _collection.find({"embedding": {"$exists": True}}, {"embedding": 1}, batch_size=batch_size)
+    async for doc in cursor:
+        operations.append(UpdateOne({"_id": doc["_id"]}, _write_update(doc)))
+        if len(operations) >= batch_size:
+            converted += (await _collection.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+    if operations:
+        converted += (await _collection.bulk_write(operations, ordered=False)).modified_count
+    if converted:
+        await retrieval_cache.bump_generation()
+    logger.info(
+        "Requantized vector documents",
+        extra={
+            "quantization": VECTOR_QUANTIZATION,
+            "converted": converted,
+            "duration_ms": round((time.time() - start) * 1000, 2),
+        },
+    )
+    return converted
+
+
+async def load_text_documents() -> List[Dict[str, Any]]:
+    """Every chunk's text and metadata (no embeddings), for the lexical index."""
+    return await _collection.find({}, {"text": 1, "metadata": 1}).to_list(None)
+
+
 # -------------------------------------------------------------------
 # Vector Search
 # -------------------------------------------------------------------
-async def search(query_embedding: List[float], top_k: int = 5):
+async def search(
+    query_embedding: List[float],
+    top_k: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+    num_candidates: Optional[int] = None,
+):
     """
     Perform vector search using MongoDB Atlas Vector Search.
+    `filters` (see app.rag.filters) are applied as a pre-filter inside
+    `$vectorSearch`, so only matching documents are candidates.
+    With VECTOR_QUANTIZATION set, the search runs on the compact vectors
+    and the top `top_k * RESCORE_MULTIPLIER` hits are rescored against
+    their float32 copies.
     Includes detailed logging and timing.
     """
+    vector_filter = build_filter(filters)
+    quantized = VECTOR_QUANTIZATION != "none"
+    limit = top_k * RESCORE_MULTIPLIER if quantized else top_k
+    num_candidates = max(num_candidates or top_k * CANDIDATES_PER_RESULT, limit)
 
     logger.info(
         "Running vector search",
         extra={
             "top_k": top_k,
             "embedding_dims": len(query_embedding),
+            "num_candidates": num_candidates,
+            "filter": vector_filter,
+            "quantization": VECTOR_QUANTIZATION,
         },
     )
 
+    vector_stage = {
+        "queryVector": encode_query(query_embedding),
+        "path": QUANTIZED_FIELD if quantized else "embedding",
+        "numCandidates": num_candidates,
+        "limit": limit,
+        "index": VECTOR_INDEX_NAME,
+    }
+    if vector_filter:
+        vector_stage["filter"] = vector_filter
+
+    projection = {
+        "text": 1,
+        "metadata": 1,
+        "score": {"$meta": "vectorSearchScore"},
+    }
+    if quantized:
+        projection[FULL_PRECISION_FIELD] = 1
+
     pipeline = [
-        {
-            "$vectorSearch": {
-                "queryVector": query_embedding,
-                "path": "embedding",
-                "numCandidates": 50,
-                "limit": top_k,
-                "index": "vector_index",
-            }
-        },
-        {
-            "$project": {
-                "text": 1,
-                "metadata": 1,
-                "score": {"$meta": "vectorSearchScore"},
-            }
-        },
+        {"$vectorSearch": vector_stage},
+        {"$project": projection},
     ]
 
     start = time.time()
 
-    def sync_search():
-        return list(_collection.aggregate(pipeline))
-
     try:
-        results = await asyncio.to_thread(sync_search)
+        cursor = await _collection.aggregate(pipeline)
+        results = await cursor.to_list(None)
     except Exception as e:
         logger.exception(
             "Vector search failed",
@@ -146,6 +316,9 @@ async def search(query_embedding: List[float], top_k: int = 5):
         )
         raise
 
+    if quantized:
+        results = rescore(query_embedding, results, top_k)
+
     duration = round((time.time() - start) * 1000, 2)
 
     logger.info(
@@ -158,3 +331,56 @@ async def search(query_embedding: List[float], top_k: int = 5):
     )
 
     return results
+
+
+# -------------------------------------------------------------------
+# Search Index Definition
+# -------------------------------------------------------------------
+def vector_index_definition(num_dimensions: int = EMBEDDING_DIMENSIONS) -> Dict[str, Any]:
+    """Atlas vectorSearch index: the embedding plus every filterable path."""
+    if VECTOR_QUANTIZATION == "none":
+        vector_field = {"path": "embedding", "similarity": "cosine"}
+        if ATLAS_INDEX_QUANTIZATION != "none":
+            vector_field["quantization"] = ATLAS_INDEX_QUANTIZATION
+    elif VECTOR_QUANTIZATION == "int8":
+        # Cosine ignores the per-vector scale, so raw int8 values suffice
+        vector_field = {"path": QUANTIZED_FIELD, "similarity": "cosine"}
+    else:
+        # Atlas requires euclidean (Hamming on bits) for int1 vectors
+        vector_field = {"path": QUANTIZED_FIELD, "similarity": "euclidean"}
+
+    return {
+        "fields": [
+            {"type": "vector", "numDimensions": num_dimensions, **vector_field},
+            *({"type": "filter", "path": path} for path in index_filter_paths()),
+        ]
+    }
+
+
+async def ensure_search_index(num_dimensions: int = EMBEDDING_DIMENSIONS) -> str:
+    """
+    Create the vector index, or update it when its definition (e.g. the
+    filter fields) has drifted. Returns "created", "updated" or "unchanged".
+    Atlas builds the index asynchronously after this returns.
+    """
+    definition = vector_index_definition(num_dimensions)
+
+    existing = await (await _collection.list_search_indexes(VECTOR_INDEX_NAME)).to_list(None)
+    if not existing:
+        await _collection.create_search_index(
+            SearchIndexModel(definition=definition, name=VECTOR_INDEX_NAME, type="vectorSearch")
+        )
+        action = "created"
+    else:
+        current = existing[0].get("latestDefinition") or existing[0].get("definition") or {}
+        if current.get("fields") == definition["fields"]:
+            action = "unchanged"
+        else:
+            await _collection.update_search_index(VECTOR_INDEX_NAME, definition)
+            action = "updated"
+
+    logger.info(
+        "Vector search index ensured",
+        extra={"index": VECTOR_INDEX_NAME, "action": action, "definition": definition},
+    )
+    return action
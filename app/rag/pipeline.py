@@ -0,0 +1,366 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .chunking import Chunk, iter_chunks, DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+EmbedFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+WriteFn = Callable[[List[Dict[str, Any]]], Awaitable[Any]]
+FileDoneFn = Callable[[str, List[str]], Awaitable[Any]]
+
+_DONE = object()
+
+
+def chunk_id(filepath: str, index: int) -> str:
+    """Stable id so re-ingesting a file overwrites its chunks instead of duplicating them."""
+    digest = hashlib.sha1(os.path.abspath(filepath).encode("utf-8")).hexdigest()[:16]
+    return f"{digest}:{index}"
+
+
+# -------------------------------------------------------------------
+# Checkpoint
+# -------------------------------------------------------------------
+class Checkpoint:
+    """
+    Append-only JSONL record of files whose chunks are all written.
+    A file is only skipped on resume if its size and mtime still match.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> "Checkpoint":
+        if not os.path.exists(self.path):
+            return self
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from an interrupted write
+                    continue
+                self.completed[record["path"]] = record
+        logger.info(f"Loaded ingestion checkpoint path={self.path} completed_files={len(self.completed)}")
+        return self
+
+    def is_done(self, filepath: str) -> bool:
+        record = self.completed.get(os.path.abspath(filepath))
+        if not record:
+            return False
+        st = os.stat(filepath)
+        return record["size"] == st.st_size and record["mtime"] == st.st_mtime
+
+    def mark_done(self, filepath: str, chunks: int):
+        st = os.stat(filepath)
+        record = {
+            "path": os.path.abspath(filepath),
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+            "chunks": chunks,
+        }
+        self.completed[record["path"]] = record
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def clear(self):
+        self.completed.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# -------------------------------------------------------------------
+# Pipeline
+# -------------------------------------------------------------------
+@dataclass
+class PipelineStats:
+    files_total: int = 0
+    files_skipped: int = 0
+    files_done: int = 0
+    files_failed: int = 0
+    chunks_embedded: int = 0
+    chunks_written: int = 0
+    chunks_failed: int = 0
+    started_at: float = field(default_factory=time.time)
+
+    def chunks_per_sec(self) -> float:
+        elapsed = time.time() - self.started_at
+        return self.chunks_written / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "files_total": self.files_total,
+            "files_skipped": self.files_skipped,
+            "files_done": self.files_done,
+            "files_failed": self.files_failed,
+            "chunks_embedded": self.chunks_embedded,
+            "chunks_written": self.chunks_written,
+            "chunks_failed": self.chunks_failed,
+            "chunks_per_sec": round(self.chunks_per_sec(), 2),
+            "elapsed_s": round(time.time() - self.started_at, 2),
+        }
+
+
+@dataclass
+class _FileState:
+    metadata: Dict[str, Any]
+    expected: Optional[int] = None  # set once the chunker reaches EOF
+    written: int = 0
+    failed: bool = False
+    done: bool = False
+
+
+class IngestionPipeline:
+    """
+    reader -> chunker -> embedder -> writer, connected by bounded asyncio
+    queues so a slow stage applies backpressure to the ones before it.
+
+    - reader:   stats files and skips those already in the checkpoint
+    - chunker:  streams each file through `iter_chunks` in a worker thread
+    - embedder: `embed_concurrency` workers, each embedding up to
+                `embed_batch_size` chunks per call
+    - writer:   bulk-writes up to `write_batch_size` documents at a time and
+                checkpoints a file once all its chunks are written
+
+    `on_file_done(path, chunk_ids)` is awaited for every fully written file.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        write_fn: WriteFn,
+        chunk_size: int = DEFAULT_MAX_TOKENS,
+        overlap: int = DEFAULT_OVERLAP_TOKENS,
+        embed_batch_size: int = 16,
+        embed_concurrency: int = 4,
+        write_batch_size: int = 64,
+        queue_size: int = 256,
+        chunk_workers: int = 2,
+        checkpoint: Optional[Checkpoint] = None,
+        progress_interval: float = 5.0,
+        on_file_done: Optional[FileDoneFn] = None,
+    ):
+        self.embed_fn = embed_fn
+        self.write_fn = write_fn
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.embed_batch_size = embed_batch_size
+        self.embed_concurrency = embed_concurrency
+        self.write_batch_size = write_batch_size
+        self.queue_size = queue_size
+        self.chunk_workers = chunk_workers
+        self.checkpoint = checkpoint
+        self.progress_interval = progress_interval
+        self.on_file_done = on_file_done
+
+        self.stats = PipelineStats()
+        self._files: Dict[str, _FileState] = {}
+        self._stopping = threading.Event()
+
+    async def run(self, paths: List[str], metadata: Optional[Dict[str, Any]] = None) -> PipelineStats:
+        self.stats = PipelineStats()
+        self._stopping.clear()
+        loop = asyncio.get_running_loop()
+
+        files_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        chunks_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        docs_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        reader = asyncio.create_task(self._reader(paths, metadata or {}, files_q))
+        chunkers = [
+            asyncio.create_task(self._chunker(files_q, chunks_q, loop))
+            for _ in range(self.chunk_workers)
+        ]
+        embedders = [
+            asyncio.create_task(self._embedder(chunks_q, docs_q))
+            for _ in range(self.embed_concurrency)
+        ]
+        writer = asyncio.create_task(self._writer(docs_q))
+        progress = asyncio.create_task(self._report_progress())
+        tasks = [reader, *chunkers, *embedders, writer]
+
+        try:
+            await reader
+            for _ in chunkers:
+                await files_q.put(_DONE)
+            await asyncio.gather(*chunkers)
+            for _ in embedders:
+                await chunks_q.put(_DONE)
+            await asyncio.gather(*embedders)
+            await docs_q.put(_DONE)
+            await writer
+        except BaseException:
+            self._stopping.set()
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            progress.cancel()
+
+        self._log_progress("Ingestion finished")
+
+        if self.checkpoint and self.stats.files_failed == 0:
+            # A clean run needs no resume point
+            self.checkpoint.clear()
+
+        return self.stats
+
+    # --- Stages ----------------------------------------------------
+
+    async def _reader(self, paths: List[str], metadata: Dict[str, Any], files_q: asyncio.Queue):
+        for path in paths:
+            if self.checkpoint and self.checkpoint.is_done(path):
+                self.stats.files_skipped += 1
+                continue
+            self.stats.files_total += 1
+            self._files[path] = _FileState(metadata={"source": path, **metadata})
+            await files_q.put(path)
+
+        if self.stats.files_skipped:
+            logger.info(f"Resuming from checkpoint skipped_files={self.stats.files_skipped}")
+
+    async def _chunker(self, files_q: asyncio.Queue, chunks_q: asyncio.Queue, loop):
+        while True:
+            path = await files_q.get()
+            if path is _DONE:
+                return
+            try:
+                count = await asyncio.to_thread(self._chunk_file, path, chunks_q, loop)
+            except Exception as e:
+                logger.exception(f"Failed to chunk file path={path} error={e}")
+                self._fail_file(path)
+                continue
+            self._files[path].expected = count
+            await self._maybe_complete(path)
+
+    def _chunk_file(self, path: str, chunks_q: asyncio.Queue, loop) -> int:
+        """Runs in a worker thread; blocks while the chunk queue is full."""
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for chunk in iter_chunks(f, max_tokens=self.chunk_size, overlap_tokens=self.overlap):
+                future = asyncio.run_coroutine_threadsafe(chunks_q.put((path, chunk)), loop)
+                while True:
+                    if self._stopping.is_set():
+                        future.cancel()
+                        raise RuntimeError("Ingestion pipeline stopped")
+                    try:
+                        future.result(timeout=0.5)
+                        break
+                    except concurrent.futures.TimeoutError:
+                        continue
+                count += 1
+        return count
+
+    async def _embedder(self, chunks_q: asyncio.Queue, docs_q: asyncio.Queue):
+        finished = False
+        while not finished:
+            batch = []
+            item = await chunks_q.get()
+            if item is _DONE:
+                return
+            batch.append(item)
+            while len(batch) < self.embed_batch_size:
+                try:
+                    item = chunks_q.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is _DONE:
+                    finished = True
+                    break
+                batch.append(item)
+
+            try:
+                embeddings = await self.embed_fn([chunk.text for _, chunk in batch])
+            except Exception as e:
+                logger.exception(f"Embedding batch failed size={len(batch)} error={e}")
+                embeddings = [[] for _ in batch]
+
+            for (path, chunk), embedding in zip(batch, embeddings):
+                if not embedding:
+                    self.stats.chunks_failed += 1
+                    self._fail_file(path)
+                    continue
+                self.stats.chunks_embedded += 1
+                await docs_q.put((path, self._document(path, chunk, embedding)))
+
+    async def _writer(self, docs_q: asyncio.Queue):
+        batch = []
+        while True:
+            item = await docs_q.get()
+            if item is not _DONE:
+                batch.append(item)
+            # Flush when full, or when the upstream has gone quiet
+            if batch and (item is _DONE or len(batch) >= self.write_batch_size or docs_q.empty()):
+                await self._flush(batch)
+                batch = []
+            if item is _DONE:
+                return
+
+    async def _flush(self, batch):
+        try:
+            await self.write_fn([doc for _, doc in batch])
+        except Exception as e:
+            logger.exception(f"Vector write failed size={len(batch)} error={e}")
+            for path, _ in batch:
+                self._fail_file(path)
+            self.stats.chunks_failed += len(batch)
+            return
+
+        self.stats.chunks_written += len(batch)
+        for path, _ in batch:
+            self._files[path].written += 1
+        for path in {path for path, _ in batch}:
+            await self._maybe_complete(path)
+
+    # --- Bookkeeping -----------------------------------------------
+
+    def _document(self, path: str, chunk: Chunk, embedding: List[float]) -> Dict[str, Any]:
+        return {
+            "_id": chunk_id(path, chunk.index),
+            "text": chunk.text,
+            "embedding": embedding,
+            "metadata": {**self._files[path].metadata, "chunk": chunk.metadata()},
+        }
+
+    def _fail_file(self, path: str):
+        state = self._files[path]
+        if not state.failed:
+            state.failed = True
+            self.stats.files_failed += 1
+
+    async def _maybe_complete(self, path: str):
+        state = self._files[path]
+        if state.done or state.failed or state.expected is None or state.written < state.expected:
+            return
+        state.done = True
+        if self.on_file_done:
+            try:
+                await self.on_file_done(path, [chunk_id(path, i) for i in range(state.expected)])
+            except Exception as e:
+                logger.exception(f"File completion hook failed path={path} error={e}")
+                self._fail_file(path)
+                return
+        self.stats.files_done += 1
+        if self.checkpoint:
+            self.checkpoint.mark_done(path, state.expected)
+
+    async def _report_progress(self):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            self._log_progress("Ingestion progress")
+
+    def _log_progress(self, label: str):
+        s = self.stats
+        logger.info(
+            f"{label} files={s.files_done}/{s.files_total} failed={s.files_failed} "
+            f"chunks={s.chunks_written} rate={s.chunks_per_sec():.1f} chunks/s"
+        )
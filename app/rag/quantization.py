@@ -0,0 +1,126 @@
+import os
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype
+
+# -------------------------------------------------------------------
+# Modes
+# -------------------------------------------------------------------
+# none:   float list in `embedding` (original layout)
+# int8:   `embedding_q` is a BSON int8 vector, scaled per vector
+# binary: `embedding_q` is a BSON packed-bit vector (sign of each dim)
+# Quantized documents also keep a float32 BSON vector in `embedding_f32`
+# that is only read back to rescore the top candidates.
+QUANTIZATION_MODES = ("none", "int8", "binary")
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "none").lower()
+
+if VECTOR_QUANTIZATION not in QUANTIZATION_MODES:
+    raise ValueError(f"VECTOR_QUANTIZATION must be one of {QUANTIZATION_MODES}")
+
+QUANTIZED_FIELD = "embedding_q"
+SCALE_FIELD = "embedding_scale"
+FULL_PRECISION_FIELD = "embedding_f32"
+
+
+def default_rescore_multiplier(mode: str) -> int:
+    """Compact-form hits rescored per requested result; sign bits need a wider net."""
+    return 10 if mode == "binary" else 4
+
+
+RESCORE_MULTIPLIER = int(
+    os.getenv("VECTOR_RESCORE_MULTIPLIER", str(default_rescore_multiplier(VECTOR_QUANTIZATION)))
+)
+
+
+# -------------------------------------------------------------------
+# Encoding
+# -------------------------------------------------------------------
+def quantize_int8(vector: Sequence[float]) -> Tuple[np.ndarray, float]:
+    """Symmetric per-vector scaling: x ~= q * scale with q in [-127, 127]."""
+    v = np.asarray(vector, dtype=np.float32)
+    peak = float(np.max(np.abs(v))) if v.size else 0.0
+    scale = peak / 127.0 if peak else 1.0
+    return np.clip(np.rint(v / scale), -127, 127).astype(np.int8), scale
+
+
+def dequantize_int8(q: np.ndarray, scale: float) -> np.ndarray:
+    return q.astype(np.float32) * scale
+
+
+def quantize_binary(vector: Sequence[float]) -> np.ndarray:
+    """One bit per dimension (1 = positive), packed big-endian into uint8."""
+    return np.packbits(np.asarray(vector, dtype=np.float32) > 0)
+
+
+def to_bson(vector: np.ndarray, dtype: BinaryVectorDtype, padding: int = 0) -> Binary:
+    return Binary.from_vector(vector.tolist(), dtype, padding)
+
+
+def encode_query(vector: Sequence[float], mode: str = VECTOR_QUANTIZATION) -> Any:
+    """The `$vectorSearch.queryVector` for an index over `mode` vectors."""
+    if mode == "int8":
+        q, _ = quantize_int8(vector)
+        return to_bson(q, BinaryVectorDtype.INT8)
+    if mode == "binary":
+        return to_bson(quantize_binary(vector), BinaryVectorDtype.PACKED_BIT, (-len(vector)) % 8)
+    return list(vector)
+
+
+def encode_document(document: Dict[str, Any], mode: str = VECTOR_QUANTIZATION) -> Dict[str, Any]:
+    """
+    Replace the float `embedding` list with the quantized layout, in place.
+    A no-op for mode "none" or documents that are already encoded.
+    """
+    if mode == "none" or "embedding" not in document:
+        return document
+
+    vector = np.asarray(document.pop("embedding"), dtype=np.float32)
+    if mode == "int8":
+        q, scale = quantize_int8(vector)
+        document[QUANTIZED_FIELD] = to_bson(q, BinaryVectorDtype.INT8)
+        document[SCALE_FIELD] = scale
+    else:
+        document[QUANTIZED_FIELD] = to_bson(
+            quantize_binary(vector), BinaryVectorDtype.PACKED_BIT, (-vector.size) % 8
+        )
+    document[FULL_PRECISION_FIELD] = to_bson(vector, BinaryVectorDtype.FLOAT32)
+    return document
+
+
+def full_precision(document: Dict[str, Any]) -> np.ndarray:
+    """The float32 vector of a stored document, whatever its layout."""
+    if FULL_PRECISION_FIELD in document:
+        return np.asarray(document[FULL_PRECISION_FIELD].as_vector().data, dtype=np.float32)
+    return np.asarray(document["embedding"], dtype=np.float32)
+
+
+# -------------------------------------------------------------------
+# Rescoring
+# -------------------------------------------------------------------
+def rescore(
+    query_embedding: Sequence[float],
+    candidates: List[Dict[str, Any]],
+    top_k: int,
+) -> List[Dict[str, Any]]:
+    """
+    Re-rank compact-form hits by exact cosine against their float32
+    vectors. Scores use Atlas' (1 + cos) / 2 convention; the float field
+    is stripped from the returned documents.
+    """
+    if not candidates:
+        return []
+    query = np.asarray(query_embedding, dtype=np.float32)
+    query = query / (np.linalg.norm(query) or 1.0)
+    matrix = np.stack([full_precision(c) for c in candidates])
+    norms = np.linalg.norm(matrix, axis=1)
+    cosines = (matrix @ query) / np.where(norms == 0, 1, norms)
+
+    order = np.argsort(-cosines)[:top_k]
+    results = []
+    for i in order:
+        doc = {k: v for k, v in candidates[i].items() if k != FULL_PRECISION_FIELD}
+        doc["approx_score"] = doc.get("score")
+        doc["score"] = float((1.0 + cosines[i]) / 2.0)
+        results.append(doc)
+    return results
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import redis.asyncio as redis
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+RETRIEVAL_CACHE_TTL = int(os.getenv("RETRIEVAL_CACHE_TTL", "3600"))
+
+GENERATION_KEY = "rag:corpus_generation"
+STATS_KEY = "rag:retrieval_cache:stats"
+
+# Shared by the API and the ingestion worker: writes in either process
+# bump the same generation counter.
+redis_client = redis.Redis(
+    host=os.getenv("REDIS_HOST", "redis"),
+    port=int(os.getenv("REDIS_PORT", "6379")),
+    decode_responses=True,
+)
+
+Results = List[Dict[str, Any]]
+
+
+class RetrievalCache:
+    """
+    Caches retrieval results under
+
+        rag:ret:<embedding model>:g<corpus generation>:<hash(query, top_k, filters)>
+
+    Writes to the vector store INCR the generation, so every older entry
+    stops being addressable at once and simply ages out via its TTL; no
+    key scan is ever needed. A hit skips both the query embedding and the
+    Mongo round-trip. Redis errors degrade to an uncached lookup.
+
+    `cacheable(generation)` lets the caller refuse to store results that
+    do not reflect that generation yet (e.g. computed over a BM25 index
+    loaded before the latest write); they are returned but not cached.
+    """
+
+    def __init__(self, client=None, ttl: int = RETRIEVAL_CACHE_TTL):
+        self.redis = client if client is not None else redis_client
+        self.ttl = ttl
+
+    async def generation(self) -> int:
+        value = await self.redis.get(GENERATION_KEY)
+        return int(value) if value else 0
+
+    async def bump_generation(self) -> Optional[int]:
+        try:
+            return await self.redis.incr(GENERATION_KEY)
+        except Exception as e:
+            # Stale results for at most the TTL; never fail a write over it
+            logger.warning(f"Could not bump corpus generation: {e}")
+            return None
+
+    @staticmethod
+    def key(model: str, generation: int, query: str, top_k: int, filters: Optional[Dict[str, Any]]) -> str:
+        payload = json.dumps(
+            {"q": query, "k": top_k, "f": filters or {}}, sort_keys=True, ensure_ascii=False
+        )
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"rag:ret:{model}:g{generation}:{digest}"
+
+    async def get_or_compute(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        model: str,
+        compute: Callable[[], Awaitable[Results]],
+        cacheable: Optional[Callable[[int], bool]] = None,
+    ) -> Results:
+        start = time.time()
+        key = None
+        try:
+            generation = await self.generation()
+            key = self.key(model, generation, query, top_k, filters)
+            cached = await self.redis.get(key)
+        except Exception as e:
+            logger.exception(f"Retrieval cache read failed: {e}")
+            cached = None
+
+        if cached is not None:
+            await self._count("hits")
+            logger.info(
+                "Retrieval cache hit",
+                extra={"key": key, "duration_ms": round((time.time() - start) * 1000, 2)},
+            )
+            return json.loads(cached)
+
+        await self._count("misses")
+        results = await compute()
+
+        if key and results and cacheable is not None and not cacheable(generation):
+            logger.info("Retrieval results not cached: computed behind the corpus", extra={"key": key})
+        elif key and results:
+            try:
+                await self.redis.set(key, json.dumps(results, default=str), ex=self.ttl)
+            except Exception as e:
+                logger.exception(f"Retrieval cache write failed for key={key}: {e}")
+        return results
+
+    async def _count(self, field: str):
+        try:
+            await self.redis.hincrby(STATS_KEY, field, 1)
+        except Exception:
+            pass
+
+    async def stats(self) -> Dict[str, Any]:
+        raw = await self.redis.hgetall(STATS_KEY)
+        hits, misses = int(raw.get("hits", 0)), int(raw.get("misses", 0))
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "generation": await self.generation(),
+        }
+
+
+retrieval_cache = RetrievalCache()
@@ -0,0 +1,310 @@
+import asyncio
+import ctypes
+import ctypes.util
+import json
+import os
+import socket
+import struct
+import time
+import traceback
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+PENDING_DIR = os.getenv("INGEST_PENDING_DIR", "/app/data/pending")
+PROCESSING_SUBDIR = "processing"
+FAILED_SUBDIR = "failed"
+
+# Files still being written are skipped by the polling path until their
+# mtime is at least this old. inotify reports closed files directly.
+SETTLE_SECONDS = 2.0
+
+# A claim in processing/ whose mtime is older than this belongs to a
+# replica that died mid-ingest; the file is put back in pending/. Live
+# claims are touched every third of the lease, so only long stalls expire.
+LEASE_SECONDS = float(os.getenv("INGEST_LEASE_SECONDS", "300"))
+
+ProcessFn = Callable[[str, Dict], Awaitable[int]]
+
+
+# -------------------------------------------------------------------
+# inotify (Linux) via ctypes
+# -------------------------------------------------------------------
+class _Inotify:
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, path: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(
+            self.fd, os.fsencode(path), self.IN_CLOSE_WRITE | self.IN_MOVED_TO
+        )
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed for {path}")
+
+    def read_events(self) -> List[Optional[str]]:
+        """Names of files closed-for-write or moved in; None on queue overflow."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        names: List[Optional[str]] = []
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            _, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            raw = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                names.append(None)
+            elif raw:
+                names.append(os.fsdecode(raw))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+# -------------------------------------------------------------------
+# Worker
+# -------------------------------------------------------------------
+class PendingFileWorker:
+    """
+    Drains a pending directory that several worker replicas may share.
+
+    A file is claimed by renaming it into `processing/`; the rename is
+    atomic, so exactly one replica wins and the others see it vanish.
+    Processed files are deleted, failed ones are moved to `failed/` next
+    to a `<name>.error.json` sidecar.
+
+    A claim holds a lease, kept alive by touching the file while it is
+    ingested. Claims whose lease expired (the replica crashed or was
+    killed) are moved back to pending on start and on every sweep.
+
+    New files are picked up from inotify when available; a periodic
+    directory sweep covers everything else (non-Linux hosts, network
+    volumes written from another machine, overflowed event queues).
+    """
+
+    def __init__(
+        self,
+        process_fn: Optional[ProcessFn] = None,
+        pending_dir: str = PENDING_DIR,
+        concurrency: int = int(os.getenv("INGEST_CONCURRENCY", "4")),
+        poll_interval: float = float(os.getenv("INGEST_POLL_INTERVAL", "5")),
+        sweep_interval: float = float(os.getenv("INGEST_SWEEP_INTERVAL", "30")),
+        use_inotify: bool = True,
+        lease_seconds: float = LEASE_SECONDS,
+    ):
+        if process_fn is None:
+            from .ingest import ingest_file
+
+            async def process_fn(path: str, metadata: Dict) -> int:
+                return await ingest_file(path, metadata=metadata)
+
+        self.process_fn = process_fn
+        self.pending_dir = pending_dir
+        self.processing_dir = os.path.join(pending_dir, PROCESSING_SUBDIR)
+        self.failed_dir = os.path.join(pending_dir, FAILED_SUBDIR)
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.sweep_interval = sweep_interval
+        self.use_inotify = use_inotify
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.processed = 0
+        self.failed = 0
+        self.recovered = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _prepare(self):
+        os.makedirs(self.processing_dir, exist_ok=True)
+        os.makedirs(self.failed_dir, exist_ok=True)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def run(self):
+        """Watch forever."""
+        self._prepare()
+        loop = asyncio.get_running_loop()
+        inotify = None
+        interval = self.poll_interval
+
+        if self.use_inotify:
+            try:
+                inotify = _Inotify(self.pending_dir)
+                loop.add_reader(inotify.fd, self._on_inotify, inotify)
+                interval = self.sweep_interval
+                logger.info(f"Watching {self.pending_dir} with inotify worker={self.worker_id}")
+            except (OSError, AttributeError) as e:
+                logger.warning(f"inotify unavailable ({e}); polling {self.pending_dir} every {interval}s")
+
+        try:
+            while True:
+                self.sweep()
+                await asyncio.sleep(interval)
+        finally:
+            if inotify:
+                loop.remove_reader(inotify.fd)
+                inotify.close()
+            for task in list(self._tasks):
+                task.cancel()
+
+    async def drain(self) -> int:
+        """Process everything currently pending once, then return."""
+        self._prepare()
+        before = self.processed
+        self.sweep(settle=False)
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        return self.processed - before
+
+    def sweep(self, settle: bool = True):
+        """Schedule every settled file in the pending directory."""
+        self.recover_expired()
+        now = time.time()
+        try:
+            entries = list(os.scandir(self.pending_dir))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if not entry.is_file() or self._ignored(entry.name):
+                continue
+            try:
+                if settle and now - entry.stat().st_mtime < SETTLE_SECONDS:
+                    continue
+            except FileNotFoundError:
+                continue
+            self._schedule(entry.name)
+
+    def recover_expired(self) -> int:
+        """Move claims whose lease expired back to pending; returns how many."""
+        now = time.time()
+        try:
+            entries = list(os.scandir(self.processing_dir))
+        except FileNotFoundError:
+            return 0
+        recovered = 0
+        for entry in entries:
+            if not entry.is_file() or entry.name in self._inflight:
+                continue
+            try:
+                if now - entry.stat().st_mtime < self.lease_seconds:
+                    continue
+                target = os.path.join(self.pending_dir, entry.name)
+                if os.path.exists(target):
+                    # A newer upload of the same name is pending; it supersedes the stranded one
+                    os.remove(entry.path)
+                    continue
+                os.rename(entry.path, target)
+            except FileNotFoundError:
+                # Finished, or recovered by another replica
+                continue
+            recovered += 1
+            logger.warning(f"Recovered stranded claim name={entry.name} worker={self.worker_id}")
+        self.recovered += recovered
+        return recovered
+
+    def _on_inotify(self, inotify: _Inotify):
+        for name in inotify.read_events():
+            if name is None:
+                logger.warning("inotify queue overflowed; sweeping pending directory")
+                self.sweep(settle=False)
+            elif not self._ignored(name):
+                self._schedule(name)
+
+    @staticmethod
+    def _ignored(name: str) -> bool:
+        # Dotfiles and partial uploads are never claimed
+        return name.startswith(".") or name.endswith((".tmp", ".part"))
+
+    def _schedule(self, name: str):
+        if name in self._inflight:
+            return
+        self._inflight.add(name)
+        task = asyncio.get_running_loop().create_task(self._handle(name))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, name: str):
+        try:
+            async with self._semaphore:
+                claimed = self._claim(name)
+                if claimed:
+                    await self._process(name, claimed)
+        finally:
+            self._inflight.discard(name)
+
+    def _claim(self, name: str) -> Optional[str]:
+        source = os.path.join(self.pending_dir, name)
+        target = os.path.join(self.processing_dir, name)
+        try:
+            os.rename(source, target)
+            # rename keeps the upload's mtime; the lease starts now
+            os.utime(target)
+        except FileNotFoundError:
+            # Another replica claimed it first
+            return None
+        return target
+
+    async def _keep_lease(self, path: str):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                return
+
+    async def _process(self, name: str, path: str):
+        start = time.time()
+        logger.info(f"Ingesting pending file name={name} worker={self.worker_id}")
+        lease = asyncio.get_running_loop().create_task(self._keep_lease(path))
+        try:
+            chunks = await self.process_fn(path, {"source": os.path.join(self.pending_dir, name)})
+        except Exception as e:
+            self.failed += 1
+            logger.exception(f"Pending file ingestion failed name={name} error={e}")
+            self._move_to_failed(name, path, e)
+            return
+        finally:
+            lease.cancel()
+
+        os.remove(path)
+        self.processed += 1
+        logger.info(
+            f"Ingested pending file name={name} chunks={chunks} "
+            f"duration_ms={int((time.time() - start) * 1000)}"
+        )
+
+    def _move_to_failed(self, name: str, path: str, error: Exception):
+        target = os.path.join(self.failed_dir, name)
+        try:
+            os.replace(path, target)
+        except OSError:
+            logger.exception(f"Could not move failed file name={name}")
+            return
+        sidecar = {
+            "file": name,
+            "error": str(error),
+            "error_type": type(error).__name__,
+            "traceback": traceback.format_exception(error),
+            "worker": self.worker_id,
+            "failed_at": time.time(),
+        }
+        with open(f"{target}.error.json", "w", encoding="utf-8") as f:
+            json.dump(sidecar, f, indent=2)
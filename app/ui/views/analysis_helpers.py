@@ -12,16 +12,31 @@ def save_analysis_to_db(analysis_result):
     headers = {"Authorization": f"Bearer {st.session_state.get('token', '')}"}
     requests.post(url, json=analysis_result, headers=headers)
 
-def load_analysis_history_from_db():
+def load_analysis_history_from_db(cursor=None):
+    """First page of history, or the page after `cursor` appended to it."""
     url = f"{BACKEND_URL}/analysis_history/analysis/history"
     headers = {"Authorization": f"Bearer {st.session_state.get('token', '')}"}
-    resp = requests.get(url, headers=headers)
+    params = {"cursor": cursor} if cursor else {}
+    resp = requests.get(url, headers=headers, params=params)
     if resp.status_code == 200:
-        data = resp.json()
-        st.session_state["analysis_history"] = data
-        return data
+        page = resp.json()
+        items = page.get("items", [])
+        if cursor:
+            items = st.session_state.get("analysis_history", []) + items
+        st.session_state["analysis_history"] = items
+        st.session_state["analysis_history_cursor"] = page.get("next_cursor")
+        return items
     return []
 
+def load_analysis_from_db(analysis_id):
+    """Full analysis document; history entries only carry summaries."""
+    url = f"{BACKEND_URL}/analysis_history/analysis/{analysis_id}"
+    headers = {"Authorization": f"Bearer {st.session_state.get('token', '')}"}
+    resp = requests.get(url, headers=headers)
+    if resp.status_code == 200:
+        return resp.json()
+    return None
+
 def init_analysis_history():
     if "analysis_history" not in st.session_state:
         load_analysis_history_from_db()
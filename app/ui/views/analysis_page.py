@@ -1,11 +1,18 @@
 import streamlit as st
-from .analysis_helpers import init_analysis_history, save_analysis_to_db
+from .analysis_helpers import (
+    init_analysis_history,
+    load_analysis_from_db,
+    load_analysis_history_from_db,
+    save_analysis_to_db,
+)
 
 # Auto‑restore last analysis on login
 if "analysis_result" not in st.session_state:
     history = st.session_state.get("analysis_history", [])
     if history:
-        st.session_state["analysis_result"] = history[0]
+        latest = load_analysis_from_db(history[0]["_id"])
+        if latest:
+            st.session_state["analysis_result"] = latest
 
 from views.analysis import (
     render_fitgraph_section,
@@ -30,24 +37,32 @@ def render_analysis_page():
             st.info("No past analyses found.") 
         else: 
             st.markdown("### Filters") 
-            job_titles = list({h["jd_text"].splitlines()[0] for h in history}) 
+            job_titles = list({(h.get("jd_preview") or "").splitlines()[0] for h in history if h.get("jd_preview")}) 
             selected_title = st.selectbox("Job Title", ["All"] + job_titles) 
             dates = list({extract_date(h) for h in history}) 
             selected_date = st.selectbox("Date", ["All"] + dates) 
             filtered = history 
             if selected_title != "All": 
-                filtered = [h for h in filtered if h["jd_text"].startswith(selected_title)] 
+                filtered = [h for h in filtered if (h.get("jd_preview") or "").startswith(selected_title)] 
             if selected_date != "All": 
                 filtered = [h for h in filtered if extract_date(h) == selected_date] 
             st.markdown("---") 
             st.markdown("### Select Analysis") 
             for idx, item in enumerate(filtered): 
                 ts = item.get("timestamp", "No timestamp")
-                jd = item.get("jd_text", "")[:40]
+                jd = (item.get("jd_preview") or "")[:40]
                 label = f"{ts} — {jd}..."
                 if st.button(label, key=f"analysis_{idx}"): 
-                    st.session_state["analysis_result"] = item 
-                    st.rerun() 
+                    selected = load_analysis_from_db(item["_id"])
+                    if selected:
+                        st.session_state["analysis_result"] = selected
+                        st.rerun()
+                    else:
+                        st.error("Could not load this analysis.")
+            cursor = st.session_state.get("analysis_history_cursor")
+            if cursor and st.button("Load more", key="analysis_history_more"):
+                load_analysis_history_from_db(cursor)
+                st.rerun()
         # Resume mock interview 
         st.markdown("---") 
         st.subheader("Resume Mock Interview") 
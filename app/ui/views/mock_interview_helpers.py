@@ -183,23 +183,42 @@ def save_evaluation_to_db(question, eval_result, user_answer):
     requests.post(url, json=payload, headers=headers)
 
 def load_history_from_db():
+    """Newest page of past evaluations (question, score, timestamp)."""
     url = f"{BACKEND_URL}/mock/history"
     headers = {"Authorization": f"Bearer {st.session_state.get('token', '')}"}
 
     resp = requests.get(url, headers=headers)
     if resp.status_code == 200:
-        data = resp.json()
-        st.session_state["mock_interview_history"] = data
-        return data
+        items = resp.json().get("items", [])
+        st.session_state["mock_interview_history"] = items
+        return items
 
     return []
 
 
+def load_question_history_from_db(question: str):
+    """Every past attempt at `question`, oldest first, following all pages."""
+    url = f"{BACKEND_URL}/mock/history"
+    headers = {"Authorization": f"Bearer {st.session_state.get('token', '')}"}
+    params = {"question": question, "limit": 100}
+
+    attempts = []
+    while True:
+        resp = requests.get(url, headers=headers, params=params)
+        if resp.status_code != 200:
+            break
+        page = resp.json()
+        attempts.extend(page.get("items", []))
+        if not page.get("next_cursor"):
+            break
+        params["cursor"] = page["next_cursor"]
+
+    return list(reversed(attempts))
+
+
 # ---------------------------------------------------------
 # HISTORY RETRIEVAL
 # ---------------------------------------------------------
 def get_question_history(question: str):
-    history = st.session_state.get("mock_interview_history", [])
-    if not history:
-        history = load_history_from_db()
-    return [h for h in history if h["question"] == question]
+    # The session only holds the first page of history; analytics need every attempt
+    return load_question_history_from_db(question)
@@ -0,0 +1,56 @@
+import os
+import uuid
+
+import requests
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+class MultipartFileStream:
+    """
+    A one-file multipart/form-data body produced chunk by chunk. It has a
+    length, so requests sends a Content-Length (the API rejects oversized
+    uploads from it) instead of copying the file into one bytes object.
+    """
+
+    def __init__(self, field, filename, fileobj, content_type, size=None, chunk_size=UPLOAD_CHUNK_BYTES):
+        self.boundary = uuid.uuid4().hex
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type or 'application/octet-stream'}\r\n\r\n"
+        ).encode("utf-8")
+        self.tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+        if size is None:
+            position = fileobj.tell()
+            size = fileobj.seek(0, os.SEEK_END) - position
+            fileobj.seek(position)
+        self.size = size
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return len(self.head) + self.size + len(self.tail)
+
+    def __iter__(self):
+        yield self.head
+        while chunk := self.fileobj.read(self.chunk_size):
+            yield chunk
+        yield self.tail
+
+
+def upload_video(uploaded_file, token=None, timeout=600):
+    """POST a Streamlit UploadedFile to /analyze_video without getvalue()."""
+    uploaded_file.seek(0)
+    body = MultipartFileStream(
+        "video_file", uploaded_file.name, uploaded_file, uploaded_file.type, size=uploaded_file.size
+    )
+    headers = {"Content-Type": body.content_type}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return requests.post(f"{BACKEND_URL}/analyze_video", data=body, headers=headers, timeout=timeout)
@@ -3,6 +3,7 @@ import requests
 import os
 from datetime import datetime 
 from .analysis_helpers import save_analysis_to_db, load_analysis_history_from_db
+from .video_helpers import upload_video
 
 from views.analysis import (
     render_fitgraph_section,
@@ -30,26 +31,10 @@ def render_video_page():
     st.video(uploaded_file)
 
     if st.button("Analyze Video"):
-        files = {
-            "video_file": (
-                uploaded_file.name,
-                uploaded_file.getvalue(),
-                uploaded_file.type
-            )
-        }
-
-        headers = {}
-        token = st.session_state.get("token")
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-
         try:
             with st.spinner("Uploading and analyzing video... This may take a moment."):
-                response = requests.post(
-                    f"{BACKEND_URL}/analyze_video",
-                    files=files,
-                    headers=headers
-                )
+                # Streamed in chunks rather than copied out with getvalue()
+                response = upload_video(uploaded_file, token=st.session_state.get("token"))
 
             if response.status_code != 200:
                 st.error(f"Analysis failed. Server responded with: {response.status_code}")
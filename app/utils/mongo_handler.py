@@ -1,77 +1,57 @@
 import asyncio
-from pymongo import MongoClient
+from pymongo import ReturnDocument
 from pymongo.errors import ConnectionFailure
+from app.db import mongo
 from app.utils.logger import setup_logger
-import os
-import time
 
 logger = setup_logger()
 
 class MongoHandler:
+    """Connection lifecycle and user lookups on the shared async client (app.db.mongo)."""
+
     def __init__(self):
-        self.client = None
         self.db = None
 
-    def connect(self, retries=5, delay=5):
-        """Connects to MongoDB synchronously with retries."""
-        mongo_uri = os.getenv("MONGO_URI", "mongodb://mongo:27017/careerpilot")
+    async def connect(self, retries=5, delay=5):
+        """Waits for MongoDB to answer a ping, with retries, then ensures indexes."""
         for i in range(retries):
             try:
-                self.client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-                # The ismaster command is cheap and does not require auth.
-                self.client.admin.command('ismaster')
-                self.db = self.client.get_database("careerpilot")
+                await mongo.ping()
+                self.db = mongo.db
+                await mongo.ensure_indexes()
                 logger.info("Successfully connected to MongoDB.")
                 return
             except ConnectionFailure as e:
                 logger.error(f"Could not connect to MongoDB: {e}, retrying in {delay}s...")
-                time.sleep(delay)
-        
+                await asyncio.sleep(delay)
+
         logger.error("Failed to connect to MongoDB after multiple retries.")
-        self.client = None
         self.db = None
 
-    def close(self):
-        """Closes the MongoDB connection synchronously."""
-        if self.client:
-            self.client.close()
-            logger.info("MongoDB connection closed.")
+    async def close(self):
+        """Closes the shared MongoDB client."""
+        await mongo.close()
 
-    async def insert_log(self, log_data: dict):
-        """Inserts a log document asynchronously using a thread."""
-        if self.db is not None:
-            def sync_insert():
-                return self.db.logs.insert_one(log_data)
-            result = await asyncio.to_thread(sync_insert)
-            logger.info(f"Log inserted with id: {result.inserted_id}")
-            return result
-        return None
-
-    async def insert_session(self, session_data: dict):
-        """Inserts a session document asynchronously using a thread."""
+    async def get_user(self, username: str):
+        """Retrieves a user from the database."""
         if self.db is not None:
-            def sync_insert():
-                return self.db.sessions.insert_one(session_data)
-            result = await asyncio.to_thread(sync_insert)
-            logger.info(f"Session inserted with id: {result.inserted_id}")
-            return result
+            return await mongo.user_collection.find_one({"username": username})
         return None
 
-    async def get_user(self, username: str):
-        """Retrieves a user from the database asynchronously."""
+    async def update_user(self, username: str, fields: dict):
+        """Sets `fields` on a user; returns the updated document, or None if there is no such user."""
         if self.db is not None:
-            def sync_find():
-                return self.db.users.find_one({"username": username})
-            user = await asyncio.to_thread(sync_find)
-            return user
+            return await mongo.user_collection.find_one_and_update(
+                {"username": username},
+                {"$set": fields},
+                return_document=ReturnDocument.AFTER,
+            )
         return None
 
     async def create_user(self, user_data: dict):
-        """Creates a new user in the database asynchronously."""
+        """Creates a new user in the database."""
         if self.db is not None:
-            def sync_insert():
-                return self.db.users.insert_one(user_data)
-            result = await asyncio.to_thread(sync_insert)
+            result = await mongo.user_collection.insert_one(user_data)
             logger.info(f"User created with id: {result.inserted_id}")
             return result
         return None
@@ -0,0 +1,126 @@
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.db import mongo
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Entries held in memory at most; beyond this new ones are dropped (counted)
+TELEMETRY_QUEUE_SIZE = int(os.getenv("TELEMETRY_QUEUE_SIZE", "10000"))
+# A flush starts once this many entries wait, or every TELEMETRY_FLUSH_MS
+TELEMETRY_BATCH_SIZE = int(os.getenv("TELEMETRY_BATCH_SIZE", "500"))
+TELEMETRY_FLUSH_MS = int(os.getenv("TELEMETRY_FLUSH_MS", "1000"))
+
+Entry = Tuple[str, dict]
+
+
+class TelemetrySink:
+    """
+    Fire-and-forget writer for request sessions and logs. `emit()` only
+    appends to a bounded in-memory queue, so the request path never waits
+    on Mongo; a background task writes the queue with one `insert_many`
+    per collection every `batch_size` entries or `flush_ms`, whichever
+    comes first. A full queue drops the new entry and counts it rather
+    than blocking. `stop()` lets a write in progress finish, then writes
+    whatever is still queued.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = TELEMETRY_QUEUE_SIZE,
+        batch_size: int = TELEMETRY_BATCH_SIZE,
+        flush_ms: int = TELEMETRY_FLUSH_MS,
+        collection: Callable = mongo.get_collection,
+    ):
+        self.max_queue = max_queue
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_ms / 1000
+        self.collection = collection
+
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def _prepare(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._batch_ready = asyncio.Event()
+
+    def start(self):
+        """Start the background flusher on the running loop."""
+        self._prepare()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            # Not cancel(): a batch being written is already off the queue
+            self._stopping = True
+            self._batch_ready.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+        await self.flush()
+        logger.info(f"Telemetry sink stopped: {self.stats()}")
+
+    def emit(self, collection: str, document: dict):
+        """Queue `document` for `collection`; never blocks, drops when full."""
+        self._prepare()
+        document.setdefault("created_at", datetime.now(timezone.utc))
+        try:
+            self._queue.put_nowait((collection, document))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Telemetry queue full ({self.max_queue}); {self.dropped} entries dropped so far")
+            return
+        if self._queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Write everything queued, `batch_size` entries at a time."""
+        while self._queue is not None and not self._queue.empty():
+            batch: List[Entry] = []
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._write(batch)
+
+    async def _write(self, batch: List[Entry]):
+        grouped: Dict[str, List[dict]] = defaultdict(list)
+        for name, document in batch:
+            grouped[name].append(document)
+        for name, documents in grouped.items():
+            try:
+                await self.collection(name).insert_many(documents, ordered=False)
+                self.written += len(documents)
+            except Exception as e:
+                self.failed += len(documents)
+                logger.warning(f"Telemetry write of {len(documents)} entries to {name} failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+telemetry = TelemetrySink()
@@ -0,0 +1,3 @@
+"""
+Offline benchmarks for CareerPilot. Run each module with `python -m benchmarks.<name>`.
+"""
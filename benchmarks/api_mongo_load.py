@@ -0,0 +1,137 @@
+"""
+Mongo access load test: concurrent per-user history fetches, the query
+behind /analysis_history/analysis/history and /mock/history, through
+three access paths:
+
+  - sync_inline: sync PyMongo called inside `async def` (the old routers)
+  - to_thread:   sync PyMongo wrapped in asyncio.to_thread (old handler / RAG)
+  - async:       the shared AsyncMongoClient in app.db.mongo
+
+Besides throughput and request latency, a ticker coroutine measures
+event-loop lag: how late a 5 ms sleep wakes up while the fetches run.
+Needs a reachable MongoDB; seeds and drops its own collection.
+
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.api_mongo_load --concurrency 64
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from pymongo import ASCENDING, DESCENDING, MongoClient
+
+from app.db import mongo
+from benchmarks.common import emit, percentile
+
+COLLECTION = "loadtest_analysis_results"
+TICK_SECONDS = 0.005
+
+
+def seed(sync_db, users: int, per_user: int):
+    collection = sync_db[COLLECTION]
+    collection.drop()
+    now = datetime.utcnow()
+    docs = [
+        {
+            "user_id": f"user{u}@example.com",
+            "timestamp": now - timedelta(minutes=i),
+            "overall_fit_score": random.randint(0, 100),
+            "summary": "x" * 400,
+            "matching_skills": ["python", "fastapi", "mongodb"],
+        }
+        for u in range(users)
+        for i in range(per_user)
+    ]
+    collection.insert_many(docs)
+    collection.create_index([("user_id", ASCENDING), ("timestamp", DESCENDING)])
+
+
+async def _ticker(lags: List[float], stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def run_mode(fetch: Callable, users: int, concurrency: int, requests: int) -> dict:
+    latencies: List[float] = []
+    lags: List[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await fetch(f"user{i % users}@example.com")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    return {
+        "requests_per_s": round(requests / elapsed, 1),
+        "latency_p50_ms": round(percentile(latencies, 50), 2),
+        "latency_p95_ms": round(percentile(latencies, 95), 2),
+        "latency_p99_ms": round(percentile(latencies, 99), 2),
+        "loop_lag_p50_ms": round(percentile(lags, 50), 2),
+        "loop_lag_p99_ms": round(percentile(lags, 99), 2),
+        "loop_lag_max_ms": round(max(lags), 2) if lags else 0.0,
+    }
+
+
+async def main_async(args) -> dict:
+    sync_client = MongoClient(mongo.MONGO_URI, maxPoolSize=mongo.POOL_OPTIONS["maxPoolSize"])
+    sync_collection = sync_client[mongo.DB_NAME][COLLECTION]
+    async_collection = mongo.get_collection(COLLECTION)
+    seed(sync_client[mongo.DB_NAME], args.users, args.per_user)
+
+    def sync_fetch(user_id):
+        return list(sync_collection.find({"user_id": user_id}).sort("timestamp", -1))
+
+    async def sync_inline(user_id):
+        return sync_fetch(user_id)
+
+    async def to_thread(user_id):
+        return await asyncio.to_thread(sync_fetch, user_id)
+
+    async def native(user_id):
+        return await async_collection.find({"user_id": user_id}).sort("timestamp", -1).to_list(None)
+
+    report = {
+        "users": args.users,
+        "docs_per_user": args.per_user,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+    }
+    try:
+        for name, fetch in (("sync_inline", sync_inline), ("to_thread", to_thread), ("async", native)):
+            await fetch("user0@example.com")  # warm the pool
+            report[name] = await run_mode(fetch, args.users, args.concurrency, args.requests)
+    finally:
+        sync_collection.drop()
+        sync_client.close()
+        await mongo.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mongo access-path load test")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--per-user", type=int, default=50, help="History documents per user")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    emit(asyncio.run(main_async(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Concurrent logins alongside a streaming response, with password checks
+run inline on the event loop (the old /auth/token) or through the
+PasswordHasher pool.
+
+A small FastAPI app mirrors the two endpoints: POST /login verifies the
+password against a stored hash (bcrypt for a share of users, to include
+the rehash path), GET /stream emits a chunk every --chunk-ms. Both are
+driven in-process (logins over httpx's ASGI transport, the stream as a
+raw ASGI call), so anything blocking the loop shows up directly as
+stalls between stream chunks.
+
+Reports login latency percentiles, logins/s, and the stream's worst and
+p99 inter-chunk gap against its nominal interval.
+
+    python -m benchmarks.auth_login_load --logins 200 --concurrency 16 --workers 4
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from passlib.context import CryptContext
+
+from app.api.password_hasher import PasswordHasher, pwd_context
+from benchmarks.common import emit, percentile
+
+PASSWORD = "correct horse battery staple"
+
+
+def build_app(mode: str, hasher: PasswordHasher, users: dict, chunk_s: float, chunks: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login(payload: dict):
+        stored = users[payload["username"]]
+        if mode == "inline":
+            ok, new_hash = pwd_context.verify_and_update(payload["password"], stored)
+        else:
+            ok, new_hash = await hasher.verify_and_update(payload["password"], stored)
+        if not ok:
+            raise HTTPException(status_code=401)
+        if new_hash:
+            users[payload["username"]] = new_hash
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            for i in range(chunks):
+                yield f"{time.perf_counter()}\n"
+                await asyncio.sleep(chunk_s)
+
+        return StreamingResponse(body(), media_type="text/plain")
+
+    return app
+
+
+async def run(mode: str, args) -> dict:
+    legacy = CryptContext(schemes=["bcrypt"])
+    users = {
+        f"user{i}": (legacy.hash(PASSWORD) if i % 4 == 0 else pwd_context.hash(PASSWORD))
+        for i in range(args.users)
+    }
+    hasher = PasswordHasher(workers=args.workers)
+    chunk_s = args.chunk_ms / 1000
+    app = build_app(mode, hasher, users, chunk_s, chunks=10 ** 6)
+    transport = httpx.ASGITransport(app=app)
+
+    login_ms = []
+    gaps = []
+    done = asyncio.Event()
+
+    async def streamer():
+        # Raw ASGI call: httpx's ASGI transport would buffer the whole body
+        scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+                 "scheme": "http", "path": "/stream", "raw_path": b"/stream", "root_path": "",
+                 "query_string": b"", "headers": [], "client": ("bench", 1), "server": ("bench", 80)}
+        last = None
+
+        async def receive():
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal last
+            if message["type"] == "http.response.body" and message.get("body"):
+                now = time.perf_counter()
+                if last is not None:
+                    gaps.append((now - last) * 1000)
+                last = now
+
+        await app(scope, receive, send)
+
+    async def logins(client):
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/login", json={"username": f"user{i % args.users}", "password": PASSWORD})
+                response.raise_for_status()
+                login_ms.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(one(i) for i in range(args.logins)))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        stream_task = asyncio.create_task(streamer())
+        await asyncio.sleep(0.2)
+        start = time.perf_counter()
+        await logins(client)
+        elapsed = time.perf_counter() - start
+        done.set()
+        await stream_task
+
+    hasher.shutdown()
+    return {
+        "logins_per_s": round(args.logins / elapsed, 1),
+        "login_p50_ms": round(percentile(login_ms, 50), 1),
+        "login_p95_ms": round(percentile(login_ms, 95), 1),
+        "stream_chunk_ms": args.chunk_ms,
+        "stream_gap_p99_ms": round(percentile(gaps, 99), 1),
+        "stream_gap_max_ms": round(max(gaps, default=0.0), 1),
+        **({"hasher": hasher.stats()} if mode == "pool" else {}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent login load alongside streaming")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4, help="PasswordHasher threads")
+    parser.add_argument("--chunk-ms", type=float, default=20)
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    report = {"logins": args.logins, "concurrency": args.concurrency, "workers": args.workers,
+              "modes": {mode: asyncio.run(run(mode, args)) for mode in ("inline", "pool")}}
+    emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Auth overhead per request: get_current_user (JWT decode + principal
+resolution) for a pool of users, with
+
+  - uncached:    every call loads the user from "Mongo"
+  - redis:       principal cache with the in-process layer disabled
+  - local+redis: the default principal cache
+
+Mongo is simulated by a loader that sleeps --mongo-ms (round trip under
+load), Redis by fakeredis unless --redis-url points at a real server.
+Reports per-call latency percentiles and the Mongo lookups made.
+
+    python -m benchmarks.auth_overhead --requests 5000 --users 50 --mongo-ms 2
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import fakeredis
+import redis.asyncio as redis
+
+from app.api import auth
+from app.api.principal_cache import PrincipalCache
+from benchmarks.common import emit, percentile
+
+
+class SimulatedMongo:
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.lookups = 0
+
+    async def get_user(self, username: str):
+        self.lookups += 1
+        await asyncio.sleep(self.latency_s)
+        return {"username": username, "email": f"{username}@example.com", "roles": ["user"],
+                "is_active": True, "password_hash": "x"}
+
+
+class Uncached:
+    async def get_or_load(self, username, claims, load):
+        return await load()
+
+
+async def run_mode(cache, tokens, requests, concurrency, mongo):
+    auth.principal_cache = cache
+    auth.mongo_handler.get_user = mongo.get_user
+    rng = random.Random(0)
+    order = [rng.choice(tokens) for _ in range(requests)]
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(token):
+        async with semaphore:
+            start = time.perf_counter()
+            await auth.get_current_user(token)
+            latencies.append((time.perf_counter() - start) * 1e6)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in order))
+    elapsed = time.perf_counter() - start
+    return {
+        "p50_us": round(percentile(latencies, 50), 1),
+        "p95_us": round(percentile(latencies, 95), 1),
+        "p99_us": round(percentile(latencies, 99), 1),
+        "requests_per_s": round(requests / elapsed),
+        "mongo_lookups": mongo.lookups,
+        **(cache.stats() if hasattr(cache, "stats") else {}),
+    }
+
+
+async def main_async(args):
+    tokens = [auth.create_access_token({"sub": f"user{i}", "email": f"user{i}@example.com", "roles": ["user"]})
+              for i in range(args.users)]
+
+    def redis_client():
+        if args.redis_url:
+            return redis.Redis.from_url(args.redis_url, decode_responses=True)
+        return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    modes = {
+        "uncached": lambda: Uncached(),
+        "redis": lambda: PrincipalCache(client=redis_client(), ttl=0),
+        "local+redis": lambda: PrincipalCache(client=redis_client()),
+    }
+    report = {"requests": args.requests, "users": args.users, "concurrency": args.concurrency,
+              "mongo_ms": args.mongo_ms, "redis": args.redis_url or "fakeredis", "modes": {}}
+    for name, make in modes.items():
+        cache = make()
+        if isinstance(cache, PrincipalCache):
+            for key in await cache.redis.keys("auth:principal:*"):
+                await cache.redis.delete(key)
+        report["modes"][name] = await run_mode(cache, tokens, args.requests, args.concurrency,
+                                               SimulatedMongo(args.mongo_ms / 1000))
+    emit(report, args.output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auth overhead benchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mongo-ms", type=float, default=2.0, help="Simulated Mongo lookup latency")
+    parser.add_argument("--redis-url", type=str, default=None, help="Real Redis instead of fakeredis")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import glob
+import json
+import os
+import re
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+MOCKTEST_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "MockTest"
+)
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def load_mocktest(pattern: str = "*.txt") -> Dict[str, str]:
+    """Return {filename: text} for the MockTest resumes and JDs."""
+    docs = {}
+    for path in sorted(glob.glob(os.path.join(MOCKTEST_DIR, pattern))):
+        with open(path, "r", encoding="utf-8") as f:
+            docs[os.path.basename(path)] = f.read()
+    return docs
+
+
+def bullet_lines(text: str) -> List[str]:
+    """The `- ...` lines of a MockTest file, used as retrieval queries."""
+    return [
+        line.strip()[2:].strip()
+        for line in text.splitlines()
+        if line.strip().startswith("- ") and len(line.strip()) > 4
+    ]
+
+
+def hashed_embedding(text: str, dims: int = 256) -> np.ndarray:
+    """
+    Deterministic bag-of-words embedding (feature hashing), so retrieval
+    benchmarks run without calling the Gemini embedding model.
+    """
+    vec = np.zeros(dims, dtype=np.float32)
+    for token in _WORD_RE.findall(text.lower()):
+        h = zlib.crc32(token.encode("utf-8"))
+        vec[h % dims] += 1.0 if (h >> 31) & 1 else -1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def percentile(values: List[float], pct: float) -> float:
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+def emit(report: dict, output: str = None):
+    """Print the report as JSON and optionally write it to `output`."""
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
@@ -0,0 +1,148 @@
+"""
+Context packing benchmark on the MockTest set: final-analysis prompt size
+for every resume x JD pair, before and after.
+
+  - legacy:   500-word chunks, vector top-3 joined with no limit
+  - unpacked: sentence-aware chunks, hybrid top-N joined with no limit
+  - packed:   the same top-N through MMR + token budget
+
+Retrieval uses local stores with hashed embeddings; prompt tokens are
+the local estimate from app.rag.chunking. With `--live` each
+prompt is also sent to the configured Gemini model, timing the
+final-analysis call end to end (needs GEMINI_* / proxy settings).
+
+    python -m benchmarks.context_packing --budget 400 --candidates 8
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.agent.context import CONTEXT_TOKEN_BUDGET, build_context
+from app.rag.chunking import chunk_text, estimate_tokens
+from app.rag.hybrid import hybrid_search
+from app.rag.lexical import BM25Index
+from app.rag.local_vector import LocalVectorStore
+from benchmarks.common import emit, hashed_embedding, load_mocktest, percentile
+from benchmarks.rag_chunking import legacy_chunk_text
+
+PROMPT_PATH = os.path.join("app", "gemini", "prompts", "final_analysis.txt")
+
+
+async def _corpus(chunker):
+    store, index = LocalVectorStore(), BM25Index()
+    docs = []
+    for pattern in ("*.txt", "*.md"):
+        for name, body in load_mocktest(pattern).items():
+            for i, text in enumerate(chunker(body)):
+                docs.append({
+                    "_id": f"{name}:{i}",
+                    "text": text,
+                    "embedding": hashed_embedding(text).tolist(),
+                })
+    await store.upsert_many(docs)
+    index.add_many(docs)
+    return store, index
+
+
+async def _final_analysis(gemini_client, prompt: str) -> float:
+    start = time.perf_counter()
+    await gemini_client.call(
+        "final_analysis", gemini_client.client.models.generate_content,
+        model=gemini_client.chat_model, contents=prompt,
+    )
+    return time.perf_counter() - start
+
+
+async def run(args) -> dict:
+    with open(PROMPT_PATH, "r", encoding="utf-8") as f:
+        template = f.read()
+    legacy_store, _ = await _corpus(lambda body: legacy_chunk_text(body, chunk_size=500))
+    store, index = await _corpus(
+        lambda body: (c.text for c in chunk_text(body, max_tokens=args.max_tokens, overlap_tokens=args.overlap))
+    )
+
+    mocktest = load_mocktest()
+    jds = {k: v for k, v in mocktest.items() if k.startswith("JD")}
+    resumes = {k: v for k, v in mocktest.items() if not k.startswith("JD")}
+
+    gemini_client = None
+    if args.live:
+        from app.gemini import GeminiClient
+        gemini_client = GeminiClient()
+
+    variants = ("legacy", "unpacked", "packed")
+    rows: Dict[str, Dict[str, List[float]]] = {
+        name: {"prompt_tokens": [], "context_tokens": [], "assembly_ms": [], "latency_s": []}
+        for name in variants
+    }
+    dropped = {"redundant": 0, "low_relevance": 0, "over_budget": 0}
+
+    for jd in jds.values():
+        embedding = hashed_embedding(jd).tolist()
+        legacy = await legacy_store.search(embedding, top_k=3)
+        results = await hybrid_search(jd, embedding, top_k=args.candidates, store=store, index=index)
+
+        for resume in resumes.values():
+            contexts = {}
+            for name, assemble in (
+                ("legacy", lambda: "\n".join(r["text"] for r in legacy)),
+                ("unpacked", lambda: "\n".join(r["text"] for r in results)),
+                ("packed", lambda: build_context(jd, results, token_budget=args.budget)),
+            ):
+                start = time.perf_counter()
+                contexts[name] = (assemble(), (time.perf_counter() - start) * 1000)
+
+            pack, _ = contexts["packed"]
+            contexts["packed"] = (pack.text, contexts["packed"][1])
+            for item in pack.dropped:
+                dropped[item["reason"]] += 1
+
+            for name, (context, ms) in contexts.items():
+                prompt = template.format(context=context, resume_text=resume, jd_text=jd)
+                rows[name]["prompt_tokens"].append(estimate_tokens(prompt))
+                rows[name]["context_tokens"].append(estimate_tokens(context))
+                rows[name]["assembly_ms"].append(ms)
+                if gemini_client:
+                    rows[name]["latency_s"].append(await _final_analysis(gemini_client, prompt))
+
+    def summarize(values: Dict[str, List[float]]) -> dict:
+        out = {
+            "prompt_tokens_mean": round(float(np.mean(values["prompt_tokens"])), 1),
+            "context_tokens_mean": round(float(np.mean(values["context_tokens"])), 1),
+            "context_tokens_max": int(max(values["context_tokens"])),
+            "assembly_ms_p50": round(percentile(values["assembly_ms"], 50), 3),
+        }
+        if values["latency_s"]:
+            out["final_analysis_p50_s"] = round(percentile(values["latency_s"], 50), 2)
+            out["final_analysis_p95_s"] = round(percentile(values["latency_s"], 95), 2)
+        return out
+
+    return {
+        "pairs": len(jds) * len(resumes),
+        "chunk_tokens": args.max_tokens,
+        "budget": args.budget,
+        "candidates": args.candidates,
+        **{name: summarize(rows[name]) for name in variants},
+        "dropped": dropped,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Context packing benchmark")
+    parser.add_argument("--budget", type=int, default=CONTEXT_TOKEN_BUDGET, help="Context token budget")
+    parser.add_argument("--candidates", type=int, default=8)
+    parser.add_argument("--max-tokens", type=int, default=256, help="Chunk size used to build the corpus")
+    parser.add_argument("--overlap", type=int, default=32)
+    parser.add_argument("--live", action="store_true", help="Also time the Gemini final-analysis call")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    emit(asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Per-frame OCR cache on re-recordings: the same document recorded again
+with a different frame rate, codec and scroll speed (so different file
+bytes and different frame timings) after the original was read once.
+
+Reports, per re-recording, how many prepared frames hit the cache (within
+OCR_FRAME_CACHE_DISTANCE bits) and so never reach the OCR models. Without
+--ocr a counting reader stands in for EasyOCR, so only hit rates are
+meaningful; with --ocr (needs easyocr models) OCR time is reported too.
+
+    python -m benchmarks.ocr_frame_cache --ocr
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from app.gemini.frame_cache import FrameTextCache
+from app.gemini.ocr_service import OCRService
+from app.gemini.video_extraction import stream_prepared_frames
+from benchmarks.common import emit, load_mocktest
+from benchmarks.video_synth import write_scroll_video
+
+RECORDINGS = [
+    {"name": "original", "fps": 30, "codec": "mp4v", "scroll_px_per_s": 600},
+    {"name": "same_settings", "fps": 30, "codec": "mp4v", "scroll_px_per_s": 600},
+    {"name": "25fps_mjpg", "fps": 25, "codec": "MJPG", "scroll_px_per_s": 600},
+    {"name": "slower_scroll", "fps": 30, "codec": "mp4v", "scroll_px_per_s": 450},
+]
+
+
+class CountingReader:
+    def __init__(self):
+        self.frames = 0
+
+    def readtext_batched(self, batch, detail=0, batch_size=1):
+        self.frames += len(batch)
+        return [[""] for _ in batch]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame OCR cache benchmark")
+    parser.add_argument("--size", type=str, default="1280x720")
+    parser.add_argument("--ocr", action="store_true", help="Run EasyOCR instead of a counting reader")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split("x"))
+    source = "\n\n".join(load_mocktest().values())
+    cache = FrameTextCache()
+    counting = CountingReader()
+    service = OCRService(cache=cache, reader_factory=None if args.ocr else (lambda languages, gpu: counting))
+    if args.ocr:
+        service.warm_up().join()
+
+    root = tempfile.mkdtemp(prefix="ocr_frame_cache_")
+    report = {"size": args.size, "radius": cache.radius, "runs": []}
+    try:
+        for spec in RECORDINGS:
+            ext = "avi" if spec["codec"] == "MJPG" else "mp4"
+            path = os.path.join(root, f"{spec['name']}.{ext}")
+            video = write_scroll_video(path, source, size=(width, height), fps=spec["fps"], codec=spec["codec"],
+                                       scroll_px_per_s=spec["scroll_px_per_s"], pause_s=1.5)
+            prepared = stream_prepared_frames(path, workers=1)
+
+            hits_before = cache.hits
+            start = time.perf_counter()
+            service.read_frames(prepared)
+            elapsed = time.perf_counter() - start
+            hits = cache.hits - hits_before
+            report["runs"].append({
+                **spec,
+                "seconds": video["seconds"],
+                "frames": len(prepared),
+                "cache_hits": hits,
+                "hit_rate": round(hits / len(prepared), 4) if prepared else 0.0,
+                "ocr_frames": len(prepared) - hits,
+                **({"ocr_s": round(elapsed, 3)} if args.ocr else {}),
+            })
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report["cache"] = cache.stats()
+    emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
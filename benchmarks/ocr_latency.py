@@ -0,0 +1,95 @@
+"""
+OCR fallback latency, cold vs warm.
+
+  - cold:  the old path, a new easyocr.Reader per request (model load) and
+           one readtext call per frame
+  - warm:  the shared OCRService, models loaded once before the first
+           request, frames read with readtext_batched
+
+Frames are the prepared (text-cropped JPEG) frames of a synthetic scroll
+recording, so sizes match what the fallback sees in production. Needs
+easyocr and its downloaded models.
+
+    python -m benchmarks.ocr_latency --requests 5 --batch-size 8
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from app.gemini.ocr_service import OCRService
+from app.gemini.video_extraction import stream_prepared_frames
+from benchmarks.common import emit, load_mocktest, percentile
+from benchmarks.video_synth import write_scroll_video
+
+
+def cold_request(prepared, languages):
+    import easyocr
+
+    reader = easyocr.Reader(languages, gpu=False, verbose=False)
+    texts = []
+    for part in prepared:
+        img = cv2.imdecode(np.frombuffer(part["data"], np.uint8), cv2.IMREAD_COLOR)
+        texts.append(" ".join(reader.readtext(img, detail=0)))
+    return texts
+
+
+def summarize(latencies):
+    return {
+        "requests": len(latencies),
+        "mean_s": round(statistics.mean(latencies), 3),
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR fallback latency benchmark")
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=20.0, help="Length of the synthetic recording")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="ocr_latency_")
+    try:
+        path = os.path.join(root, "scroll.mp4")
+        video = write_scroll_video(path, "\n\n".join(load_mocktest().values()), seconds=args.seconds)
+        prepared = stream_prepared_frames(path, workers=1)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {"video": video, "frames": len(prepared), "batch_size": args.batch_size}
+
+    cold = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        cold_texts = cold_request(prepared, ["en"])
+        cold.append(time.perf_counter() - start)
+    report["cold"] = summarize(cold)
+
+    service = OCRService(languages=["en"], batch_size=args.batch_size)
+    start = time.perf_counter()
+    service.warm_up().join()
+    report["warm_up_s"] = round(time.perf_counter() - start, 3)
+
+    warm = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        warm_texts = service.read_frames(prepared)
+        warm.append(time.perf_counter() - start)
+    report["warm"] = summarize(warm)
+    report["speedup_p50"] = round(report["cold"]["p50_s"] / report["warm"]["p50_s"], 2)
+    # Batching pads frames; the text read back should be the same
+    report["same_text"] = [t.split() for t in cold_texts] == [t.split() for t in warm_texts]
+
+    emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
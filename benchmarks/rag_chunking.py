@@ -0,0 +1,114 @@
+"""
+Chunking benchmark: throughput on a large synthetic file and retrieval
+recall on the MockTest corpus, legacy word windows vs the sentence-aware
+streaming chunker.
+
+    python -m benchmarks.rag_chunking --size-mb 50 --max-tokens 64
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Iterable, List
+
+import numpy as np
+
+from app.rag.chunking import estimate_tokens, iter_chunks
+from benchmarks.common import bullet_lines, emit, hashed_embedding, load_mocktest
+
+
+def legacy_chunk_text(text: str, chunk_size: int = 500) -> Iterable[str]:
+    """The original `ingest.chunk_text`: fixed word windows, no overlap."""
+    words = text.split()
+    for i in range(0, len(words), chunk_size):
+        yield " ".join(words[i : i + chunk_size])
+
+
+def _corpus_text() -> str:
+    return "\n\n".join(load_mocktest().values())
+
+
+def bench_throughput(size_mb: int, max_tokens: int, overlap: int) -> dict:
+    seed = _corpus_text() + "\n\n"
+    repeats = max(1, (size_mb * 1024 * 1024) // len(seed))
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as tmp:
+        for _ in range(repeats):
+            tmp.write(seed)
+        path = tmp.name
+
+    try:
+        size = os.path.getsize(path) / (1024 * 1024)
+
+        start = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            streamed = sum(1 for _ in iter_chunks(f, max_tokens=max_tokens, overlap_tokens=overlap))
+        streaming_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            legacy = sum(1 for _ in legacy_chunk_text(f.read(), chunk_size=max_tokens))
+        legacy_s = time.perf_counter() - start
+    finally:
+        os.remove(path)
+
+    return {
+        "input_mb": round(size, 2),
+        "streaming": {"chunks": streamed, "seconds": round(streaming_s, 3), "mb_per_s": round(size / streaming_s, 2)},
+        "legacy": {"chunks": legacy, "seconds": round(legacy_s, 3), "mb_per_s": round(size / legacy_s, 2)},
+    }
+
+
+def _recall(chunks: List[str], queries: List[str], k: int) -> dict:
+    matrix = np.stack([hashed_embedding(c) for c in chunks])
+    hits = 0
+    for query in queries:
+        scores = matrix @ hashed_embedding(query)
+        top = np.argsort(-scores)[:k]
+        # A hit needs the whole requirement line intact in a retrieved chunk
+        if any(query in chunks[i] for i in top):
+            hits += 1
+    return {
+        "chunks": len(chunks),
+        "avg_chunk_tokens": round(float(np.mean([estimate_tokens(c) for c in chunks])), 1),
+        f"recall@{k}": round(hits / len(queries), 3),
+    }
+
+
+def bench_recall(max_tokens: int, overlap: int, k: int) -> dict:
+    docs = load_mocktest()
+    text = _corpus_text()
+    queries = [q for body in docs.values() for q in bullet_lines(body)]
+
+    sentence_chunks = [
+        c.text for c in iter_chunks([text], max_tokens=max_tokens, overlap_tokens=overlap)
+    ]
+    legacy_chunks = list(legacy_chunk_text(text, chunk_size=max_tokens))
+
+    return {
+        "queries": len(queries),
+        "sentence_aware": _recall(sentence_chunks, queries, k),
+        "legacy": _recall(legacy_chunks, queries, k),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG chunking benchmark")
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--max-tokens", type=int, default=64)
+    parser.add_argument("--overlap", type=int, default=16)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    emit(
+        {
+            "throughput": bench_throughput(args.size_mb, args.max_tokens, args.overlap),
+            "recall": bench_recall(args.max_tokens, args.overlap, args.k),
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
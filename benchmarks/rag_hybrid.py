@@ -0,0 +1,153 @@
+"""
+Hybrid retrieval benchmark: recall and latency of vector-only, BM25-only
+and RRF-fused search over the MockTest corpus (resumes and JDs, with the
+Markdown process docs as distractors), chunked per file.
+
+Two query sets:
+  - requirement: every `- ...` line; relevant = chunks containing it
+  - skill:       single skill tokens ("fastapi", "kubernetes", ...) that
+                 occur in a few chunks; relevant = those chunks
+
+Embeddings are the feature-hashed stand-in from benchmarks.common, so
+vector recall here is a lower bound on what Gemini embeddings achieve;
+`--dims` controls how many hash collisions it suffers. Latency is
+measured on the corpus replicated `--replicas` times.
+
+    python -m benchmarks.rag_hybrid --k 3 --replicas 200
+"""
+import argparse
+import asyncio
+import time
+from typing import Callable, Dict, List
+
+from app.rag.chunking import chunk_text
+from app.rag.hybrid import hybrid_search
+from app.rag.lexical import BM25Index, tokenize
+from app.rag.local_vector import LocalVectorStore
+from benchmarks.common import bullet_lines, emit, hashed_embedding, load_mocktest, percentile
+
+SKILL_MAX_CHUNKS = 3
+
+
+def _build(chunks: List[str], dims: int, replicas: int = 1):
+    store, index = LocalVectorStore(), BM25Index()
+    docs = [
+        {
+            "_id": f"{r}:{i}",
+            "text": text,
+            "embedding": hashed_embedding(text, dims).tolist(),
+            "metadata": {"source": "mocktest"},
+        }
+        for r in range(replicas)
+        for i, text in enumerate(chunks)
+    ]
+    asyncio.run(store.upsert_many(docs))
+    index.add_many(docs)
+    return store, index
+
+
+def _query_sets(chunks: List[str]) -> Dict[str, List[tuple]]:
+    requirements = []
+    for body in load_mocktest().values():
+        for line in bullet_lines(body):
+            relevant = {f"0:{i}" for i, c in enumerate(chunks) if line in c}
+            if relevant:
+                requirements.append((line, relevant))
+
+    chunk_terms = [set(tokenize(c)) for c in chunks]
+    skills = []
+    for term in sorted(set().union(*chunk_terms)):
+        if len(term) < 3 or term.isdigit():
+            continue
+        relevant = {f"0:{i}" for i, terms in enumerate(chunk_terms) if term in terms}
+        if 0 < len(relevant) <= SKILL_MAX_CHUNKS:
+            skills.append((term, relevant))
+
+    return {"requirement": requirements, "skill": skills}
+
+
+def _retrievers(store: LocalVectorStore, index: BM25Index, dims: int) -> Dict[str, Callable]:
+    async def vector(q, k):
+        return await store.search(hashed_embedding(q, dims).tolist(), top_k=k)
+
+    async def bm25(q, k):
+        return index.search(q, k)
+
+    async def hybrid(q, k):
+        return await hybrid_search(q, hashed_embedding(q, dims).tolist(), top_k=k, store=store, index=index)
+
+    return {"vector": vector, "bm25": bm25, "hybrid": hybrid}
+
+
+def bench_recall(chunks: List[str], dims: int, k: int) -> dict:
+    store, index = _build(chunks, dims)
+    retrievers = _retrievers(store, index, dims)
+    report = {}
+
+    for set_name, queries in _query_sets(chunks).items():
+        report[set_name] = {"queries": len(queries)}
+        for name, fn in retrievers.items():
+            recall, rr = 0.0, 0.0
+            for query, relevant in queries:
+                ids = [str(r["_id"]) for r in asyncio.run(fn(query, k))]
+                recall += len(relevant.intersection(ids)) / min(len(relevant), k)
+                rank = next((i for i, doc_id in enumerate(ids, 1) if doc_id in relevant), None)
+                rr += 1.0 / rank if rank else 0.0
+            report[set_name][name] = {
+                f"recall@{k}": round(recall / len(queries), 3),
+                "mrr": round(rr / len(queries), 3),
+            }
+    return report
+
+
+def bench_latency(chunks: List[str], dims: int, k: int, replicas: int) -> dict:
+    store, index = _build(chunks, dims, replicas)
+    queries = [q for q, _ in _query_sets(chunks)["requirement"]]
+    report = {"documents": len(store)}
+
+    async def run(fn) -> List[float]:
+        await fn(queries[0], k)  # warm-up (matrix build)
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            await fn(query, k)
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    for name, fn in _retrievers(store, index, dims).items():
+        timings = asyncio.run(run(fn))
+        report[name] = {
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hybrid retrieval benchmark")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--max-tokens", type=int, default=32)
+    parser.add_argument("--dims", type=int, default=256, help="Hashed embedding dimensions")
+    parser.add_argument("--replicas", type=int, default=200, help="Corpus copies for the latency run")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    chunks = [
+        c.text
+        for pattern in ("*.txt", "*.md")
+        for body in load_mocktest(pattern).values()
+        for c in chunk_text(body, max_tokens=args.max_tokens, overlap_tokens=0)
+    ]
+
+    emit(
+        {
+            "chunks": len(chunks),
+            "recall": bench_recall(chunks, args.dims, args.k),
+            "latency": bench_latency(chunks, args.dims, args.k, args.replicas),
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Quantization benchmark: memory, latency and recall@k of int8 and binary
+vectors (with float32 rescoring) against the float baseline.
+
+Vectors are synthetic but clustered, like real embeddings of a corpus
+of related documents; queries are held-out points from the same
+clusters. Memory is reported per million vectors for the index held in
+RAM (the float matrix, or the compact matrix when quantized), for the
+memory-mapped float32 rows quantized modes rescore from (on disk, read
+for the shortlist only), and for the BSON stored in the `vectors`
+collection.
+
+    python -m benchmarks.rag_quantization --n 100000 --dims 768 --k 10
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+import bson
+import numpy as np
+
+from app.rag.local_vector import LocalVectorStore
+from app.rag.quantization import encode_document
+from benchmarks.common import emit, percentile
+
+MILLION = 1_000_000
+
+
+def synthetic_embeddings(n: int, dims: int, clusters: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dims)).astype(np.float32)
+    labels = rng.integers(0, clusters, n)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((n, dims)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def bson_bytes_per_vector(dims: int) -> Dict[str, int]:
+    """Size of the embedding fields of one stored document, per layout."""
+    vector = np.random.default_rng(0).standard_normal(dims).astype(np.float32)
+    empty = len(bson.encode({"_id": "x"}))
+    sizes = {"none": len(bson.encode({"_id": "x", "embedding": vector.tolist()})) - empty}
+    for mode in ("int8", "binary"):
+        doc = encode_document({"_id": "x", "embedding": vector.tolist()}, mode)
+        sizes[mode] = len(bson.encode(doc)) - empty
+    return sizes
+
+
+def _build(vectors: np.ndarray, mode: str, multiplier: int) -> LocalVectorStore:
+    store = LocalVectorStore(quantization=mode, rescore_multiplier=multiplier)
+    docs = [{"_id": str(i), "text": "", "embedding": row} for i, row in enumerate(vectors)]
+    asyncio.run(store.upsert_many(docs))
+    store.index_bytes()  # builds the matrices outside the timed section
+    return store
+
+
+def _run(store: LocalVectorStore, queries: np.ndarray, k: int):
+    async def go():
+        ids, timings = [], []
+        for query in queries:
+            start = time.perf_counter()
+            results = await store.search(query, top_k=k)
+            timings.append((time.perf_counter() - start) * 1000)
+            ids.append([r["_id"] for r in results])
+        return ids, timings
+
+    return asyncio.run(go())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector quantization benchmark")
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--multipliers", type=str, default="1,4,10", help="Rescore multipliers to try")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    data = synthetic_embeddings(args.n + args.queries, args.dims, args.clusters)
+    vectors, queries = data[: args.n], data[args.n :]
+
+    baseline = _build(vectors, "none", 1)
+    truth, float_timings = _run(baseline, queries, args.k)
+    bson_sizes = bson_bytes_per_vector(args.dims)
+
+    report = {
+        "vectors": args.n,
+        "dims": args.dims,
+        "k": args.k,
+        "none": {
+            "index_mb_per_million": round(baseline.index_bytes() / args.n * MILLION / 2**20, 1),
+            "bson_mb_per_million": round(bson_sizes["none"] * MILLION / 2**20, 1),
+            "p50_ms": round(percentile(float_timings, 50), 3),
+            "p95_ms": round(percentile(float_timings, 95), 3),
+        },
+    }
+    del baseline
+
+    for mode in ("int8", "binary"):
+        entry = {"bson_mb_per_million": round(bson_sizes[mode] * MILLION / 2**20, 1)}
+        for multiplier in (int(m) for m in args.multipliers.split(",")):
+            store = _build(vectors, mode, multiplier)
+            entry["index_mb_per_million"] = round(store.index_bytes() / args.n * MILLION / 2**20, 1)
+            entry["rescore_mmap_mb_per_million"] = round(store.rescore_bytes() / args.n * MILLION / 2**20, 1)
+            ids, timings = _run(store, queries, args.k)
+            recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(ids, truth)])
+            entry[f"rescore_x{multiplier}"] = {
+                f"recall@{args.k}": round(float(recall), 4),
+                "p50_ms": round(percentile(timings, 50), 3),
+                "p95_ms": round(percentile(timings, 95), 3),
+            }
+            del store
+        report[mode] = entry
+
+    emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Retrieval benchmark suite: ingest the MockTest JDs and candidate files
+plus a synthetic scaled-up corpus into a backend, run a fixed query set,
+and report quality and speed as JSON.
+
+Backends:
+  - local: LocalVectorStore + BM25Index in process (honours
+           --quantization, so int8/binary can be compared directly)
+  - mongo: app.rag.mongo_vector against MONGO_URI. Needs $vectorSearch,
+           i.e. Atlas or the `mongodb/mongodb-atlas-local` image, and a
+           scratch collection: run with MONGO_COLLECTION=bench_vectors
+           and create the index first (cli_ingest --ensure-index, with
+           EMBEDDING_DIMENSIONS matching --dims).
+
+Ingestion goes through the real IngestionPipeline (chunking, batching,
+bulk writes) with hashed embeddings in place of Gemini, so the numbers
+isolate chunking, indexing and search. The query set is every `- ...`
+requirement line in the MockTest .txt files; a chunk is relevant when it
+comes from a MockTest file and contains the line. Synthetic documents
+never contain those lines, they only add volume.
+
+    python -m benchmarks.retrieval_suite --synthetic-docs 5000 --k 5
+    python -m benchmarks.retrieval_suite --quantization int8 --output int8.json
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+from app.rag.chunking import DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS
+from app.rag.hybrid import hybrid_search
+from app.rag.lexical import BM25Index
+from app.rag.local_vector import LocalVectorStore
+from app.rag.pipeline import IngestionPipeline
+from benchmarks.common import MOCKTEST_DIR, bullet_lines, emit, hashed_embedding, load_mocktest, percentile
+
+SYNTHETIC_SKILLS = [
+    "Golang", "Rust", "Scala", "Terraform", "Ansible", "Kafka", "Flink", "Snowflake",
+    "Tableau", "Figma", "Swift", "Kotlin", "Unity", "Solidity", "SAP", "Salesforce",
+    "Jenkins", "Prometheus", "Grafana", "Elasticsearch", "Cassandra", "Redis", "GraphQL",
+]
+SYNTHETIC_SENTENCES = [
+    "Led a team of {n} engineers delivering {skill} platforms for enterprise clients.",
+    "Reduced infrastructure cost by {n} percent through {skill} automation.",
+    "Designed {skill} integrations consumed by {n} internal services.",
+    "Mentored junior staff and ran weekly {skill} knowledge sessions.",
+    "Owned on-call rotation for {skill} systems serving {n} thousand users.",
+    "Migrated legacy workloads to {skill} with zero downtime.",
+]
+
+
+# -------------------------------------------------------------------
+# Corpus
+# -------------------------------------------------------------------
+def write_corpus(root: str, synthetic_docs: int, seed: int) -> List[str]:
+    """MockTest .txt files plus deterministic synthetic resumes; returns paths."""
+    paths = []
+    for name, body in load_mocktest().items():
+        path = os.path.join(root, f"mocktest_{name}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body)
+        paths.append(path)
+
+    rng = random.Random(seed)
+    for i in range(synthetic_docs):
+        skills = rng.sample(SYNTHETIC_SKILLS, 4)
+        lines = [f"Candidate Name: Synthetic {i}", "Skills:", *(f"- {s}" for s in skills), "Experience:"]
+        for _ in range(rng.randint(4, 12)):
+            lines.append("- " + rng.choice(SYNTHETIC_SENTENCES).format(
+                n=rng.randint(2, 40), skill=rng.choice(skills)
+            ))
+        path = os.path.join(root, f"synthetic_{i:06d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        paths.append(path)
+    return paths
+
+
+def query_set() -> List[str]:
+    return [line for body in load_mocktest().values() for line in bullet_lines(body)]
+
+
+def relevance(queries: List[str], chunks: Dict[str, Tuple[str, str]]) -> Dict[str, Set[str]]:
+    """query -> ids of MockTest chunks containing it."""
+    mocktest = {cid: text for cid, (source, text) in chunks.items() if "mocktest_" in source}
+    return {q: {cid for cid, text in mocktest.items() if q in text} for q in queries}
+
+
+# -------------------------------------------------------------------
+# Backends
+# -------------------------------------------------------------------
+class LocalBackend:
+    name = "local"
+
+    def __init__(self, quantization: str):
+        self.store = LocalVectorStore(quantization=quantization)
+        self.index = BM25Index()
+
+    async def write(self, documents: List[Dict[str, Any]]):
+        self.index.add_many(documents)
+        await self.store.upsert_many(documents)
+
+    async def finish(self):
+        self.store.index_bytes()  # build the matrix outside the timed queries
+
+    async def search(self, mode: str, query: str, embedding: List[float], k: int):
+        if mode == "vector":
+            return await self.store.search(embedding, top_k=k)
+        if mode == "bm25":
+            return self.index.search(query, k)
+        return await hybrid_search(query, embedding, top_k=k, store=self.store, index=self.index)
+
+    async def cleanup(self, ids: List[str]):
+        pass
+
+
+class MongoBackend:
+    name = "mongo"
+
+    def __init__(self):
+        from app.rag import mongo_vector
+        if mongo_vector.COLLECTION_NAME == "vectors":
+            raise SystemExit("Refusing to benchmark against the live `vectors` collection; set MONGO_COLLECTION")
+        self.mongo_vector = mongo_vector
+
+    async def write(self, documents: List[Dict[str, Any]]):
+        await self.mongo_vector.upsert_many(documents)
+
+    async def finish(self):
+        from app.rag.hybrid import refresh_lexical_index
+        await refresh_lexical_index(force=True)
+
+    async def search(self, mode: str, query: str, embedding: List[float], k: int):
+        if mode == "vector":
+            return await self.mongo_vector.search(embedding, top_k=k)
+        if mode == "bm25":
+            from app.rag.lexical import lexical_index
+            return lexical_index.search(query, k)
+        return await hybrid_search(query, embedding, top_k=k)
+
+    async def cleanup(self, ids: List[str]):
+        await self.mongo_vector.delete_many(ids)
+
+
+# -------------------------------------------------------------------
+# Runs
+# -------------------------------------------------------------------
+async def ingest(backend, paths: List[str], args) -> Tuple[dict, Dict[str, Tuple[str, str]]]:
+    chunks: Dict[str, Tuple[str, str]] = {}
+
+    async def embed_fn(texts: List[str]) -> List[List[float]]:
+        return [hashed_embedding(t, args.dims).tolist() for t in texts]
+
+    async def write_fn(documents: List[Dict[str, Any]]):
+        for d in documents:
+            chunks[d["_id"]] = (d["metadata"]["source"], d["text"])
+        await backend.write(documents)
+
+    pipeline = IngestionPipeline(
+        embed_fn=embed_fn,
+        write_fn=write_fn,
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        progress_interval=3600,
+    )
+    size_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+    start = time.perf_counter()
+    stats = await pipeline.run(paths)
+    await backend.finish()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "files": stats.files_done,
+        "chunks": stats.chunks_written,
+        "input_mb": round(size_mb, 2),
+        "seconds": round(elapsed, 3),
+        "chunks_per_s": round(stats.chunks_written / elapsed, 1),
+        "mb_per_s": round(size_mb / elapsed, 2),
+    }, chunks
+
+
+async def evaluate(backend, mode: str, queries: List[str], relevant: Dict[str, Set[str]], args) -> dict:
+    recall, rr, timings = 0.0, 0.0, []
+    scored = [q for q in queries if relevant[q]]
+    for query in scored:
+        embedding = hashed_embedding(query, args.dims).tolist()
+        start = time.perf_counter()
+        results = await backend.search(mode, query, embedding, args.k)
+        timings.append((time.perf_counter() - start) * 1000)
+
+        ids = [str(r["_id"]) for r in results]
+        recall += len(relevant[query].intersection(ids)) / min(len(relevant[query]), args.k)
+        rank = next((i for i, doc_id in enumerate(ids, 1) if doc_id in relevant[query]), None)
+        rr += 1.0 / rank if rank else 0.0
+
+    return {
+        "queries": len(scored),
+        f"recall@{args.k}": round(recall / len(scored), 4),
+        "mrr": round(rr / len(scored), 4),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+    }
+
+
+async def run(args) -> dict:
+    backend = LocalBackend(args.quantization) if args.backend == "local" else MongoBackend()
+    root = tempfile.mkdtemp(prefix="retrieval_suite_")
+    try:
+        paths = write_corpus(root, args.synthetic_docs, args.seed)
+        ingest_report, chunks = await ingest(backend, paths, args)
+        queries = query_set()
+        relevant = relevance(queries, chunks)
+
+        report = {
+            "config": {
+                "backend": backend.name,
+                "quantization": args.quantization if args.backend == "local" else os.getenv("VECTOR_QUANTIZATION", "none"),
+                "chunk_size": args.chunk_size,
+                "overlap": args.overlap,
+                "dims": args.dims,
+                "k": args.k,
+                "synthetic_docs": args.synthetic_docs,
+                "mocktest_dir": MOCKTEST_DIR,
+            },
+            "ingest": ingest_report,
+            "search": {},
+        }
+        for mode in args.modes.split(","):
+            report["search"][mode] = await evaluate(backend, mode, queries, relevant, args)
+
+        await backend.cleanup(list(chunks))
+        return report
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieval benchmark suite")
+    parser.add_argument("--backend", choices=("local", "mongo"), default="local")
+    parser.add_argument("--quantization", choices=("none", "int8", "binary"), default="none",
+                        help="Local backend only; the mongo backend follows VECTOR_QUANTIZATION")
+    parser.add_argument("--synthetic-docs", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_MAX_TOKENS)
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP_TOKENS)
+    parser.add_argument("--dims", type=int, default=256, help="Hashed embedding dimensions")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--modes", type=str, default="vector,bm25,hybrid")
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    emit(asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Frame dedupe benchmark on synthetic scroll recordings that scroll down,
+pause on every screen, and scroll back up.
+
+  - last_frame: the old rule, compare with the last kept hash only
+  - global:     compare with every kept hash (BK-tree)
+  - gated:      global, with scene-change gating before hashing
+
+Reports frames kept / sampled, frames actually hashed, and per-frame time.
+
+    python -m benchmarks.video_dedupe --size 1920x1080 --speeds 300 600 1200
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from app.gemini.hash_index import BKTree
+from app.gemini.phash import hamming, phash_frames
+from app.gemini.video_extraction import DEDUPE_THRESHOLD, dedupe_with_hashes, extract_raw_frames, scene_gate
+from benchmarks.common import emit, load_mocktest
+from benchmarks.video_synth import write_scroll_video
+
+
+def last_frame(frames, threshold=DEDUPE_THRESHOLD):
+    kept, last = [], None
+    for f, h in zip(frames, phash_frames(frames)):
+        if last is None or hamming(h, last) > threshold:
+            kept.append(f)
+            last = h
+    return kept, len(frames)
+
+
+def global_index(frames):
+    return [f for f, _ in dedupe_with_hashes(frames, index=BKTree())], len(frames)
+
+
+def gated(frames):
+    passed = list(scene_gate(frames))
+    return [f for f, _ in dedupe_with_hashes(passed, index=BKTree())], len(passed)
+
+
+MODES = {"last_frame": last_frame, "global": global_index, "gated": gated}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame dedupe benchmark")
+    parser.add_argument("--size", type=str, default="1280x720")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--speeds", type=float, nargs="+", default=[300, 600, 1200], help="Scroll speed, px/s")
+    parser.add_argument("--pause-s", type=float, default=2.0)
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split("x"))
+    text = "\n\n".join(load_mocktest().values())
+    root = tempfile.mkdtemp(prefix="video_dedupe_")
+    report = {"size": args.size, "fps": args.fps, "threshold": DEDUPE_THRESHOLD, "runs": []}
+    try:
+        for speed in args.speeds:
+            path = os.path.join(root, f"scroll_{int(speed)}.mp4")
+            video = write_scroll_video(path, text, size=(width, height), fps=args.fps,
+                                       scroll_px_per_s=speed, pause_s=args.pause_s, scroll_back=True)
+            frames = list(extract_raw_frames(path))
+            run = {"scroll_px_per_s": speed, **video, "sampled": len(frames)}
+            for name, dedupe in MODES.items():
+                start = time.perf_counter()
+                kept, hashed = dedupe(frames)
+                elapsed = time.perf_counter() - start
+                run[name] = {
+                    "kept": len(kept),
+                    "kept_ratio": round(len(kept) / len(frames), 3),
+                    "hashed": hashed,
+                    "ms_per_frame": round(elapsed * 1000 / len(frames), 3),
+                }
+            report["runs"].append(run)
+            del frames
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
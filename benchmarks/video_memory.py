@@ -0,0 +1,146 @@
+"""
+Video pipeline memory benchmark: peak RSS against video length for the
+old list-based extract -> dedupe -> encode chain and the streaming one.
+
+Each measurement runs in a fresh process; a sampler thread polls the
+resident set size (/proc/self/statm, Linux) and the report gives the peak
+growth over the baseline taken after imports, plus the absolute peak.
+
+    python -m benchmarks.video_memory --size 1920x1080 --minutes 0.5 1 2 5
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import cv2
+import imagehash
+from PIL import Image
+
+from app.gemini.video_extraction import MAX_VIDEO_FRAMES, stream_prepared_frames
+from benchmarks.common import emit, load_mocktest
+from benchmarks.video_synth import write_scroll_video
+
+
+PAGE_MB = os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE_MB
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, interval: float = 0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = _rss_mb()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            self.peak = max(self.peak, _rss_mb())
+            time.sleep(self.interval)
+
+    def stop(self) -> float:
+        self._done.set()
+        self.join()
+        return max(self.peak, _rss_mb())
+
+
+def legacy_pipeline(path: str, interval_ms: int = 300) -> list:
+    """The previous chain: every stage materializes a full list."""
+    frames = []
+    cap = cv2.VideoCapture(path)
+    last = -interval_ms
+    ok, img = cap.read()
+    while ok:
+        t = cap.get(cv2.CAP_PROP_POS_MSEC)
+        if t - last >= interval_ms:
+            frames.append(img.copy())
+            last = t
+        ok, img = cap.read()
+    cap.release()
+
+    unique, last_hash = [], None
+    for f in frames:
+        h = imagehash.phash(Image.fromarray(cv2.cvtColor(f, cv2.COLOR_BGR2RGB)))
+        if last_hash is None or abs(h - last_hash) > 5:
+            unique.append(f)
+            last_hash = h
+
+    prepared = []
+    for f in unique:
+        _, buf = cv2.imencode(".jpg", f)
+        prepared.append({"mime_type": "image/jpeg", "data": buf.tobytes()})
+    return prepared
+
+
+def _measure(mode: str, path: str, max_frames: int, queue):
+    baseline = _rss_mb()
+    sampler = RssSampler()
+    sampler.start()
+    start = time.perf_counter()
+    stats = {}
+    if mode == "legacy":
+        prepared = legacy_pipeline(path)
+    else:
+        prepared = stream_prepared_frames(path, max_frames=max_frames, stats=stats)
+    seconds = time.perf_counter() - start
+    peak = sampler.stop()
+    queue.put({
+        "peak_rss_mb": round(peak, 1),
+        "peak_rss_growth_mb": round(peak - baseline, 1),
+        "seconds": round(seconds, 2),
+        "frames_sent": len(prepared),
+        "bytes_sent": sum(len(p["data"]) for p in prepared),
+        **stats,
+    })
+
+
+def measure(mode: str, path: str, max_frames: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(mode, path, max_frames, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Video pipeline memory benchmark")
+    parser.add_argument("--size", type=str, default="1920x1080")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[0.5, 1, 2])
+    parser.add_argument("--max-frames", type=int, default=MAX_VIDEO_FRAMES)
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split("x"))
+    text = "\n\n".join(load_mocktest().values())
+    root = tempfile.mkdtemp(prefix="video_memory_")
+    report = {"size": args.size, "fps": args.fps, "max_frames": args.max_frames, "runs": []}
+    try:
+        for minutes in args.minutes:
+            path = os.path.join(root, f"scroll_{minutes}.mp4")
+            video = write_scroll_video(path, text, size=size, fps=args.fps, pause_s=2.0,
+                                       scroll_back=True, seconds=minutes * 60)
+            report["runs"].append({
+                "minutes": minutes,
+                **video,
+                "legacy": measure("legacy", path, args.max_frames),
+                "streaming": measure("streaming", path, args.max_frames),
+            })
+            os.remove(path)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Frame hashing and multi-core video benchmark.
+
+  - dedupe: the old per-frame PIL + imagehash.phash loop against the
+    batched NumPy DCT hash, on the same sampled frames
+  - pipeline: stream_prepared_frames wall time with 1..N pool workers,
+    plus event-loop lag while it runs off-loop (asyncio.to_thread), as
+    the API does
+
+    python -m benchmarks.video_parallel --size 1920x1080 --minutes 3 --workers 1 2 4 8
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+import cv2
+import imagehash
+from PIL import Image
+
+from app.gemini import frame_pool
+from app.gemini.video_extraction import dedupe_frames, extract_raw_frames, stream_prepared_frames
+from benchmarks.common import emit, load_mocktest, percentile
+from benchmarks.video_synth import write_scroll_video
+
+TICK_SECONDS = 0.005
+
+
+def legacy_dedupe(frames, threshold=5):
+    unique, last_hash = [], None
+    for f in frames:
+        h = imagehash.phash(Image.fromarray(cv2.cvtColor(f, cv2.COLOR_BGR2RGB)))
+        if last_hash is None or abs(h - last_hash) > threshold:
+            unique.append(f)
+            last_hash = h
+    return unique
+
+
+async def _timed_pipeline(path: str, workers: int) -> dict:
+    loop = asyncio.get_running_loop()
+    lags = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        while not stop.is_set():
+            expected = loop.time() + TICK_SECONDS
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(max(0.0, loop.time() - expected) * 1000)
+
+    task = asyncio.create_task(ticker())
+    stats = {}
+    start = time.perf_counter()
+    await asyncio.to_thread(stream_prepared_frames, path, workers=workers, stats=stats)
+    seconds = time.perf_counter() - start
+    stop.set()
+    await task
+    return {
+        "seconds": round(seconds, 2),
+        "segments": stats["segments"],
+        "sampled": stats["sampled"],
+        "sent": stats["sent"],
+        "loop_lag_p99_ms": round(percentile(lags, 99), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame hashing / multi-core benchmark")
+    parser.add_argument("--size", type=str, default="1920x1080")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--minutes", type=float, default=2)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split("x"))
+    root = tempfile.mkdtemp(prefix="video_parallel_")
+    report = {"size": args.size, "cpus": os.cpu_count()}
+    try:
+        path = os.path.join(root, "scroll.mp4")
+        report["video"] = write_scroll_video(path, "\n\n".join(load_mocktest().values()), size=(width, height),
+                                             fps=args.fps, pause_s=2.0, scroll_back=True,
+                                             seconds=args.minutes * 60)
+
+        frames = list(extract_raw_frames(path))
+        start = time.perf_counter()
+        legacy = legacy_dedupe(frames)
+        legacy_s = time.perf_counter() - start
+        start = time.perf_counter()
+        batched = list(dedupe_frames(frames))
+        batched_s = time.perf_counter() - start
+        report["dedupe"] = {
+            "frames": len(frames),
+            "legacy_ms_per_frame": round(legacy_s * 1000 / len(frames), 3),
+            "batched_ms_per_frame": round(batched_s * 1000 / len(frames), 3),
+            "legacy_kept": len(legacy),
+            "batched_kept": len(batched),
+        }
+        del frames, legacy, batched
+
+        report["pipeline"] = {}
+        for workers in args.workers:
+            report["pipeline"][str(workers)] = asyncio.run(_timed_pipeline(path, workers))
+    finally:
+        frame_pool.shutdown()
+        shutil.rmtree(root, ignore_errors=True)
+
+    emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
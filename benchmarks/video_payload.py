@@ -0,0 +1,119 @@
+"""
+Vision payload benchmark: bytes sent to Gemini Vision per video with the
+old full-frame JPEGs against text-cropped, text-height-scaled frames
+fitted to the request byte budget.
+
+The same sampled/deduplicated frames feed both preparations. Accuracy:
+  - ink_retained: share of dark (text) pixels of each frame that fall
+    inside the crop, i.e. nothing readable was cut off
+  - word_recall (with --ocr, needs easyocr and its models): share of the
+    source words EasyOCR reads back from the prepared frames
+
+    python -m benchmarks.video_payload --sizes 1280x720 1920x1080 3840x2160 --ocr
+"""
+import argparse
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from app.gemini.frame_prep import PAYLOAD_BUDGET_BYTES, detect_text, fit_to_budget
+from app.gemini.video_extraction import MAX_VIDEO_FRAMES, cap_frames, dedupe_frames, extract_raw_frames, prepare_frames
+from benchmarks.common import emit, load_mocktest
+from benchmarks.video_synth import write_scroll_video
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#]{2,}")
+INK_LEVEL = 128
+
+
+def ink_retained(frames) -> float:
+    kept = total = 0
+    for f in frames:
+        ink = cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) < INK_LEVEL
+        total += int(ink.sum())
+        bbox, _ = detect_text(f)
+        if bbox is not None:
+            x0, y0, x1, y1 = bbox
+            kept += int(ink[y0:y1, x0:x1].sum())
+    return kept / total if total else 1.0
+
+
+def word_recall(reader, prepared, source: str) -> float:
+    read = set()
+    for part in prepared:
+        img = cv2.imdecode(np.frombuffer(part["data"], np.uint8), cv2.IMREAD_COLOR)
+        read.update(WORD_RE.findall(" ".join(reader.readtext(img, detail=0)).lower()))
+    expected = set(WORD_RE.findall(source.lower()))
+    return len(expected & read) / len(expected) if expected else 0.0
+
+
+def summarize(prepared, seconds: float) -> dict:
+    sizes = [len(p["data"]) for p in prepared]
+    return {
+        "frames": len(prepared),
+        "bytes": sum(sizes),
+        "kb_per_frame": round(sum(sizes) / len(sizes) / 1024, 1) if sizes else 0.0,
+        "prepare_ms": round(seconds * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vision payload benchmark")
+    parser.add_argument("--sizes", type=str, nargs="+", default=["1280x720", "1920x1080"])
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--budget-kb", type=int, default=PAYLOAD_BUDGET_BYTES // 1024)
+    parser.add_argument("--max-frames", type=int, default=MAX_VIDEO_FRAMES)
+    parser.add_argument("--ocr", action="store_true", help="Also measure EasyOCR word recall")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    reader = None
+    if args.ocr:
+        import easyocr
+        reader = easyocr.Reader(["en"])
+
+    mocktest = load_mocktest()
+    source = "\n\n".join(mocktest.values())
+    root = tempfile.mkdtemp(prefix="video_payload_")
+    report = {"budget_kb": args.budget_kb, "max_frames": args.max_frames, "runs": []}
+    try:
+        for size in args.sizes:
+            width, height = (int(v) for v in size.split("x"))
+            path = os.path.join(root, f"scroll_{size}.mp4")
+            video = write_scroll_video(path, source, size=(width, height), fps=args.fps, pause_s=1.5)
+            frames = cap_frames(dedupe_frames(extract_raw_frames(path)), args.max_frames)
+
+            start = time.perf_counter()
+            legacy = [{"mime_type": "image/jpeg", "data": cv2.imencode(".jpg", f)[1].tobytes()} for f in frames]
+            legacy_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            budget = {}
+            prepared = fit_to_budget(list(prepare_frames(frames)), args.budget_kb * 1024, stats=budget)
+            prepared_s = time.perf_counter() - start
+
+            run = {
+                "size": size,
+                **video,
+                "legacy": summarize(legacy, legacy_s),
+                "prepared": {**summarize(prepared, prepared_s), "quality": budget["quality"],
+                             "budget_scale": budget["budget_scale"]},
+                "ink_retained": round(ink_retained(frames), 4),
+            }
+            run["bytes_saved_pct"] = round(100 * (1 - run["prepared"]["bytes"] / run["legacy"]["bytes"]), 1)
+            if reader is not None:
+                run["legacy"]["word_recall"] = round(word_recall(reader, legacy, source), 4)
+                run["prepared"]["word_recall"] = round(word_recall(reader, prepared, source), 4)
+            report["runs"].append(run)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+End-to-end offline benchmark of the video extraction pipeline on
+synthetic recordings of the MockTest JDs and resumes, over a grid of
+resolutions, frame rates and scroll speeds.
+
+Each recording runs sample -> scene gate -> hash dedupe -> crop/encode ->
+byte budget (-> OCR with --ocr) in a fresh process, and reports:
+  - frames in the file, decoded, sampled, hashed, kept, sent
+  - bytes per Gemini Vision request (single request and largest window)
+  - exclusive latency of every stage (time spent inside the stage's own
+    code, upstream stages subtracted)
+  - peak RSS and its growth over the post-import baseline
+  - with --ocr (needs easyocr models): OCR character accuracy, 1 - CER of
+    the OCR text (frames merged on their overlapping words) against the
+    rendered source text
+
+    python -m benchmarks.video_pipeline --sizes 1280x720 1920x1080 --fps 24 30 60 --speeds 300 900 --ocr
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import time
+from difflib import SequenceMatcher
+
+import numpy as np
+
+from app.gemini.frame_prep import PAYLOAD_BUDGET_BYTES, fit_to_budget
+from app.gemini.frame_sampler import SAMPLE_INTERVAL_MS, SamplingStats, sample_frames
+from app.gemini.video_extraction import (
+    MAX_VIDEO_FRAMES,
+    VISION_WINDOW_FRAMES,
+    VISION_WINDOW_OVERLAP,
+    cap_frames,
+    dedupe_with_hashes,
+    plan_windows,
+    prepare_frame,
+    scene_gate,
+)
+from benchmarks.common import emit
+from benchmarks.video_memory import RssSampler, _rss_mb
+from benchmarks.video_synth import document_text, mocktest_documents, write_scroll_video
+
+
+class StageClock:
+    """
+    Wraps the generator chain: each stage's cumulative time is measured
+    around its next() calls, so a stage's exclusive time is its cumulative
+    time minus that of the stage feeding it. Functions called outside the
+    chain (cap_frames' transform) are timed on their own with `call`.
+    """
+
+    def __init__(self):
+        self.cumulative = {}
+        self.order = []
+        self.calls = {}
+
+    def wrap(self, name, items):
+        # Registered here, not when the generator first runs: the last stage starts first
+        self.order.append(name)
+        self.cumulative[name] = 0.0
+        return self._timed(name, iter(items))
+
+    def _timed(self, name, iterator):
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.cumulative[name] += time.perf_counter() - start
+                return
+            self.cumulative[name] += time.perf_counter() - start
+            yield item
+
+    def call(self, name, fn):
+        self.calls[name] = 0.0
+
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self.calls[name] += time.perf_counter() - start
+
+        return timed
+
+    def exclusive_ms(self):
+        out, upstream = {}, 0.0
+        for name in self.order:
+            out[name] = round((self.cumulative[name] - upstream) * 1000, 1)
+            upstream = self.cumulative[name]
+        for name, seconds in self.calls.items():
+            out[name] = round(seconds * 1000, 1)
+        return out
+
+
+def normalize(text):
+    return " ".join(re.sub(r"[^a-z0-9+#]+", " ", text.lower()).split())
+
+
+def merge_overlapping(texts, min_words=3):
+    """Concatenate per-frame texts, dropping each frame's words that repeat the end of the previous ones."""
+    merged = []
+    for text in texts:
+        words = normalize(text).split()
+        tail = merged[-2 * len(words):] if words else []
+        match = SequenceMatcher(None, tail, words, autojunk=False).find_longest_match(0, len(tail), 0, len(words))
+        if match.size >= min_words and match.a + match.size == len(tail):
+            words = words[match.b + match.size:]
+        merged.extend(words)
+    return " ".join(merged)
+
+
+def levenshtein(a, b):
+    """Edit distance, one NumPy row per character of `a`."""
+    if not a or not b:
+        return max(len(a), len(b))
+    bb = np.frombuffer(b.encode("utf-32-le"), dtype=np.uint32)
+    cols = np.arange(len(bb) + 1)
+    row = cols.copy()
+    for i, ch in enumerate(a, start=1):
+        cost = (bb != ord(ch)).astype(np.int64)
+        best = np.empty_like(row)
+        best[0] = i
+        best[1:] = np.minimum(row[1:] + 1, row[:-1] + cost)
+        # Insertions: best[j] = min over k <= j of best[k] + (j - k)
+        row = np.minimum.accumulate(best - cols) + cols
+    return int(row[-1])
+
+
+def char_accuracy(reference, hypothesis):
+    reference, hypothesis = normalize(reference), normalize(hypothesis)
+    if not reference:
+        return 1.0
+    return round(max(0.0, 1 - levenshtein(reference, hypothesis) / len(reference)), 4)
+
+
+def _run(path, source, max_frames, budget_bytes, ocr, queue):
+    baseline = _rss_mb()
+    sampler = RssSampler()
+    sampler.start()
+    clock = StageClock()
+    sampling = SamplingStats()
+    counts = {"hashed": 0, "kept": 0}
+
+    def counted(items, key):
+        for item in items:
+            counts[key] += 1
+            yield item
+
+    start = time.perf_counter()
+    frames = clock.wrap("sample", (f for _, f in sample_frames(path, SAMPLE_INTERVAL_MS, stats=sampling)))
+    gated = counted(clock.wrap("scene_gate", scene_gate(frames)), "hashed")
+    unique = counted(clock.wrap("dedupe", dedupe_with_hashes(gated)), "kept")
+    prepared = cap_frames(unique, max_frames, transform=clock.call("prepare", lambda item: prepare_frame(item[0])))
+    stages = clock.exclusive_ms()
+
+    t = time.perf_counter()
+    budget = {}
+    prepared = fit_to_budget(prepared, budget_bytes, stats=budget)
+    stages["budget"] = round((time.perf_counter() - t) * 1000, 1)
+
+    result = {}
+    if ocr:
+        from app.gemini.ocr_service import OCRService
+
+        service = OCRService()
+        t = time.perf_counter()
+        service.warm_up().join()
+        result["ocr_load_s"] = round(time.perf_counter() - t, 2)
+        t = time.perf_counter()
+        texts = service.read_frames(prepared)
+        stages["ocr"] = round((time.perf_counter() - t) * 1000, 1)
+        result["ocr_char_accuracy"] = char_accuracy(source, merge_overlapping(texts))
+    stages["total"] = round((time.perf_counter() - start) * 1000, 1)
+
+    peak = sampler.stop()
+    sizes = [len(p["data"]) for p in prepared]
+    windows = plan_windows(len(prepared), VISION_WINDOW_FRAMES, VISION_WINDOW_OVERLAP)
+    queue.put({
+        "frame_count": sampling.frame_count,
+        "decoded": sampling.decoded,
+        "sampled": sampling.sampled,
+        "hashed": counts["hashed"],
+        "kept": counts["kept"],
+        "sent": len(prepared),
+        "request_bytes": sum(sizes),
+        "max_window_bytes": max((sum(sizes[a:b]) for a, b in windows), default=0),
+        "jpeg_quality": budget["quality"],
+        "stage_ms": stages,
+        "peak_rss_mb": round(peak, 1),
+        "peak_rss_growth_mb": round(peak - baseline, 1),
+        **result,
+    })
+
+
+def measure(path, source, max_frames, budget_bytes, ocr):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run, args=(path, source, max_frames, budget_bytes, ocr, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Video extraction pipeline benchmark")
+    parser.add_argument("--sizes", type=str, nargs="+", default=["1280x720", "1920x1080"])
+    parser.add_argument("--fps", type=float, nargs="+", default=[30])
+    parser.add_argument("--speeds", type=float, nargs="+", default=[400, 1200], help="Scroll speeds, px/s")
+    parser.add_argument("--pairs", type=int, default=3, help="JD/resume pairs recorded back to back per video")
+    parser.add_argument("--codec", type=str, default="mp4v")
+    parser.add_argument("--max-frames", type=int, default=MAX_VIDEO_FRAMES)
+    parser.add_argument("--budget-kb", type=int, default=PAYLOAD_BUDGET_BYTES // 1024)
+    parser.add_argument("--ocr", action="store_true", help="Run EasyOCR and score character accuracy")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    documents = mocktest_documents(args.pairs)
+    source = "\n\n\n".join(document_text(jd, resume) for _, jd, resume in documents)
+    root = tempfile.mkdtemp(prefix="video_pipeline_")
+    report = {"documents": [name for name, _, _ in documents], "max_frames": args.max_frames,
+              "budget_kb": args.budget_kb, "runs": []}
+    try:
+        for size, fps, speed in itertools.product(args.sizes, args.fps, args.speeds):
+            width, height = (int(v) for v in size.split("x"))
+            path = os.path.join(root, f"{size}_{fps:g}fps_{speed:g}.mp4")
+            video = write_scroll_video(path, source, size=(width, height), fps=fps, scroll_px_per_s=speed,
+                                       pause_s=1.0, codec=args.codec)
+            report["runs"].append({
+                "size": size,
+                "fps": fps,
+                "scroll_px_per_s": speed,
+                **video,
+                "file_kb": round(os.path.getsize(path) / 1024, 1),
+                **measure(path, source, args.max_frames, args.budget_kb * 1024, args.ocr),
+            })
+            os.remove(path)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Frame sampling benchmark: decode time for long uploads, the old
+read-every-frame loop against grab(), seek, the codec-aware mix of the
+two, adaptive intervals, and a sparser interval where seeking pays off.
+
+Videos are synthetic scroll recordings of the MockTest resumes and JDs,
+written once per (codec, length) into a temp dir.
+
+    python -m benchmarks.video_sampling --fps 60 --minutes 1 5 --size 1920x1080
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import cv2
+
+from app.gemini.frame_sampler import SamplingStats, sample_frames
+from benchmarks.common import emit, load_mocktest
+from benchmarks.video_synth import write_scroll_video
+
+CODECS = {"mp4v": ".mp4", "MJPG": ".avi"}
+
+
+def legacy_extract(path: str, interval_ms: int = 300) -> int:
+    """The previous extract_raw_frames loop (cap.read() on every frame)."""
+    frames = 0
+    cap = cv2.VideoCapture(path)
+    last = -interval_ms
+    ok, img = cap.read()
+    while ok:
+        t = cap.get(cv2.CAP_PROP_POS_MSEC)
+        if t - last >= interval_ms:
+            img.copy()
+            frames += 1
+            last = t
+        ok, img = cap.read()
+    cap.release()
+    return frames
+
+
+# name -> (strategy, adaptive, interval multiplier)
+MODES = {
+    "grab": ("grab", False, 1),
+    "seek": ("seek", False, 1),
+    "auto": ("auto", False, 1),
+    "adaptive": ("auto", True, 1),
+    "auto_4x_interval": ("auto", False, 4),
+}
+
+
+def time_mode(path: str, mode: str, interval_ms: int) -> dict:
+    start = time.perf_counter()
+    if mode == "legacy":
+        stats = {"sampled": legacy_extract(path, interval_ms)}
+    else:
+        strategy, adaptive, multiplier = MODES[mode]
+        collected = SamplingStats()
+        for _ in sample_frames(path, interval_ms * multiplier, strategy=strategy,
+                               adaptive=adaptive, stats=collected):
+            pass
+        stats = collected.as_dict()
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame sampling benchmark")
+    parser.add_argument("--size", type=str, default="1280x720")
+    parser.add_argument("--fps", type=float, default=60)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[0.5, 2])
+    parser.add_argument("--interval-ms", type=int, default=300)
+    parser.add_argument("--codecs", type=str, default="mp4v,MJPG")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split("x"))
+    text = "\n\n".join(load_mocktest().values())
+    root = tempfile.mkdtemp(prefix="video_sampling_")
+    report = {"size": args.size, "fps": args.fps, "interval_ms": args.interval_ms, "runs": []}
+    try:
+        for codec in args.codecs.split(","):
+            for minutes in args.minutes:
+                path = os.path.join(root, f"scroll_{codec}_{minutes}{CODECS[codec]}")
+                video = write_scroll_video(path, text, size=size, fps=args.fps, pause_s=2.0,
+                                           scroll_back=True, codec=codec, seconds=minutes * 60)
+                run = {"codec": codec, "minutes": minutes, **video,
+                       "mb": round(os.path.getsize(path) / (1024 * 1024), 1)}
+                for mode in ("legacy", *MODES):
+                    run[mode] = time_mode(path, mode, args.interval_ms)
+                report["runs"].append(run)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    emit(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Synthetic screen recordings for the video benchmarks: text rendered onto
+a tall page and scrolled through a fixed-size viewport, pausing on each
+screenful the way someone recording their resume would.
+"""
+import textwrap
+from typing import List, Tuple
+
+from benchmarks.common import load_mocktest
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def render_page(text: str, width: int, min_height: int = 0) -> np.ndarray:
+    """Black-on-white page of `text`, wrapped to `width` pixels."""
+    scale = width / 1280 * 0.9
+    thickness = max(1, round(scale * 2))
+    (char_w, char_h), baseline = cv2.getTextSize("M", FONT, scale, thickness)
+    line_h = int((char_h + baseline) * 1.8)
+    margin = int(width * 0.05)
+    columns = max(10, (width - 2 * margin) // char_w)
+
+    lines: List[str] = []
+    for paragraph in text.splitlines():
+        lines.extend(textwrap.wrap(paragraph, columns) or [""])
+
+    height = max(min_height, 2 * margin + line_h * len(lines))
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+    for i, line in enumerate(lines):
+        y = margin + line_h * (i + 1)
+        cv2.putText(page, line, (margin, y), FONT, scale, (20, 20, 20), thickness, cv2.LINE_AA)
+    return page
+
+
+def scroll_offsets(page_height: int, view_height: int, fps: float, scroll_px_per_s: float,
+                   pause_s: float, scroll_back: bool = False) -> List[int]:
+    """Per-frame viewport offsets: pause, scroll one screen, pause, ..."""
+    max_offset = max(0, page_height - view_height)
+    step = max(1.0, scroll_px_per_s / fps)
+    pause_frames = int(round(pause_s * fps))
+    stops = list(range(0, max_offset, int(view_height * 0.8))) + [max_offset]
+    if scroll_back:
+        stops += stops[-2::-1]
+
+    offsets: List[int] = []
+    position = 0.0
+    for stop in stops:
+        while abs(stop - position) > step:
+            position += step if stop > position else -step
+            offsets.append(int(position))
+        position = float(stop)
+        offsets.extend([stop] * pause_frames)
+    return offsets
+
+
+def write_scroll_video(path: str, text: str, size: Tuple[int, int] = (1280, 720), fps: float = 30,
+                       scroll_px_per_s: float = 600, pause_s: float = 1.0, scroll_back: bool = False,
+                       codec: str = "mp4v", seconds: float = 0.0) -> dict:
+    """
+    Render the recording to `path`; returns its frame count and duration.
+    With `seconds`, the scroll is played back and forth to that length.
+    """
+    width, height = size
+    page = render_page(text, width, min_height=height)
+    offsets = scroll_offsets(page.shape[0], height, fps, scroll_px_per_s, pause_s, scroll_back)
+    if seconds:
+        target = int(seconds * fps)
+        while len(offsets) < target:
+            offsets += offsets[::-1]
+        offsets = offsets[:target]
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"OpenCV cannot write {codec} to {path}")
+    try:
+        for offset in offsets:
+            writer.write(page[offset:offset + height])
+    finally:
+        writer.release()
+    return {"frames": len(offsets), "seconds": round(len(offsets) / fps, 2), "page_height": page.shape[0]}
+
+
+def mocktest_documents(limit: int = 0) -> List[Tuple[str, str, str]]:
+    """(name, jd_text, resume_text) pairs from MockTest, JD i with candidate i (JDs reused in turn)."""
+    jds = list(load_mocktest("JD*.txt").items())
+    resumes = list(load_mocktest("Candidate*.txt").items())
+    pairs = [
+        (f"{jds[i % len(jds)][0][:-4]}+{name[:-4]}", jds[i % len(jds)][1], text)
+        for i, (name, text) in enumerate(resumes)
+    ]
+    return pairs[:limit] if limit else pairs
+
+
+def document_text(jd_text: str, resume_text: str) -> str:
+    """The two documents one after the other, as a user scrolls through both."""
+    return f"JOB DESCRIPTION\n\n{jd_text.strip()}\n\n\nRESUME\n\n{resume_text.strip()}"
+
+
+def write_document_video(path: str, jd_text: str, resume_text: str, **kwargs) -> dict:
+    """write_scroll_video of a JD followed by a resume; same keyword arguments."""
+    return write_scroll_video(path, document_text(jd_text, resume_text), **kwargs)
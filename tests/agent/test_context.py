@@ -0,0 +1,51 @@
+from app.agent.context import build_context
+
+
+QUERY = "Python developer with FastAPI, MongoDB and Docker experience"
+
+
+def test_near_duplicates_are_dropped():
+    results = [
+        {"_id": "a", "text": "Built FastAPI services backed by MongoDB, shipped with Docker."},
+        {"_id": "b", "text": "Built FastAPI services backed by MongoDB, shipped with Docker!"},
+        {"_id": "c", "text": "Python developer writing data pipelines."},
+    ]
+    pack = build_context(QUERY, results, token_budget=500, min_relevance_ratio=0.0)
+
+    assert [c["id"] for c in pack.selected] == ["a", "c"]
+    assert pack.dropped == [{"id": "b", "tokens": pack.dropped[0]["tokens"], "reason": "redundant",
+                             "similarity": 1.0}]
+
+
+def test_budget_is_respected_and_reported():
+    results = [{"_id": str(i), "text": f"Python FastAPI MongoDB topic {i} " * 10} for i in range(6)]
+    pack = build_context(QUERY, results, token_budget=80, min_relevance_ratio=0.0)
+
+    assert pack.tokens <= 80
+    assert pack.selected and any(d["reason"] == "over_budget" for d in pack.dropped)
+    report = pack.report()
+    assert report["tokens"] == pack.tokens
+    assert len(report["selected"]) + len(report["dropped"]) == 6
+
+
+def test_weak_matches_are_left_out():
+    results = [
+        {"_id": "a", "text": "Python FastAPI MongoDB Docker developer"},
+        {"_id": "b", "text": "Office has a nice cafeteria"},
+    ]
+    pack = build_context(QUERY, results)
+    assert [c["id"] for c in pack.selected] == ["a"]
+    assert pack.dropped[0]["reason"] == "low_relevance"
+
+
+def test_single_oversized_candidate_is_cut_to_fit():
+    sentences = [f"Python FastAPI MongoDB Docker fact number {i} about the role." for i in range(150)]
+    document = "\n".join(sentences)
+    pack = build_context(QUERY, [{"_id": "doc", "text": document}], token_budget=300)
+
+    assert 0 < pack.tokens <= 300
+    assert document.startswith(pack.text)
+    assert pack.text.endswith("about the role.")
+    assert pack.report()["selected"] == [{"id": "doc", "tokens": pack.tokens,
+                                          "truncated_from": pack.selected[0]["truncated_from"]}]
+    assert pack.selected[0]["truncated_from"] > 1000
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.api.pagination import decode_cursor, encode_cursor, fetch_page, parse_object_id
+
+
+class AsyncCursor:
+    """Motor-style cursor over a mongomock one."""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def sort(self, keys):
+        self.cursor = self.cursor.sort(keys)
+        return self
+
+    def limit(self, n):
+        self.cursor = self.cursor.limit(n)
+        return self
+
+    async def to_list(self, length):
+        return list(self.cursor)[:length]
+
+
+class AsyncCollection:
+    def __init__(self):
+        self.collection = mongomock.MongoClient().db.history
+
+    def find(self, query, projection=None):
+        return AsyncCursor(self.collection.find(query, projection))
+
+
+def _seed(collection, n, user_id="a@example.com", same_timestamp_every=3):
+    base = datetime(2024, 1, 1)
+    for i in range(n):
+        # Runs of equal timestamps: _id has to break the ties
+        ts = base + timedelta(minutes=i // same_timestamp_every)
+        collection.collection.insert_one({"user_id": user_id, "timestamp": ts, "n": i, "body": "x" * 10})
+
+
+def test_cursor_round_trip():
+    doc = {"timestamp": datetime(2024, 5, 1, 12, 30, 15, 123000), "_id": ObjectId()}
+    assert decode_cursor(encode_cursor(doc)) == (doc["timestamp"], doc["_id"])
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", encode_cursor({"timestamp": datetime(2024, 1, 1), "_id": "x"})])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_invalid_object_id_is_a_404():
+    with pytest.raises(HTTPException) as exc:
+        parse_object_id("nope")
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_every_document_once_newest_first():
+    collection = AsyncCollection()
+    _seed(collection, 23)
+    _seed(collection, 5, user_id="b@example.com")
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = await fetch_page(collection, {"user_id": "a@example.com"}, {"n": 1, "timestamp": 1}, 5, cursor)
+        seen.extend(page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 5
+    assert sorted(d["n"] for d in seen) == list(range(23))
+    assert len({d["_id"] for d in seen}) == 23
+    keys = [(d["timestamp"], ObjectId(d["_id"])) for d in seen]
+    assert keys == sorted(keys, reverse=True)
+    assert all(set(d) == {"_id", "n", "timestamp"} for d in seen)
+
+
+@pytest.mark.asyncio
+async def test_exact_last_page_has_no_next_cursor():
+    collection = AsyncCollection()
+    _seed(collection, 10)
+
+    first = await fetch_page(collection, {"user_id": "a@example.com"}, limit=5)
+    second = await fetch_page(collection, {"user_id": "a@example.com"}, limit=5, cursor=first["next_cursor"])
+    assert len(second["items"]) == 5
+    assert second["next_cursor"] is None
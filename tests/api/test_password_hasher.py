@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+import pytest
+from passlib.context import CryptContext
+
+from app.api.password_hasher import ARGON2_MEMORY_KIB, ARGON2_TIME_COST, PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_with_tuned_argon2():
+    hasher = PasswordHasher(workers=2)
+    hashed = await hasher.hash("s3cret")
+    assert hashed.startswith("$argon2id$") and f"m={ARGON2_MEMORY_KIB},t={ARGON2_TIME_COST}" in hashed
+
+    assert await hasher.verify_and_update("s3cret", hashed) == (True, None)
+    assert await hasher.verify_and_update("wrong", hashed) == (False, None)
+    stats = hasher.stats()
+    assert stats["hash"]["count"] == 1 and stats["verify"]["count"] == 2
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_legacy_hashes_are_upgraded_on_login():
+    hasher = PasswordHasher(workers=1)
+    legacy_bcrypt = CryptContext(schemes=["bcrypt"]).hash("s3cret")
+    old_argon2 = CryptContext(schemes=["argon2"], argon2__memory_cost=8192, argon2__time_cost=1).hash("s3cret")
+
+    for legacy in (legacy_bcrypt, old_argon2):
+        ok, new_hash = await hasher.verify_and_update("s3cret", legacy)
+        assert ok and new_hash.startswith("$argon2id$")
+        assert await hasher.verify_and_update("s3cret", new_hash) == (True, None)
+
+    assert await hasher.verify_and_update("wrong", legacy_bcrypt) == (False, None)
+    assert hasher.rehashed == 2
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_keeps_running_while_hashing():
+    hasher = PasswordHasher(workers=1)
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.gather(*(hasher.hash(f"pw{i}") for i in range(4)))
+    task.cancel()
+
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    assert len(ticks) > 4 and max(gaps) < 0.1
+    assert hasher.stats()["queue_wait"]["max_ms"] > 0
+    hasher.shutdown()
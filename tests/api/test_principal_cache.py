@@ -0,0 +1,140 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.api import auth
+from app.api.principal_cache import PrincipalCache
+
+ALICE = {"username": "alice", "email": "alice@example.com", "roles": ["user"], "is_active": True}
+CLAIMS = {"sub": "alice", "email": "alice@example.com", "roles": ["user"]}
+
+
+class Loader:
+    def __init__(self, principal=ALICE):
+        self.principal = principal
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return dict(self.principal) if self.principal else None
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _pair():
+    server = fakeredis.FakeServer()
+    return [PrincipalCache(client=fakeredis.aioredis.FakeRedis(server=server, decode_responses=True), ttl=30)
+            for _ in range(2)]
+
+
+@pytest.mark.asyncio
+async def test_local_then_redis_then_loader():
+    first, second = _pair()
+    load = Loader()
+
+    assert await first.get_or_load("alice", CLAIMS, load) == ALICE
+    assert await first.get_or_load("alice", CLAIMS, load) == ALICE
+    # Another process finds it in Redis
+    assert await second.get_or_load("alice", CLAIMS, load) == ALICE
+
+    assert load.calls == 1
+    assert first.stats()["local_hits"] == 1 and second.stats()["redis_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_local_entries_expire_and_claims_are_part_of_the_key():
+    clock = Clock()
+    cache = PrincipalCache(client=fakeredis.aioredis.FakeRedis(decode_responses=True), ttl=30, clock=clock)
+    load = Loader()
+    await cache.get_or_load("alice", CLAIMS, load)
+    await cache.get_or_load("alice", {**CLAIMS, "roles": ["user", "admin"]}, load)
+    assert cache.stats()["entries"] == 2
+
+    clock.now = 31
+    await cache.get_or_load("alice", CLAIMS, load)
+    assert cache.local_hits == 0 and cache.redis_hits == 2
+
+
+@pytest.mark.asyncio
+async def test_inactive_or_missing_users_are_not_cached():
+    cache = _pair()[0]
+    load = Loader({**ALICE, "is_active": False})
+    await cache.get_or_load("alice", CLAIMS, load)
+    await cache.get_or_load("alice", CLAIMS, load)
+    assert load.calls == 2
+
+    assert await cache.get_or_load("bob", {"sub": "bob"}, Loader(None)) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_processes():
+    first, second = _pair()
+    load = Loader()
+    second.start()
+    await asyncio.sleep(0.05)
+    await first.get_or_load("alice", CLAIMS, load)
+    await second.get_or_load("alice", CLAIMS, load)
+
+    load.principal = {**ALICE, "roles": ["user", "admin"]}
+    await first.invalidate("alice")
+    await asyncio.sleep(0.05)
+
+    assert (await second.get_or_load("alice", CLAIMS, load))["roles"] == ["user", "admin"]
+    assert load.calls == 2
+    await second.stop()
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_the_cache(monkeypatch):
+    calls = []
+
+    async def get_user(username):
+        calls.append(username)
+        return {**ALICE, "password_hash": "x"}
+
+    monkeypatch.setattr(auth.mongo_handler, "get_user", get_user)
+    monkeypatch.setattr(auth, "principal_cache", _pair()[0])
+    token = auth.create_access_token({"sub": "alice", "email": ALICE["email"], "roles": ["user"]})
+
+    assert await auth.get_current_user(token) == ALICE
+    assert await auth.get_current_user(token) == ALICE
+    assert calls == ["alice"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = _pair()[0]
+    load = Loader()
+    results = await asyncio.gather(*(cache.get_or_load("alice", CLAIMS, load) for _ in range(10)))
+    assert all(r == ALICE for r in results)
+    assert load.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_a_load_is_not_undone_by_its_write_back():
+    first, second = _pair()
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_load():
+        # Read before the deactivation, returned after it
+        principal = dict(ALICE)
+        started.set()
+        await release.wait()
+        return principal
+
+    loading = asyncio.create_task(first.get_or_load("alice", CLAIMS, slow_load))
+    await asyncio.wait_for(started.wait(), timeout=1)
+    await second.invalidate("alice")
+    release.set()
+    await loading
+
+    assert await second.redis.get("auth:principal:alice") is None
+    deactivated = Loader({**ALICE, "is_active": False})
+    assert (await second.get_or_load("alice", CLAIMS, deactivated))["is_active"] is False
+    assert deactivated.calls == 1 and second.stats()["redis_hits"] == 0
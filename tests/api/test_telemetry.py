@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.utils.telemetry import TelemetrySink
+
+
+class FakeCollection:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def insert_many(self, documents, ordered=True):
+        if self.fail:
+            raise ConnectionError("mongo down")
+        self.batches.append(list(documents))
+
+
+def _sink(collections, **kwargs):
+    return TelemetrySink(collection=lambda name: collections.setdefault(name, FakeCollection()), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_flushes_a_full_batch_without_waiting_for_the_interval():
+    collections = {}
+    sink = _sink(collections, batch_size=3, flush_ms=60_000)
+    sink.start()
+    for i in range(3):
+        sink.emit("logs", {"i": i})
+    await asyncio.sleep(0.05)
+
+    assert len(collections["logs"].batches) == 1
+    assert [d["i"] for d in collections["logs"].batches[0]] == [0, 1, 2]
+    assert all("created_at" in d for d in collections["logs"].batches[0])
+    await sink.stop()
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_interval_and_groups_by_collection():
+    collections = {}
+    sink = _sink(collections, batch_size=100, flush_ms=20)
+    sink.start()
+    sink.emit("sessions", {"session_id": "a"})
+    sink.emit("logs", {"session_id": "a", "status_code": 200})
+    await asyncio.sleep(0.1)
+
+    assert len(collections["sessions"].batches) == 1 and len(collections["logs"].batches) == 1
+    assert sink.stats()["written"] == 2
+    await sink.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_and_stop_flushes_the_rest():
+    collections = {}
+    sink = _sink(collections, max_queue=5, batch_size=2, flush_ms=60_000)
+    for i in range(8):
+        sink.emit("logs", {"i": i})
+    assert sink.stats() == {"queued": 5, "written": 0, "dropped": 3, "failed": 0}
+
+    await sink.stop()
+    assert [d["i"] for batch in collections["logs"].batches for d in batch] == [0, 1, 2, 3, 4]
+    assert [len(batch) for batch in collections["logs"].batches] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_write_failures_are_counted_not_raised():
+    sink = TelemetrySink(collection=lambda name: FakeCollection(fail=True), batch_size=10)
+    sink.emit("logs", {"i": 1})
+    await sink.flush()
+    assert sink.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_during_a_write_does_not_lose_that_batch():
+    started, release = asyncio.Event(), asyncio.Event()
+
+    class SlowCollection(FakeCollection):
+        async def insert_many(self, documents, ordered=True):
+            started.set()
+            await release.wait()
+            await super().insert_many(documents, ordered)
+
+    collections = {"logs": SlowCollection()}
+    sink = _sink(collections, batch_size=2, flush_ms=60_000)
+    sink.start()
+    sink.emit("logs", {"i": 0})
+    sink.emit("logs", {"i": 1})
+    await asyncio.wait_for(started.wait(), timeout=1)
+    sink.emit("logs", {"i": 2})
+
+    stopping = asyncio.create_task(sink.stop())
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.wait_for(stopping, timeout=1)
+
+    assert [d["i"] for batch in collections["logs"].batches for d in batch] == [0, 1, 2]
+    assert sink.stats()["written"] == 3
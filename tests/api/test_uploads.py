@@ -0,0 +1,64 @@
+import hashlib
+import io
+import os
+
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.testclient import TestClient
+
+from app.api import uploads
+from app.api.uploads import reject_oversized, save_upload
+from app.ui.views.video_helpers import MultipartFileStream
+
+LIMIT = 64 * 1024
+saved = []
+
+app = FastAPI()
+
+
+@app.middleware("http")
+async def limit(request: Request, call_next):
+    return reject_oversized(request) or await call_next(request)
+
+
+@app.post("/upload")
+async def upload(video_file: UploadFile = File(...)):
+    result = await save_upload(video_file, max_bytes=LIMIT, chunk_size=4096)
+    saved.append(result)
+    return {"sha256": result.sha256, "size": result.size}
+
+
+client = TestClient(app)
+
+
+def _post(payload: bytes, filename="clip.mov"):
+    body = MultipartFileStream("video_file", filename, io.BytesIO(payload), "video/quicktime")
+    assert len(body) == len(b"".join(body))
+    body = MultipartFileStream("video_file", filename, io.BytesIO(payload), "video/quicktime")
+    return client.post("/upload", content=b"".join(body), headers={"Content-Type": body.content_type})
+
+
+def test_upload_is_hashed_while_streamed_to_disk():
+    payload = os.urandom(50_000)
+    response = _post(payload)
+
+    assert response.status_code == 200
+    assert response.json() == {"sha256": hashlib.sha256(payload).hexdigest(), "size": len(payload)}
+    path = saved[-1].path
+    assert path.endswith(".mov")
+    with open(path, "rb") as f:
+        assert f.read() == payload
+    os.remove(path)
+
+
+def test_oversized_upload_is_rejected_and_cleaned_up(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    response = _post(os.urandom(LIMIT + 1))
+
+    assert response.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_declared_length_is_rejected_before_parsing(monkeypatch):
+    monkeypatch.setitem(uploads.SIZE_LIMITED_PATHS, "/upload", LIMIT)
+    response = client.post("/upload", content=b"x", headers={"Content-Length": str(10 * 1024 * 1024)})
+    assert response.status_code == 413
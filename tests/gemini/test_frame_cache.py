@@ -0,0 +1,45 @@
+from app.gemini.frame_cache import ENTRY_OVERHEAD_BYTES, FrameTextCache
+
+
+def test_near_hash_hits_and_far_hash_misses():
+    cache = FrameTextCache(max_bytes=10_000, radius=3)
+    cache.put(0b1010, "Senior Python Engineer")
+
+    assert cache.get(0b1010 ^ 0b111) == "Senior Python Engineer"
+    assert cache.get(0b1010 ^ 0b1111) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["hit_rate"] == 0.5
+
+
+def test_evicts_least_recently_used_within_budget():
+    entry = len("text") + ENTRY_OVERHEAD_BYTES
+    cache = FrameTextCache(max_bytes=3 * entry, radius=1)
+    for h in (1 << 10, 1 << 20, 1 << 30):
+        cache.put(h, "text")
+    cache.get(1 << 10)
+    cache.put(1 << 40, "text")
+
+    assert len(cache) == 3 and cache.bytes <= cache.max_bytes
+    assert cache.get(1 << 20) is None
+    assert cache.get(1 << 10) == "text"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_oversized_text_is_not_cached():
+    cache = FrameTextCache(max_bytes=100, radius=2)
+    cache.put(1, "x" * 200)
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_entries_only_match_within_their_scope():
+    entry = len("text") + ENTRY_OVERHEAD_BYTES
+    cache = FrameTextCache(max_bytes=2 * entry, radius=3)
+    cache.put(0b1010, "text", scope="alice@example.com")
+
+    assert cache.get(0b1010, scope="bob@example.com") is None
+    assert cache.get(0b1011, scope="alice@example.com") == "text"
+
+    # Evicting a scope's last entry drops its index too
+    cache.put(1 << 20, "text", scope="bob@example.com")
+    cache.put(1 << 30, "text", scope="bob@example.com")
+    assert cache.get(0b1010, scope="alice@example.com") is None
+    assert cache.stats()["scopes"] == 1
@@ -0,0 +1,66 @@
+import cv2
+import numpy as np
+
+from app.gemini.frame_prep import JPEG_QUALITY, crop_to_text, detect_text, encode_jpeg, fit_to_budget
+
+
+def _text_frame(width=1280, height=720, origin=(400, 300), scale=1.5):
+    frame = np.full((height, width, 3), 255, np.uint8)
+    x, y = origin
+    for i, line in enumerate(["Senior Python Engineer", "FastAPI, MongoDB, Redis", "5 years experience"]):
+        cv2.putText(frame, line, (x, y + i * 60), cv2.FONT_HERSHEY_SIMPLEX, scale, (0, 0, 0), 3, cv2.LINE_AA)
+    return frame
+
+
+def _noise_frames(n=6, size=(480, 640)):
+    rng = np.random.default_rng(1)
+    return [{"mime_type": "image/jpeg", "data": encode_jpeg(rng.integers(0, 255, (*size, 3), dtype=np.uint8))}
+            for _ in range(n)]
+
+
+def test_detects_the_text_block():
+    frame = _text_frame()
+    bbox, line_height = detect_text(frame)
+
+    x0, y0, x1, y1 = bbox
+    assert x0 < 400 and y0 < 300 - 30 and y1 > 300 + 120
+    assert (x1 - x0) * (y1 - y0) < 0.5 * frame.shape[0] * frame.shape[1]
+    assert 25 < line_height < 60
+
+    ink = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) < 128
+    assert ink[y0:y1, x0:x1].sum() == ink.sum()
+
+
+def test_blank_frame_is_left_alone():
+    blank = np.full((720, 1280, 3), 255, np.uint8)
+    assert detect_text(blank) == (None, 0.0)
+    assert crop_to_text(blank) is blank
+
+
+def test_crop_scales_large_text_down():
+    cropped = crop_to_text(_text_frame(scale=3.0, origin=(50, 200)), target_text_height=20)
+    _, line_height = detect_text(cropped)
+    assert cropped.shape[1] < 1280
+    assert line_height <= 26
+
+
+def test_fit_to_budget_lowers_quality_first():
+    frames = _noise_frames()
+    total = sum(len(p["data"]) for p in frames)
+    stats = {}
+
+    fitted = fit_to_budget(frames, budget=int(total * 0.6), stats=stats)
+    assert stats["bytes"] == sum(len(p["data"]) for p in fitted) <= total * 0.6
+    assert stats["quality"] < JPEG_QUALITY and stats["budget_scale"] == 1.0
+
+
+def test_fit_to_budget_downscales_when_quality_is_not_enough():
+    frames = _noise_frames()
+    stats = {}
+    fit_to_budget(frames, budget=sum(len(p["data"]) for p in frames) // 10, stats=stats)
+    assert stats["budget_scale"] < 1.0
+
+
+def test_within_budget_is_untouched():
+    frames = _noise_frames(n=2)
+    assert fit_to_budget(frames, budget=10 ** 9) is frames
@@ -0,0 +1,93 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.gemini.frame_sampler import (
+    MAX_INTERVAL_MS,
+    SEEK_MIN_GAP_FRAMES,
+    SEEK_MIN_GAP_INTRA,
+    IntervalSchedule,
+    SamplingStats,
+    sample_frames,
+    seek_min_gap,
+)
+
+FPS = 30
+
+
+def _write_video(path, codec, frames=90, content="ramp"):
+    """ramp: frame i is filled with 2 * i; static: blank; moving: a scrolling bar."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*codec), FPS, (160, 120))
+    for i in range(frames):
+        img = np.full((120, 160, 3), 255, np.uint8)
+        if content == "moving":
+            cv2.rectangle(img, (0, (i * 7) % 100), (160, (i * 7) % 100 + 20), (0, 0, 0), -1)
+        elif content == "ramp":
+            img[:] = (i * 2) % 256
+        writer.write(img)
+    writer.release()
+    return str(path)
+
+
+@pytest.mark.parametrize("codec,ext", [("MJPG", ".avi"), ("mp4v", ".mp4")])
+def test_strategies_sample_the_same_frames(tmp_path, codec, ext):
+    path = _write_video(tmp_path / f"clip{ext}", codec)
+
+    results = {}
+    for strategy in ("grab", "seek", "auto"):
+        stats = SamplingStats()
+        frames = list(sample_frames(path, 300, strategy=strategy, adaptive=False, stats=stats))
+        results[strategy] = [int(round(t)) for t, _ in frames]
+        assert stats.decoded == stats.sampled == len(frames)
+        # The decoded pixels match the timestamp (neighbouring frames are 2 apart)
+        for t, img in frames:
+            assert abs(int(img[60, 80, 0]) - 2 * round(t * FPS / 1000)) <= 6
+
+    assert results["seek"] == results["auto"]
+    assert len(results["grab"]) == len(results["seek"]) == 10
+    assert all(abs(a - b) <= 1000 / FPS for a, b in zip(results["grab"], results["seek"]))
+
+
+def test_seek_min_gap_by_container_and_codec(tmp_path):
+    for codec, name, expected in (
+        ("MJPG", "clip.avi", SEEK_MIN_GAP_INTRA),
+        ("mp4v", "clip.mp4", SEEK_MIN_GAP_FRAMES),
+        ("MJPG", "clip.ts", None),
+    ):
+        path = _write_video(tmp_path / name, codec, frames=10)
+        cap = cv2.VideoCapture(path)
+        assert seek_min_gap(cap, path) == expected
+        cap.release()
+
+
+def test_auto_seeks_over_long_gaps_only(tmp_path):
+    path = _write_video(tmp_path / "clip.avi", "MJPG", frames=300)
+
+    dense = SamplingStats()
+    list(sample_frames(path, 300, strategy="auto", adaptive=False, stats=dense))
+    assert dense.seeks == 0 and dense.grabbed > 0
+
+    sparse = SamplingStats()
+    list(sample_frames(path, 2000, strategy="auto", adaptive=False, stats=sparse))
+    assert sparse.seeks == sparse.sampled - 1 and sparse.grabbed == 0
+
+
+def test_adaptive_schedule_tracks_motion(tmp_path):
+    static = SamplingStats()
+    list(sample_frames(_write_video(tmp_path / "static.avi", "MJPG", frames=300, content="static"), 300,
+                       adaptive=True, stats=static))
+    assert max(static.intervals_ms) == MAX_INTERVAL_MS
+
+    moving = SamplingStats()
+    list(sample_frames(_write_video(tmp_path / "moving.avi", "MJPG", frames=300, content="moving"), 300,
+                       adaptive=True, stats=moving))
+    assert min(moving.intervals_ms) < 300
+    assert moving.sampled > static.sampled
+
+
+def test_schedule_without_adaptive_is_fixed():
+    schedule = IntervalSchedule(300, adaptive=False)
+    frame = np.zeros((10, 10, 3), np.uint8)
+    assert schedule.observe(0, frame) == 300
+    assert schedule.observe(300, frame + 200) == 300
+    assert schedule.next_ms == 600
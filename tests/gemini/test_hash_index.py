@@ -0,0 +1,52 @@
+import random
+
+from app.gemini.hash_index import BKTree, MultiIndexHashTable, hamming
+
+
+def test_bktree_matches_brute_force():
+    rng = random.Random(5)
+    hashes = [rng.getrandbits(64) for _ in range(500)]
+    # Near-duplicates of some of them
+    hashes += [h ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for h in hashes[:100]]
+    tree = BKTree()
+    for h in hashes:
+        tree.add(h)
+    assert len(tree) == len(set(hashes))
+
+    for query in hashes[:50] + [rng.getrandbits(64) for _ in range(50)]:
+        for radius in (0, 3, 8):
+            expected = sorted({(hamming(query, h), h) for h in hashes if hamming(query, h) <= radius})
+            assert sorted(tree.search(query, radius)) == expected
+            assert (tree.find(query, radius) is None) == (not expected)
+
+
+def test_empty_tree_and_duplicates():
+    tree = BKTree()
+    assert tree.find(123, 10) is None and tree.search(123, 10) == []
+    tree.add(123)
+    tree.add(123)
+    assert len(tree) == 1
+    assert tree.find(123 ^ 0b11, 2) == 123
+
+
+def test_multi_index_finds_nearest_within_radius_and_forgets_removed():
+    rng = random.Random(7)
+    hashes = [rng.getrandbits(64) for _ in range(300)]
+    table = MultiIndexHashTable(radius=4)
+    for h in hashes:
+        table.add(h)
+
+    for h in hashes[:100]:
+        flipped = h
+        for bit in rng.sample(range(64), rng.randrange(0, 8)):
+            flipped ^= 1 << bit
+        within = [c for c in hashes if hamming(flipped, c) <= 4]
+        found = table.find(flipped)
+        if within:
+            assert hamming(flipped, found) == min(hamming(flipped, c) for c in within)
+        else:
+            assert found is None
+
+    table.remove(hashes[0])
+    assert hashes[0] not in table and len(table) == 299
+    assert table.find(hashes[0]) is None
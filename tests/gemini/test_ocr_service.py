@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from app.gemini.frame_prep import encode_jpeg
+from app.gemini.ocr_service import OCRService, pad_batch
+from app.gemini.video_extraction import ocr_fallback
+
+
+class FakeReader:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def readtext_batched(self, batch, detail=0, batch_size=1):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        self.batches.append(batch.shape)
+        with self._lock:
+            self.active -= 1
+        # "Read" each frame's gray level back as its text
+        return [[f"level {int(img[0, 0, 0])}"] for img in batch]
+
+
+def _service(reader, **kwargs):
+    loads = []
+
+    def factory(languages, gpu):
+        loads.append(languages)
+        return reader
+
+    return OCRService(reader_factory=factory, **kwargs), loads
+
+
+def _slide(seed):
+    rng = np.random.default_rng(seed)
+    return cv2.resize(rng.integers(0, 255, (12, 16, 3), dtype=np.uint8), (160, 120), interpolation=cv2.INTER_NEAREST)
+
+
+def _frames(levels, size=(40, 60)):
+    return [{"mime_type": "image/jpeg", "data": encode_jpeg(np.full((*size, 3), level, np.uint8))} for level in levels]
+
+
+def test_pad_batch_keeps_pixels_and_pads_white():
+    small = np.zeros((10, 20, 3), np.uint8)
+    large = np.zeros((30, 15, 3), np.uint8)
+    batch = pad_batch([small, large])
+    assert batch.shape == (2, 30, 20, 3)
+    assert batch[0, :10, :20].max() == 0 and batch[0, 10:].min() == 255
+    assert batch[1, :, 15:].min() == 255
+
+
+def test_models_load_once_and_frames_are_batched():
+    reader = FakeReader()
+    service, loads = _service(reader, batch_size=4)
+    service.warm_up().join()
+    assert service.ready
+
+    levels = [0, 50, 100, 150, 200, 250, 30]
+    texts = service.read_frames(_frames(levels))
+    service.read_frames(_frames(levels[:2]))
+
+    assert len(loads) == 1
+    assert texts == [f"level {level}" for level in levels]
+    assert [shape[0] for shape in reader.batches] == [4, 3, 2]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_fallback_split():
+    reader = FakeReader(delay=0.05)
+    service, _ = _service(reader, max_concurrency=1)
+    results = await asyncio.gather(*(ocr_fallback(_frames([0, 255]), service=service) for _ in range(3)))
+
+    assert reader.peak == 1
+    assert results[0] == {"resume_text": "", "jd_text": "level 0\nlevel 255"}
+
+
+def test_frame_cache_skips_frames_read_before():
+    from app.gemini.frame_cache import FrameTextCache
+
+    reader = FakeReader()
+    cache = FrameTextCache()
+    service, _ = _service(reader, cache=cache)
+    pages = [_slide(seed) for seed in range(4)]
+
+    first = service.read_frames([{"mime_type": "image/jpeg", "data": encode_jpeg(p)} for p in pages[:3]])
+    # Same pages re-encoded: different bytes, same perceptual hash; plus one new page
+    second = service.read_frames([{"mime_type": "image/jpeg", "data": encode_jpeg(p, quality=60)} for p in pages])
+
+    assert second[:3] == first
+    assert [shape[0] for shape in reader.batches] == [3, 1]
+    assert cache.stats()["hits"] == 3
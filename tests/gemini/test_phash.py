@@ -0,0 +1,38 @@
+import cv2
+import imagehash
+import numpy as np
+from PIL import Image
+
+from app.gemini.phash import hamming, phash_frames, phash_thumbnails
+
+
+def _frames(n=12):
+    rng = np.random.default_rng(3)
+    return [
+        cv2.resize(rng.integers(0, 255, (9, 16, 3), dtype=np.uint8), (320, 180), interpolation=cv2.INTER_CUBIC)
+        for _ in range(n)
+    ]
+
+
+def test_batch_hash_tracks_imagehash():
+    frames = _frames()
+    ours = phash_frames(frames)
+    reference = np.array(
+        [int(str(imagehash.phash(Image.fromarray(cv2.cvtColor(f, cv2.COLOR_BGR2RGB)))), 16) for f in frames],
+        dtype=np.uint64,
+    )
+    # Same DCT and median rule; only the 32x32 resampling filter differs
+    assert hamming(ours, reference).max() <= 8
+    assert hamming(ours[:, None], ours[None, :]).min(axis=1).tolist() == [0] * len(frames)
+
+
+def test_batch_equals_one_by_one():
+    frames = _frames(5)
+    assert phash_frames(frames).tolist() == [int(phash_frames([f])[0]) for f in frames]
+
+
+def test_hamming():
+    assert hamming(0b1011, 0b0001) == 2
+    assert hamming(np.uint64(2 ** 64 - 1), 0) == 64
+    assert hamming([1, 3, 7], 0).tolist() == [1, 2, 3]
+    assert phash_thumbnails(np.zeros((0, 32, 32))).shape == (0,)
@@ -0,0 +1,120 @@
+import json
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import fakeredis.aioredis
+import numpy as np
+import pytest
+
+from app.gemini import frame_pool
+from app.gemini.video_analysis import extract_text_from_video
+from app.gemini.video_extraction import HASH_BATCH, cap_frames, dedupe_frames, scene_gate, stream_prepared_frames
+
+
+def _write_slides(path, slides=6, frames_per_slide=15, fps=30):
+    """A slideshow of distinct random-noise slides, each held for half a second."""
+    rng = np.random.default_rng(0)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, (160, 120))
+    for _ in range(slides):
+        slide = cv2.resize(rng.integers(0, 255, (12, 16, 3), dtype=np.uint8), (160, 120),
+                           interpolation=cv2.INTER_NEAREST)
+        for _ in range(frames_per_slide):
+            writer.write(slide)
+    writer.release()
+    return str(path)
+
+
+def test_cap_frames_keeps_an_even_spread():
+    kept = cap_frames(iter(range(100)), max_frames=10)
+    assert len(kept) <= 10
+    assert kept[0] == 0 and kept[-1] >= 80
+    assert len({b - a for a, b in zip(kept, kept[1:])}) == 1
+
+    assert cap_frames(iter(range(5)), max_frames=10) == list(range(5))
+
+
+def test_cap_frames_transforms_only_what_passes_the_stride():
+    transformed = []
+
+    def encode(i):
+        transformed.append(i)
+        return f"jpeg-{i}"
+
+    kept = cap_frames(iter(range(1000)), max_frames=10, transform=encode)
+    assert kept == [f"jpeg-{i}" for i in cap_frames(iter(range(1000)), max_frames=10)]
+    # Frames skipped by the stride are never encoded
+    assert len(transformed) < 100
+
+
+def test_stages_are_lazy():
+    consumed = []
+
+    def frames():
+        for i in range(3 * HASH_BATCH):
+            consumed.append(i)
+            yield np.full((32, 32, 3), i * 8, np.uint8)
+
+    unique = dedupe_frames(frames())
+    assert isinstance(unique, types.GeneratorType) and consumed == []
+    next(unique)
+    assert len(consumed) == HASH_BATCH
+
+
+def test_stream_prepared_frames(tmp_path):
+    stats = {}
+    prepared = stream_prepared_frames(_write_slides(tmp_path / "slides.avi"), max_frames=4, stats=stats)
+
+    assert len(prepared) == stats["sent"] <= 4
+    assert stats["sampled"] > stats["unique"] > stats["sent"]
+    assert stats["bytes"] == sum(len(p["data"]) for p in prepared)
+    assert all(p["mime_type"] == "image/jpeg" and p["data"][:2] == b"\xff\xd8" for p in prepared)
+
+
+@pytest.mark.asyncio
+async def test_known_hash_hits_cache_without_reading_the_video():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    cached = {"resume_text": "Experience: Python", "jd_text": "Backend engineer"}
+    await redis.set("video_extract:abc123", json.dumps(cached))
+    client = types.SimpleNamespace(redis=redis)
+
+    result = await extract_text_from_video(client, "/nonexistent/video.mp4", video_hash="abc123")
+    assert result == cached
+
+
+def test_parallel_segments_are_stitched_in_order(tmp_path, monkeypatch):
+    # 60 s of slides at 1 fps: long enough for MIN_SEGMENT_SECONDS spans
+    path = _write_slides(tmp_path / "long.avi", slides=20, frames_per_slide=3, fps=1)
+    assert len(frame_pool.plan_segments(path, workers=3)) == 3
+    assert frame_pool.plan_segments(path, workers=1) == [(0.0, None)]
+
+    # Threads stand in for the process pool: same map/stitch path, no spawn
+    monkeypatch.setattr(frame_pool, "get_executor", lambda: ThreadPoolExecutor(3))
+    serial, parallel = {}, {}
+    one = stream_prepared_frames(path, max_frames=100, workers=1, stats=serial)
+    many = stream_prepared_frames(path, max_frames=100, workers=3, stats=parallel)
+
+    assert parallel["segments"] == 3 and serial["segments"] == 1
+    assert parallel["sampled"] == serial["sampled"]
+    assert [p["data"] for p in many] == [p["data"] for p in one]
+
+
+def _slide(seed):
+    rng = np.random.default_rng(seed)
+    return cv2.resize(rng.integers(0, 255, (12, 16, 3), dtype=np.uint8), (160, 120), interpolation=cv2.INTER_NEAREST)
+
+
+def test_dedupe_is_global_across_revisits():
+    a, b, c = _slide(1), _slide(2), _slide(3)
+    kept = list(dedupe_frames([a, b, a.copy(), c, b.copy(), a.copy()]))
+    assert len(kept) == 3
+    assert kept[0] is a and kept[1] is b and kept[2] is c
+
+
+def test_scene_gate_skips_unchanged_frames():
+    a, b = _slide(1), _slide(2)
+    noisy = a.copy()
+    noisy[::4, ::4] = np.clip(noisy[::4, ::4].astype(np.int16) + 3, 0, 255)
+    passed = list(scene_gate([a, a.copy(), noisy, b, b.copy()]))
+    assert len(passed) == 2
+    assert passed[0] is a and passed[1] is b
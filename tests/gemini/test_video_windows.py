@@ -0,0 +1,63 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.gemini import video_analysis
+from app.gemini.video_extraction import plan_windows, stitch_texts
+
+
+def test_plan_windows_overlaps_and_covers_every_frame():
+    windows = plan_windows(30, size=12, overlap=2)
+    assert windows == [(0, 12), (10, 22), (20, 30)]
+    assert plan_windows(5, size=12, overlap=2) == [(0, 5)]
+
+
+def test_stitch_drops_lines_repeated_from_the_overlap():
+    parts = [
+        "Senior Python Engineer\nFastAPI, MongoDB",
+        "fastapi mongodb\nRedis, Docker\n5 years experience",
+        "5 years experience.\nEducation: BSc",
+    ]
+    assert stitch_texts(parts) == "Senior Python Engineer\nFastAPI, MongoDB\nRedis, Docker\n5 years experience\nEducation: BSc"
+
+
+class FakeVisionClient:
+    """Answers with the frame labels it was sent; fails on windows containing `fail_on`."""
+
+    def __init__(self, fail_on):
+        self.fail_on = fail_on
+        self.requests = []
+        self.vision_model = "vision"
+        self.client = SimpleNamespace(models=SimpleNamespace(generate_content=None))
+
+    def safety(self):
+        return []
+
+    async def call(self, operation, fn, contents, **kwargs):
+        frames = contents[1:]
+        self.requests.append(len(frames))
+        labels = [f["label"] for f in frames]
+        if self.fail_on in labels:
+            raise RuntimeError("blocked")
+        return SimpleNamespace(text=json.dumps({"resume_text": "\n".join(labels), "jd_text": ""}))
+
+
+@pytest.mark.asyncio
+async def test_failed_window_falls_back_to_ocr_alone(monkeypatch):
+    ocr_calls = []
+
+    async def fake_ocr(frames, scope=""):
+        ocr_calls.append((scope, [f["label"] for f in frames]))
+        return {"resume_text": "\n".join(f["label"] for f in frames), "jd_text": ""}
+
+    monkeypatch.setattr(video_analysis, "ocr_fallback", fake_ocr)
+    frames = [{"label": f"frame {i}"} for i in range(10)]
+    client = FakeVisionClient(fail_on="frame 5")
+
+    result = await video_analysis.extract_windowed(client, "prompt", frames, window_frames=4, overlap=1,
+                                                   user_id="a@example.com")
+
+    assert client.requests == [4, 4, 4]
+    assert ocr_calls == [("a@example.com", ["frame 3", "frame 4", "frame 5", "frame 6"])]
+    assert result["resume_text"].splitlines() == [f"frame {i}" for i in range(10)]
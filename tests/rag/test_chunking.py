@@ -0,0 +1,40 @@
+import io
+
+from app.rag.chunking import chunk_text, iter_chunks
+
+TEXT = (
+    "Role: Backend Engineer\n"
+    "Skills Required:\n"
+    "- Python, FastAPI/Django\n"
+    "- PostgreSQL\n"
+    "- Redis\n\n"
+    "Responsibilities:\n"
+    "- Build scalable APIs. Implement caching. Write unit tests.\n"
+    "- CI/CD pipelines\n"
+)
+
+
+def test_chunks_respect_budget_and_offsets():
+    chunks = list(chunk_text(TEXT, max_tokens=12, overlap_tokens=4))
+    assert len(chunks) > 1
+    for c in chunks:
+        assert c.token_count <= 12
+        assert TEXT[c.char_start:c.char_end] == c.text
+
+
+def test_lines_are_never_split():
+    chunks = list(chunk_text(TEXT, max_tokens=12, overlap_tokens=0))
+    for line in ("- Python, FastAPI/Django", "- PostgreSQL", "- CI/CD pipelines"):
+        assert any(line in c.text for c in chunks)
+
+
+def test_overlap_repeats_trailing_sentence():
+    chunks = list(chunk_text(TEXT, max_tokens=12, overlap_tokens=4))
+    first, second = chunks[0], chunks[1]
+    assert second.char_start < first.char_end
+
+
+def test_streaming_matches_in_memory():
+    expected = [(c.char_start, c.text) for c in chunk_text(TEXT, 12, 4)]
+    streamed = [(c.char_start, c.text) for c in iter_chunks(io.StringIO(TEXT), 12, 4, block_size=5)]
+    assert streamed == expected
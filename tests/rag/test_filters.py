@@ -0,0 +1,31 @@
+import pytest
+
+from app.rag.filters import build_filter
+from app.rag.local_vector import LocalVectorStore
+
+
+def test_build_filter_translates_names():
+    assert build_filter(None) is None
+    assert build_filter({"source": "a.txt"}) == {"metadata.source": {"$eq": "a.txt"}}
+    assert build_filter({"skills": ["python", "go"], "generated_from_jd": False}) == {
+        "$and": [
+            {"metadata.skills": {"$in": ["python", "go"]}},
+            {"metadata.source": {"$ne": "generated_from_jd"}},
+        ]
+    }
+    with pytest.raises(ValueError):
+        build_filter({"salary": 1})
+
+
+@pytest.mark.asyncio
+async def test_local_store_applies_prefilter():
+    store = LocalVectorStore()
+    await store.upsert_many([
+        {"_id": "a", "text": "a", "embedding": [1.0, 0.0], "metadata": {"skills": ["python"]}},
+        {"_id": "b", "text": "b", "embedding": [0.9, 0.1], "metadata": {"skills": ["java"]}},
+        {"_id": "c", "text": "c", "embedding": [0.0, 1.0], "source": "generated_from_jd"},
+    ])
+
+    assert [r["_id"] for r in await store.search([1.0, 0.0], top_k=3)] == ["a", "b", "c"]
+    assert [r["_id"] for r in await store.search([1.0, 0.0], top_k=3, filters={"skills": ["java"]})] == ["b"]
+    assert [r["_id"] for r in await store.search([1.0, 0.0], filters={"generated_from_jd": True})] == ["c"]
@@ -0,0 +1,113 @@
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from app.rag import hybrid
+from app.rag.hybrid import hybrid_search
+from app.rag.lexical import BM25Index, reciprocal_rank_fusion, tokenize
+from app.rag.local_vector import LocalVectorStore
+from app.rag.retrieval_cache import RetrievalCache
+
+
+DOCS = [
+    {"_id": "a", "text": "Built REST services with FastAPI and Kubernetes", "embedding": [0.0, 1.0]},
+    {"_id": "b", "text": "General backend development experience", "embedding": [1.0, 0.0]},
+    {"_id": "c", "text": "Data pipelines in PySpark and C++ tooling", "embedding": [0.7, 0.7]},
+]
+
+
+
+@pytest.fixture(autouse=True)
+def _fake_generation(monkeypatch):
+    # Lexical loads read the corpus generation from Redis
+    monkeypatch.setattr(hybrid, "retrieval_cache", RetrievalCache(fakeredis.aioredis.FakeRedis(decode_responses=True)))
+
+
+def test_tokenize_keeps_skill_spellings():
+    assert tokenize("C++, C#, Node.js.") == ["c++", "c#", "node.js"]
+
+
+def test_bm25_updates_and_removes():
+    index = BM25Index()
+    index.add_many(DOCS)
+    assert [r["_id"] for r in index.search("kubernetes")] == ["a"]
+
+    index.add({"_id": "a", "text": "Kubernetes Kubernetes operators"})
+    index.remove_many(["c"])
+    assert [r["_id"] for r in index.search("pyspark kubernetes")] == ["a"]
+    assert len(index) == 2
+
+
+def test_rrf_rewards_agreement():
+    fused = reciprocal_rank_fusion(
+        {"vector": [{"_id": "x"}, {"_id": "y"}], "bm25": [{"_id": "y"}, {"_id": "z"}]},
+        top_k=3,
+    )
+    assert [r["_id"] for r in fused] == ["y", "x", "z"]
+    assert fused[0]["vector_score"] is None and "bm25_score" in fused[0]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_surfaces_exact_skill():
+    store, index = LocalVectorStore(), BM25Index()
+    await store.upsert_many([dict(d) for d in DOCS])
+    index.add_many(DOCS)
+
+    # The query embedding points away from "a"; BM25 still pulls it in
+    results = await hybrid_search("FastAPI", [1.0, 0.0], top_k=2, store=store, index=index)
+    assert "a" in [r["_id"] for r in results]
+
+
+@pytest.mark.asyncio
+async def test_stale_index_keeps_serving_while_refresh_runs_in_background(monkeypatch):
+    index = BM25Index()
+    index.add_many(DOCS)
+    index.loaded_at = 1.0  # long stale
+    reload_started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_load():
+        reload_started.set()
+        await release.wait()
+        return [{"_id": "d", "text": "Terraform modules"}]
+
+    monkeypatch.setattr(hybrid, "lexical_index", index)
+    monkeypatch.setattr(hybrid.mongo_vector, "load_text_documents", slow_load)
+
+    await asyncio.wait_for(hybrid.ensure_lexical_index(), timeout=1)
+    await asyncio.wait_for(reload_started.wait(), timeout=1)
+    # The query path returned at once and the old index still answers
+    assert [r["_id"] for r in index.search("kubernetes")] == ["a"]
+    # Further stale queries share the refresh already running
+    await hybrid.ensure_lexical_index()
+
+    release.set()
+    await asyncio.wait_for(hybrid._refresh_task, timeout=1)
+    assert [r["_id"] for r in index.search("terraform")] == ["d"]
+    assert index.search("kubernetes") == []
+
+
+@pytest.mark.asyncio
+async def test_failed_first_load_falls_back_to_vectors_and_retries(monkeypatch):
+    index = BM25Index()
+    loads = []
+
+    async def flaky_load():
+        loads.append(1)
+        if len(loads) == 1:
+            raise TimeoutError("mongo timed out")
+        return DOCS
+
+    async def vector_search(query_embedding, top_k=5, filters=None):
+        return [{"_id": "b", "text": DOCS[1]["text"], "metadata": {}, "score": 0.9}]
+
+    monkeypatch.setattr(hybrid, "lexical_index", index)
+    monkeypatch.setattr(hybrid.mongo_vector, "load_text_documents", flaky_load)
+    monkeypatch.setattr(hybrid.mongo_vector, "search", vector_search)
+
+    first = await hybrid_search("kubernetes", [1.0, 0.0], top_k=2)
+    assert [r["_id"] for r in first] == ["b"]
+
+    second = await hybrid_search("kubernetes", [1.0, 0.0], top_k=2)
+    assert len(loads) == 2
+    assert {r["_id"] for r in second} == {"a", "b"}
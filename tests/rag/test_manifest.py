@@ -0,0 +1,42 @@
+import os
+
+from app.rag.manifest import ManifestEntry, file_sha256, plan_refresh
+
+
+def _entry(path, chunk_ids=("a:0",)):
+    st = os.stat(path)
+    return ManifestEntry(
+        path=os.path.abspath(path),
+        source_dir=os.path.dirname(os.path.abspath(path)),
+        size=st.st_size,
+        mtime=st.st_mtime,
+        sha256=file_sha256(path),
+        chunk_ids=list(chunk_ids),
+    )
+
+
+def test_plan_classifies_files(tmp_path):
+    same = tmp_path / "same.txt"
+    touched = tmp_path / "touched.txt"
+    changed = tmp_path / "changed.txt"
+    new = tmp_path / "new.txt"
+    for p in (same, touched, changed, new):
+        p.write_text(f"content of {p.name}")
+
+    entries = {e.path: e for e in (_entry(same), _entry(touched), _entry(changed))}
+    gone = ManifestEntry(str(tmp_path / "gone.txt"), str(tmp_path), 1, 1.0, "x", ["g:0", "g:1"])
+    entries[gone.path] = gone
+
+    os.utime(touched, (1, 1))
+    changed.write_text("different content now")
+
+    plan = plan_refresh([str(p) for p in (same, touched, changed, new)], entries)
+
+    assert plan.unchanged == [str(same)]
+    assert plan.touched == [str(touched)]
+    assert plan.changed == [str(changed)]
+    assert plan.new == [str(new)]
+    assert plan.deleted == [gone]
+    assert plan.summary()["stale_chunks"] == 2
+    # Unchanged files are trusted on size + mtime and never hashed
+    assert str(same) not in plan.hashes
@@ -0,0 +1,64 @@
+import pytest
+
+from app.rag.pipeline import Checkpoint, IngestionPipeline
+
+
+def _write_corpus(tmp_path, n=5):
+    paths = []
+    for i in range(n):
+        p = tmp_path / f"doc{i}.txt"
+        p.write_text("\n".join(f"- Skill line {i}-{j}." for j in range(40)))
+        paths.append(str(p))
+    return paths
+
+
+@pytest.mark.asyncio
+async def test_pipeline_ingests_every_file_in_batches(tmp_path):
+    paths = _write_corpus(tmp_path)
+    embed_calls, written = [], []
+
+    async def fake_embed(texts):
+        embed_calls.append(len(texts))
+        return [[0.1, 0.2] for _ in texts]
+
+    async def fake_write(docs):
+        written.extend(docs)
+
+    pipeline = IngestionPipeline(fake_embed, fake_write, chunk_size=32, overlap=8, embed_batch_size=8)
+    stats = await pipeline.run(paths, metadata={"source_dir": str(tmp_path)})
+
+    assert stats.files_done == len(paths)
+    assert stats.chunks_written == len(written) == sum(embed_calls)
+    assert max(embed_calls) <= 8
+    assert {d["metadata"]["source"] for d in written} == set(paths)
+    assert len({d["_id"] for d in written}) == len(written)
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_resumes_after_failure(tmp_path):
+    paths = _write_corpus(tmp_path, n=3)
+    checkpoint_path = str(tmp_path / "ckpt.jsonl")
+    seen = []
+
+    async def flaky_embed(texts):
+        # Chunks of the second file come back empty, like a failed embed call
+        return [[] if "Skill line 1-" in t else [1.0] for t in texts]
+
+    async def fake_write(docs):
+        seen.extend(d["metadata"]["source"] for d in docs)
+
+    first = IngestionPipeline(flaky_embed, fake_write, chunk_size=32, overlap=0,
+                              checkpoint=Checkpoint(checkpoint_path))
+    stats = await first.run(paths)
+    assert stats.files_failed == 1
+    assert Checkpoint(checkpoint_path).load().is_done(paths[0])
+
+    async def good_embed(texts):
+        return [[1.0] for _ in texts]
+
+    seen.clear()
+    second = IngestionPipeline(good_embed, fake_write, chunk_size=32, overlap=0,
+                               checkpoint=Checkpoint(checkpoint_path).load())
+    stats = await second.run(paths)
+    assert stats.files_skipped == 2
+    assert set(seen) == {paths[1]}
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from bson.binary import BinaryVectorDtype
+
+from app.rag.local_vector import LocalVectorStore
+from app.rag.quantization import (
+    FULL_PRECISION_FIELD,
+    QUANTIZED_FIELD,
+    SCALE_FIELD,
+    dequantize_int8,
+    encode_document,
+    quantize_int8,
+    rescore,
+)
+
+
+def test_int8_roundtrip_error_is_bounded():
+    vector = np.random.default_rng(1).standard_normal(768).astype(np.float32)
+    q, scale = quantize_int8(vector)
+    assert q.dtype == np.int8
+    assert np.max(np.abs(dequantize_int8(q, scale) - vector)) <= scale / 2 + 1e-6
+
+
+def test_encode_document_layouts():
+    vector = [0.5, -1.0, 0.25, 0.0, 2.0, -0.1, 0.3, 0.7, -0.2]
+
+    doc = encode_document({"_id": "a", "embedding": list(vector)}, "int8")
+    assert "embedding" not in doc
+    assert doc[QUANTIZED_FIELD].as_vector().dtype == BinaryVectorDtype.INT8
+    assert doc[SCALE_FIELD] == pytest.approx(2.0 / 127)
+
+    doc = encode_document({"_id": "b", "embedding": list(vector)}, "binary")
+    bits = doc[QUANTIZED_FIELD].as_vector()
+    assert bits.dtype == BinaryVectorDtype.PACKED_BIT and bits.padding == 7
+    assert np.allclose(doc[FULL_PRECISION_FIELD].as_vector().data, vector)
+
+
+def test_rescore_uses_full_precision():
+    candidates = [
+        encode_document({"_id": "far", "embedding": [0.0, 1.0], "score": 0.9}, "int8"),
+        encode_document({"_id": "near", "embedding": [1.0, 0.1], "score": 0.8}, "int8"),
+    ]
+    results = rescore([1.0, 0.0], candidates, top_k=1)
+    assert [r["_id"] for r in results] == ["near"]
+    assert FULL_PRECISION_FIELD not in results[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["int8", "binary"])
+async def test_local_store_quantized_matches_float(mode):
+    rng = np.random.default_rng(3)
+    vectors = rng.standard_normal((500, 64)).astype(np.float32)
+    docs = [{"_id": str(i), "embedding": v} for i, v in enumerate(vectors)]
+
+    exact, quantized = LocalVectorStore(), LocalVectorStore(quantization=mode)
+    await exact.upsert_many(docs)
+    await quantized.upsert_many(docs)
+    assert quantized.index_bytes() < exact.index_bytes()
+
+    query = vectors[42] + 0.1 * rng.standard_normal(64).astype(np.float32)
+    top = [r["_id"] for r in await exact.search(query, top_k=3)]
+    assert [r["_id"] for r in await quantized.search(query, top_k=3)][0] == top[0] == "42"
+
+
+@pytest.mark.asyncio
+async def test_quantized_store_keeps_float_rows_out_of_memory():
+    rng = np.random.default_rng(5)
+    vectors = rng.standard_normal((300, 32)).astype(np.float32)
+    store = LocalVectorStore(quantization="int8")
+    await store.upsert_many([{"_id": str(i), "embedding": v} for i, v in enumerate(vectors[:200])])
+    await store.search(vectors[0], top_k=1)
+
+    # Later writes rebuild from the mapped rows plus the new vectors
+    await store.upsert_many([{"_id": str(i), "embedding": v} for i, v in enumerate(vectors[200:], start=200)])
+    await store.delete_many(["7"])
+    assert [r["_id"] for r in await store.search(vectors[250], top_k=1)] == ["250"]
+    assert [r["_id"] for r in await store.search(vectors[3], top_k=1)] == ["3"]
+
+    assert len(store) == 299
+    assert all("embedding" not in doc for doc in store._docs.values())
+    assert isinstance(store._matrix, np.memmap)
+    assert store.index_bytes() == 299 * 32 + 299 * 4
+    assert store.rescore_bytes() == 299 * 32 * 4
@@ -0,0 +1,98 @@
+import fakeredis.aioredis
+import pytest
+
+from app.rag.retrieval_cache import RetrievalCache
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_until_generation_bumps():
+    cache = RetrievalCache(fakeredis.aioredis.FakeRedis(decode_responses=True))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return [{"_id": "a", "text": "FastAPI", "score": 0.9}]
+
+    args = ("python backend", 3, {"skills": ["python"]}, "text-embedding-004", compute)
+    first = await cache.get_or_compute(*args)
+    second = await cache.get_or_compute(*args)
+    assert first == second and len(calls) == 1
+
+    # Different filters are a different entry
+    await cache.get_or_compute("python backend", 3, None, "text-embedding-004", compute)
+    assert len(calls) == 2
+
+    await cache.bump_generation()
+    await cache.get_or_compute(*args)
+    assert len(calls) == 3
+
+    stats = await cache.stats()
+    assert stats == {"hits": 1, "misses": 3, "hit_rate": 0.25, "generation": 1}
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_compute():
+    class Broken:
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def incr(self, key):
+            raise ConnectionError("down")
+
+        async def hincrby(self, *args):
+            raise ConnectionError("down")
+
+    cache = RetrievalCache(Broken())
+
+    async def compute():
+        return [{"_id": "a"}]
+
+    assert await cache.get_or_compute("q", 1, None, "m", compute) == [{"_id": "a"}]
+    assert await cache.bump_generation() is None
+
+
+@pytest.mark.asyncio
+async def test_results_over_a_stale_lexical_index_are_not_cached(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.rag import hybrid
+    from app.rag.lexical import BM25Index
+
+    cache = RetrievalCache(fakeredis.aioredis.FakeRedis(decode_responses=True))
+    corpus = [{"_id": "a", "text": "FastAPI services"}]
+    loads = []
+
+    async def load_text_documents():
+        loads.append(len(corpus))
+        return list(corpus)
+
+    async def vector_search(query_embedding, top_k=5, filters=None):
+        return []
+
+    async def embed(client, text):
+        return [1.0, 0.0]
+
+    monkeypatch.setattr(hybrid, "retrieval_cache", cache)
+    monkeypatch.setattr(hybrid, "lexical_index", BM25Index())
+    monkeypatch.setattr(hybrid, "_lexical_generation", None)
+    monkeypatch.setattr(hybrid, "_refresh_task", None)
+    monkeypatch.setattr(hybrid, "embed", embed)
+    monkeypatch.setattr(hybrid.mongo_vector, "load_text_documents", load_text_documents)
+    monkeypatch.setattr(hybrid.mongo_vector, "search", vector_search)
+    client = SimpleNamespace(embedding_model="m")
+
+    assert [r["_id"] for r in await hybrid.retrieve(client, "kubernetes fastapi")] == ["a"]
+
+    # The ingestion worker writes a chunk: Mongo and the generation move, this index doesn't
+    corpus.append({"_id": "b", "text": "Kubernetes operators"})
+    await cache.bump_generation()
+
+    stale = await hybrid.retrieve(client, "kubernetes fastapi")
+    assert [r["_id"] for r in stale] == ["a"]
+    await hybrid._refresh_task
+
+    fresh = await hybrid.retrieve(client, "kubernetes fastapi")
+    assert {r["_id"] for r in fresh} == {"a", "b"}
+    assert loads == [1, 2]
+    assert await hybrid.retrieve(client, "kubernetes fastapi") == fresh
+    assert (await cache.stats())["hits"] == 1
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from app.rag.watcher import PendingFileWorker
+
+
+@pytest.mark.asyncio
+async def test_drain_processes_and_quarantines(tmp_path):
+    (tmp_path / "good.txt").write_text("ok")
+    (tmp_path / "bad.txt").write_text("boom")
+    (tmp_path / ".partial.txt").write_text("ignored")
+    seen = []
+
+    async def process(path, metadata):
+        seen.append(metadata["source"])
+        if path.endswith("bad.txt"):
+            raise ValueError("cannot ingest")
+        return 1
+
+    worker = PendingFileWorker(process, pending_dir=str(tmp_path), use_inotify=False)
+    await worker.drain()
+
+    assert sorted(seen) == [str(tmp_path / "bad.txt"), str(tmp_path / "good.txt")]
+    assert not (tmp_path / "good.txt").exists()
+    assert os.listdir(tmp_path / "processing") == []
+    assert (tmp_path / "failed" / "bad.txt").exists()
+    sidecar = json.loads((tmp_path / "failed" / "bad.txt.error.json").read_text())
+    assert sidecar["error_type"] == "ValueError"
+    assert (tmp_path / ".partial.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_two_workers_never_ingest_the_same_file(tmp_path):
+    for i in range(20):
+        (tmp_path / f"doc{i}.txt").write_text(str(i))
+    seen = []
+
+    async def process(path, metadata):
+        seen.append(os.path.basename(path))
+        await asyncio.sleep(0)
+        return 1
+
+    workers = [
+        PendingFileWorker(process, pending_dir=str(tmp_path), concurrency=3, use_inotify=False)
+        for _ in range(2)
+    ]
+    await asyncio.gather(*(w.drain() for w in workers))
+
+    assert sorted(seen) == sorted(f"doc{i}.txt" for i in range(20))
+
+
+@pytest.mark.asyncio
+async def test_expired_claim_is_recovered_and_ingested(tmp_path):
+    processing = tmp_path / "processing"
+    processing.mkdir()
+    # Claimed by a replica that died mid-ingest, long ago
+    (processing / "stranded.txt").write_text("lost")
+    os.utime(processing / "stranded.txt", (1, 1))
+    # Claimed just now by a live replica
+    (processing / "busy.txt").write_text("in progress")
+    seen = []
+
+    async def process(path, metadata):
+        seen.append(os.path.basename(path))
+        return 1
+
+    worker = PendingFileWorker(process, pending_dir=str(tmp_path), use_inotify=False, lease_seconds=60)
+    await worker.drain()
+
+    assert seen == ["stranded.txt"]
+    assert worker.recovered == 1
+    assert os.listdir(processing) == ["busy.txt"]